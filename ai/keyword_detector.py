@@ -173,6 +173,34 @@ class KeywordDetector:
             return best_score
         return 0.0
 
+    def near_miss(self, text: str, margin: int = 10) -> bool:
+        """
+        Check whether a keyword almost matched.
+
+        A keyword without an exact (pattern or variation) match that still
+        scores within ``margin`` points of the fuzzy threshold, or above it,
+        is a case where a more careful transcription may change the outcome.
+
+        Args:
+            text: Transcribed text
+            margin: Points below fuzzy_threshold still counted as a near miss
+
+        Returns:
+            True if some keyword is a near miss
+        """
+        if not text or not isinstance(text, str):
+            return False
+
+        text_lower = text.lower()
+        min_score = self.fuzzy_threshold - margin
+        for kw_data in self.keyword_map.values():
+            patterns = [p for p in [kw_data["pattern"]] + kw_data["variations"] if p]
+            if any(self._exact_match(text_lower, p) for p in patterns):
+                continue
+            if any(fuzz.partial_ratio(p, text_lower) >= min_score for p in patterns):
+                return True
+        return False
+
     def update_keywords(self, keywords: List[Dict]) -> None:
         """Update keyword list."""
         self.keywords = keywords
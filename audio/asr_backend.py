@@ -0,0 +1,461 @@
+"""Speech-recognition backend interface and the CTranslate2 implementation."""
+
+import gc
+import inspect
+import logging
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple, Callable, Type, Union
+from utils.exceptions import WhisperException
+from .audio_utils import resample_audio
+from .hotwords import hotword_prompt
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("whisper", "ctranslate2")
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+class ASRBackend(ABC):
+    """Interface implemented by speech-recognition backends.
+
+    A backend owns one loaded model. ``transcribe`` returns a dict with
+    ``text``, ``confidence``, ``language`` and ``segments``, so
+    TranscriberThread and the analyzer do not depend on the engine.
+    """
+
+    name = "base"
+    model_name = ""
+    device = "cpu"
+    language = "pt"
+    fp16 = False
+    model = None
+    initial_prompt: Optional[str] = None
+    hotwords: Tuple[str, ...] = ()
+    hotword_prompt = False
+    # Chamado com (item, keyword_id, texto parcial) durante a decodificação;
+    # item = posição do segmento na chamada transcribe/transcribe_batch
+    on_early_keyword: Optional[Callable[[int, str, str], None]] = None
+    _early_items: Optional[List[int]] = None
+
+    @abstractmethod
+    def load(self) -> None:
+        """Load the model (raises WhisperException on failure)."""
+
+    @abstractmethod
+    def transcribe(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe audio data.
+
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            options: Per-call overrides of the decoding options
+
+        Returns:
+            Dictionary with transcription result
+        """
+
+    def transcribe_batch(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        options: Optional[Dict[str, Any]] = None,
+        features: Optional[List[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Transcribe several segments (sequentially unless the backend batches).
+
+        ``features`` (precomputed log-mel frames per item) are ignored by
+        backends that compute their own.
+        """
+        results = []
+        for index, (audio, sr) in enumerate(items):
+            with self.early_items([index]):
+                results.append(self.transcribe(audio, sr, options))
+        return results
+
+    @contextmanager
+    def early_items(self, indices: List[int]):
+        """
+        Report early keywords of nested decodes against the caller's items.
+
+        Inside the block, item ``i`` of a decode is reported to
+        ``on_early_keyword`` as ``indices[i]`` (a sub-batch of cache misses,
+        a per-item fallback). Blocks nest.
+
+        Args:
+            indices: Caller item position of each item decoded inside the block
+        """
+        outer = self._early_items
+        self._early_items = [outer[i] for i in indices] if outer is not None else list(indices)
+        try:
+            yield
+        finally:
+            self._early_items = outer
+
+    def _report_early_keyword(self, item: int, keyword_id: str, text: str) -> None:
+        """Forward a keyword confirmed while decoding to ``on_early_keyword``."""
+        callback = self.on_early_keyword
+        if callback is None:
+            return
+        if self._early_items is not None:
+            item = self._early_items[item]
+        callback(item, keyword_id, text)
+
+    def set_hotwords(self, words: List[str]) -> None:
+        """
+        Replace the words decoding is biased towards (e.g. after the keywords changed).
+
+        Args:
+            words: Hotwords (see hotwords_from_keywords)
+        """
+        self.hotwords = tuple(words)
+
+    def set_early_keywords(self, keywords: Optional[List[Dict]]) -> None:
+        """
+        Replace the keywords reported through ``on_early_keyword`` while decoding.
+
+        Backends without a token-level decoding hook ignore them (the keyword
+        is then only detected on the final transcript).
+
+        Args:
+            keywords: Keyword configurations, or None to disable the early trigger
+        """
+
+    def _decoding_prompt(self) -> Optional[str]:
+        """``initial_prompt``, followed by the hotwords when ``hotword_prompt`` is on."""
+        if self.hotword_prompt:
+            return hotword_prompt(self.initial_prompt, list(self.hotwords))
+        return self.initial_prompt
+
+    def warm_up(self, seconds: float = 1.0) -> float:
+        """
+        Run one inference on synthetic audio so the first real segment does
+        not pay one-time costs (kernel selection, allocator growth, lazy init).
+
+        Args:
+            seconds: Length of the synthetic clip
+
+        Returns:
+            Elapsed time in milliseconds
+        """
+        rng = np.random.default_rng(0)
+        audio_data = (rng.standard_normal(int(seconds * WHISPER_SAMPLE_RATE)) * 0.01).astype(np.float32)
+        started = time.perf_counter()
+        self.transcribe(audio_data, WHISPER_SAMPLE_RATE)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"{self.name} warm-up inference: {elapsed_ms:.0f} ms")
+        return elapsed_ms
+
+    @abstractmethod
+    def unload(self) -> bool:
+        """Release the model from memory."""
+
+    def reload(self, model_name: Optional[str] = None, device: Optional[str] = None) -> bool:
+        """
+        Reload the model (optionally with different settings).
+
+        Args:
+            model_name: New model name (or keep current)
+            device: New device (or keep current)
+        """
+        try:
+            self.unload()
+            if model_name:
+                self.model_name = model_name
+            if device:
+                self.device = device
+            self.load()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to reload {self.name} model: {e}")
+            return False
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get backend status."""
+        return {
+            "backend": self.name,
+            "model_name": self.model_name,
+            "device": self.device,
+            "fp16": self.fp16,
+            "language": self.language,
+            "loaded": self.model is not None,
+            "hotwords": len(self.hotwords),
+            "hotword_prompt": self.hotword_prompt,
+        }
+
+    def _calculate_confidence(self, result: Dict) -> float:
+        """
+        Calculate average confidence from segments.
+
+        Args:
+            result: Result dictionary with ``segments``
+
+        Returns:
+            Average confidence score
+        """
+        try:
+            segments = result.get("segments", [])
+            if not segments:
+                return 0.0
+
+            # Use probability from segments if available
+            probs = []
+            for segment in segments:
+                if "confidence" in segment:
+                    probs.append(segment["confidence"])
+
+            return sum(probs) / len(probs) if probs else 0.8  # Default confidence
+        except Exception:
+            return 0.8
+
+
+class CTranslate2Backend(ASRBackend):
+    """Whisper on CTranslate2 (faster-whisper) with int8 weights.
+
+    Runs a converted model from a local directory, e.g. one produced by
+    ``ct2-transformers-converter --model openai/whisper-small
+    --output_dir models/whisper-small-ct2 --quantization int8``. On CPU the
+    int8 kernels are several times faster than the float32 PyTorch model.
+    Requires the optional ``faster-whisper`` package.
+    """
+
+    name = "ctranslate2"
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        model_path: Optional[str] = None,
+        language: str = "pt",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        task: str = "transcribe",
+        beam_size: Optional[int] = 5,
+        best_of: Optional[int] = 5,
+        temperature: float = 0.0,
+        patience: Optional[float] = 1.0,
+        length_penalty: Optional[float] = 1.0,
+        suppress_blank: bool = True,
+        condition_on_previous_text: bool = True,
+        no_speech_threshold: float = 0.6,
+        compression_ratio_threshold: float = 2.4,
+        logprob_threshold: float = -1.0,
+        initial_prompt: Optional[str] = None,
+        word_timestamps: bool = False,
+        hallucination_silence_threshold: Optional[float] = None,
+        hotwords: Optional[List[str]] = None,
+        hotword_prompt: bool = False,
+        hotword_boost: float = 0.0,
+    ):
+        """
+        Initialize CTranslate2Backend.
+
+        Args:
+            model_name: Model name (used when model_path is empty)
+            model_path: Local directory with the converted CTranslate2 model
+            language: Language code
+            device: Device to use (cpu or cuda; "auto" picks cpu)
+            compute_type: CTranslate2 compute type (int8, int8_float16, float32...)
+            cpu_threads: Intra-op CPU threads (0 = CTranslate2 default)
+            + the same decoding and hotword parameters as Transcriber
+              (hotword_boost > 0 uses faster-whisper's ``hotwords`` hint if available)
+        """
+        self.model_name = model_name
+        self.model_path = model_path or None
+        self.language = language
+        self.device = device if device in ("cpu", "cuda") else "cpu"
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+
+        self.task = task
+        self.beam_size = beam_size
+        self.best_of = best_of
+        self.temperature = temperature
+        self.patience = patience
+        self.length_penalty = length_penalty
+        self.suppress_blank = suppress_blank
+        self.condition_on_previous_text = condition_on_previous_text
+        self.no_speech_threshold = no_speech_threshold
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.logprob_threshold = logprob_threshold
+        self.initial_prompt = initial_prompt
+        self.word_timestamps = word_timestamps
+        self.hallucination_silence_threshold = hallucination_silence_threshold
+        self.hotwords = tuple(hotwords or ())
+        self.hotword_prompt = hotword_prompt
+        self.hotword_boost = hotword_boost
+
+        self.model = None
+        self.load()
+
+    def load(self) -> None:
+        """Load the CTranslate2 model."""
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise WhisperException(
+                "CTranslate2 backend requires faster-whisper: pip install faster-whisper"
+            )
+
+        if self.model_path and not Path(self.model_path).is_dir():
+            raise WhisperException(f"CTranslate2 model directory not found: {self.model_path}")
+
+        source = self.model_path or self.model_name
+        logger.info(f"Loading CTranslate2 model: {source} ({self.device}, {self.compute_type})")
+        try:
+            self.model = WhisperModel(
+                source,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads,
+                local_files_only=bool(self.model_path),
+            )
+            logger.info("CTranslate2 model loaded successfully")
+        except Exception as e:
+            logger.error(f"Failed to load CTranslate2 model: {e}")
+            raise WhisperException(f"Failed to load CTranslate2 model: {e}")
+
+    def transcribe(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Transcribe audio data.
+
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            options: Per-call overrides of the decoding options
+
+        Returns:
+            Dictionary with transcription result
+        """
+        try:
+            if len(audio_data) == 0:
+                return {"text": "", "confidence": 0.0, "language": self.language}
+
+            audio_data = audio_data.astype(np.float32, copy=False)
+            if sample_rate != WHISPER_SAMPLE_RATE:
+                audio_data = resample_audio(audio_data, sample_rate, WHISPER_SAMPLE_RATE).astype(np.float32)
+
+            settings = {
+                "beam_size": self.beam_size,
+                "best_of": self.best_of,
+                "patience": self.patience,
+                "temperature": self.temperature,
+                "condition_on_previous_text": self.condition_on_previous_text,
+                "word_timestamps": self.word_timestamps,
+            }
+            if options:
+                settings.update({k: v for k, v in options.items() if k in settings})
+
+            segments, info = self.model.transcribe(
+                audio_data,
+                language=self.language,
+                task=self.task,
+                # faster-whisper usa 1 (e não None) para "busca gulosa"
+                beam_size=settings["beam_size"] or 1,
+                best_of=settings["best_of"] or 1,
+                patience=settings["patience"] or 1.0,
+                length_penalty=self.length_penalty or 1.0,
+                temperature=settings["temperature"],
+                compression_ratio_threshold=self.compression_ratio_threshold,
+                log_prob_threshold=self.logprob_threshold,
+                no_speech_threshold=self.no_speech_threshold,
+                condition_on_previous_text=settings["condition_on_previous_text"],
+                initial_prompt=self._decoding_prompt(),
+                suppress_blank=self.suppress_blank,
+                word_timestamps=settings["word_timestamps"],
+                hallucination_silence_threshold=self.hallucination_silence_threshold,
+                **self._hotword_hint(),
+            )
+
+            # O resultado é um gerador: a decodificação acontece aqui
+            segment_list = [
+                {
+                    "start": segment.start,
+                    "end": segment.end,
+                    "text": segment.text,
+                    "avg_logprob": segment.avg_logprob,
+                    "no_speech_prob": segment.no_speech_prob,
+                    "compression_ratio": segment.compression_ratio,
+                }
+                for segment in segments
+            ]
+            result = {
+                "text": "".join(s["text"] for s in segment_list).strip(),
+                "language": info.language or self.language,
+                "segments": segment_list,
+            }
+            result["confidence"] = self._calculate_confidence(result)
+            return result
+        except Exception as e:
+            logger.error(f"Transcription error: {e}")
+            raise WhisperException(f"Transcription failed: {e}")
+
+    def _hotword_hint(self) -> Dict[str, Any]:
+        """faster-whisper ``hotwords`` argument (newer releases only)."""
+        if not self.hotwords or self.hotword_boost <= 0:
+            return {}
+        if "hotwords" not in inspect.signature(self.model.transcribe).parameters:
+            return {}
+        return {"hotwords": " ".join(self.hotwords)}
+
+    def unload(self) -> bool:
+        """Release the model from memory."""
+        if self.model is not None:
+            del self.model
+            self.model = None
+            gc.collect()
+            logger.info("✓ CTranslate2 model unloaded from memory")
+        return True
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get backend status."""
+        status = super().get_status()
+        status.update({
+            "model_path": self.model_path,
+            "compute_type": self.compute_type,
+            "cpu_threads": self.cpu_threads,
+        })
+        return status
+
+
+def create_backend(backend: Union[str, Type[ASRBackend]] = "whisper", **kwargs) -> ASRBackend:
+    """
+    Create the ASR backend selected by ``whisper.backend``.
+
+    Settings a backend does not support are ignored, so callers can pass
+    the whole ``whisper`` config.
+
+    Args:
+        backend: "whisper" (openai-whisper / PyTorch), "ctranslate2", or an
+            ASRBackend subclass (a custom engine; importable by pool workers)
+        **kwargs: Backend settings
+
+    Returns:
+        Loaded backend
+    """
+    if isinstance(backend, type) and issubclass(backend, ASRBackend):
+        backend_class = backend
+    elif backend == "whisper":
+        from .transcriber import Transcriber
+        backend_class = Transcriber
+    elif backend == "ctranslate2":
+        backend_class = CTranslate2Backend
+    else:
+        raise WhisperException(f"Unknown ASR backend '{backend}'. Use: {list(BACKENDS)}")
+
+    accepted = inspect.signature(backend_class.__init__).parameters
+    return backend_class(**{k: v for k, v in kwargs.items() if k in accepted})
@@ -6,6 +6,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Formatos PCM brutos suportados: nome -> (dtype, fator de escala para [-1, 1])
+PCM_FORMATS = {
+    "float32": (np.float32, 1.0),
+    "int16": (np.int16, 32768.0),
+    "int32": (np.int32, 2147483648.0),
+}
+
 
 def normalize_audio(
     audio_data: np.ndarray, target_db: float = -20.0
@@ -131,6 +138,54 @@ def resample_audio(
         return audio_data
 
 
+class StreamResampler:
+    """Linear-interpolation resampler for audio that arrives in chunks.
+
+    Output sample ``n`` is read at position ``n * original_sr / target_sr``
+    of the whole stream, and the last input sample is carried over to the
+    next chunk. Calling resample_audio on each chunk instead rounds every
+    chunk's length down and stretches it to end on its last sample, which
+    drifts and leaves a discontinuity at each chunk boundary.
+    """
+
+    def __init__(self, original_sr: int, target_sr: int):
+        """
+        Initialize StreamResampler.
+
+        Args:
+            original_sr: Sample rate of the incoming chunks
+            target_sr: Output sample rate
+        """
+        self.step = original_sr / target_sr
+        # Posição da próxima saída, relativa à amostra guardada do chunk anterior
+        self._position = 0.0
+        self._previous: Optional[np.ndarray] = None
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            samples: Mono samples at ``original_sr``
+
+        Returns:
+            float32 samples at ``target_sr`` (length varies by one between chunks)
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        if not len(samples):
+            return samples
+        buffer = samples if self._previous is None else np.concatenate([self._previous, samples])
+
+        last = len(buffer) - 1
+        count = int((last - self._position) // self.step) + 1 if last >= self._position else 0
+        positions = self._position + self.step * np.arange(count)
+        resampled = np.interp(positions, np.arange(len(buffer)), buffer).astype(np.float32)
+
+        self._position += self.step * count - last
+        self._previous = buffer[last:]
+        return resampled
+
+
 def convert_bytes_to_numpy(
     audio_bytes: bytes, sample_width: int, num_channels: int
 ) -> np.ndarray:
@@ -173,6 +228,29 @@ def convert_bytes_to_numpy(
         return np.array([])
 
 
+def pcm_to_float32(raw: np.ndarray, scale: float, channels: int) -> np.ndarray:
+    """
+    Convert interleaved PCM samples to mono float32 in [-1, 1].
+
+    Args:
+        raw: Interleaved samples (any numeric dtype)
+        scale: Full-scale value of the input dtype
+        channels: Number of interleaved channels
+
+    Returns:
+        Mono float32 samples
+    """
+    if raw.dtype == np.float32 and channels == 1:
+        return raw
+    audio = raw.astype(np.float32)
+    if scale != 1.0:
+        audio /= scale
+    if channels > 1:
+        frames = len(audio) // channels
+        audio = audio[:frames * channels].reshape(frames, channels).mean(axis=1)
+    return audio
+
+
 def validate_audio_chunk(
     audio_data: np.ndarray,
     min_duration_seconds: float,
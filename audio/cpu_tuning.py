@@ -0,0 +1,134 @@
+"""Torch thread counts and CPU affinity for Whisper inference."""
+
+import os
+import logging
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Union
+
+logger = logging.getLogger(__name__)
+
+CpuSpec = Union[str, List[int], None]
+
+
+def parse_cpu_list(spec: CpuSpec) -> Optional[List[int]]:
+    """
+    Parse a CPU set such as ``"2-5,7"`` or ``[2, 3, 4]``.
+
+    Args:
+        spec: Comma-separated CPUs and ranges, a list of CPU indices, or empty
+
+    Returns:
+        Sorted CPU indices, or None when no affinity is configured
+    """
+    if spec is None or spec == "" or spec == []:
+        return None
+
+    cpus = set()
+    if isinstance(spec, str):
+        for part in spec.replace(" ", "").split(","):
+            if not part:
+                continue
+            if "-" in part:
+                first, last = part.split("-", 1)
+                cpus.update(range(int(first), int(last) + 1))
+            else:
+                cpus.add(int(part))
+    else:
+        cpus.update(int(cpu) for cpu in spec)
+
+    if any(cpu < 0 for cpu in cpus):
+        raise ValueError(f"Invalid CPU index in {spec!r}")
+    return sorted(cpus) or None
+
+
+def apply_torch_threads(num_threads: int = 0, interop_threads: int = 0) -> Dict[str, Any]:
+    """
+    Set torch's intra-op and inter-op thread pools (process-wide).
+
+    The inter-op count can only be set before torch runs its first parallel
+    work; a later change is logged and the current value kept.
+
+    Args:
+        num_threads: Intra-op threads (0 = keep torch default)
+        interop_threads: Inter-op threads (0 = keep torch default)
+
+    Returns:
+        Thread counts in effect
+    """
+    import torch
+
+    if num_threads > 0 and torch.get_num_threads() != num_threads:
+        torch.set_num_threads(num_threads)
+
+    if interop_threads > 0 and torch.get_num_interop_threads() != interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError as e:
+            # Só pode ser definido uma vez, antes do primeiro trabalho paralelo
+            logger.warning(f"whisper.interop_threads={interop_threads} not applied: {e}")
+
+    return {
+        "num_threads": torch.get_num_threads(),
+        "interop_threads": torch.get_num_interop_threads(),
+    }
+
+
+def apply_cpu_affinity(cpus: CpuSpec) -> Optional[List[int]]:
+    """
+    Pin the calling thread to ``cpus``.
+
+    On Linux the affinity applies to the calling thread only; threads it
+    starts afterwards (torch's OpenMP workers included) inherit it, so call
+    this from the thread that runs inference, before the first inference.
+
+    Args:
+        cpus: CPU set (see parse_cpu_list)
+
+    Returns:
+        CPUs applied, or None if no affinity is configured or supported
+    """
+    cpu_list = parse_cpu_list(cpus)
+    if cpu_list is None:
+        return None
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("whisper.cpu_affinity not supported on this platform, ignored")
+        return None
+
+    available = os.sched_getaffinity(0)
+    usable = [cpu for cpu in cpu_list if cpu in available]
+    if not usable:
+        logger.warning(f"whisper.cpu_affinity {cpu_list} has no available CPU, ignored")
+        return None
+
+    os.sched_setaffinity(0, usable)
+    logger.info(f"Inference pinned to CPUs {usable}")
+    return usable
+
+
+@contextmanager
+def cpu_affinity_scope(cpus: CpuSpec) -> Iterator[Optional[List[int]]]:
+    """
+    Pin the calling thread to ``cpus`` for the duration of the block.
+
+    Used to load and warm up the model on the inference CPUs from a thread
+    that is not the inference thread (model memory is first touched there,
+    and worker threads started meanwhile inherit the affinity). The caller's
+    previous affinity is restored on exit.
+
+    Args:
+        cpus: CPU set (see parse_cpu_list)
+
+    Yields:
+        CPUs applied, or None if no affinity is configured or supported
+    """
+    previous = os.sched_getaffinity(0) if hasattr(os, "sched_getaffinity") else None
+    try:
+        applied = apply_cpu_affinity(cpus)
+    except OSError as e:
+        logger.warning(f"Could not apply whisper.cpu_affinity {cpus}: {e}")
+        applied = None
+    try:
+        yield applied
+    finally:
+        if applied is not None and previous is not None:
+            os.sched_setaffinity(0, previous)
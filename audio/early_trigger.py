@@ -0,0 +1,127 @@
+"""Keyword trigger from the tokens Whisper emits while it is still decoding."""
+
+import itertools
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Ids únicos no processo inteiro (transcritores trocados no reload não colidem)
+_segment_ids = itertools.count()
+
+
+def next_segment_id() -> int:
+    """New id tying a final segment's early keywords to its final result."""
+    return next(_segment_ids)
+
+
+class EarlyKeywordMatcher:
+    """Matches keyword spellings in a partially decoded transcript.
+
+    Only exact patterns and variations count (no fuzzy matching), and a
+    match must be followed by a non-word character: the last word of a
+    prefix may still grow ("sus" -> "suspeito"), so it is not trusted
+    until the decoder has moved past it.
+    """
+
+    def __init__(self, keywords: Iterable[Dict]):
+        """
+        Initialize EarlyKeywordMatcher.
+
+        Args:
+            keywords: Keyword configurations (``config.get_keywords()``)
+        """
+        self._patterns: List[tuple] = []
+        for keyword in keywords:
+            if not keyword.get("enabled", True) or not keyword.get("id"):
+                continue
+            spellings = [keyword.get("pattern", "")] + list(keyword.get("variations", []))
+            spellings = sorted({s.strip().lower() for s in spellings if s and s.strip()}, key=len, reverse=True)
+            if not spellings:
+                continue
+            alternatives = "|".join(re.escape(s) for s in spellings)
+            # Palavra inteira e já seguida de outro caractere (palavra concluída)
+            regex = re.compile(rf"(?<!\w)(?:{alternatives})(?=[^\w])", re.IGNORECASE)
+            self._patterns.append((keyword["id"], regex))
+
+    def __bool__(self) -> bool:
+        return bool(self._patterns)
+
+    def match(self, text: str) -> Optional[str]:
+        """
+        First keyword confirmed in ``text``.
+
+        Args:
+            text: Transcript decoded so far
+
+        Returns:
+            Keyword id, or None
+        """
+        for keyword_id, regex in self._patterns:
+            if regex.search(text):
+                return keyword_id
+        return None
+
+
+class EarlyKeywordTrigger:
+    """Logit-filter observer that reports keywords during decoding.
+
+    Added to one ``DecodingTask``: at every step it decodes the tokens
+    sampled so far for each audio item and calls ``on_keyword`` the first
+    time a keyword is confirmed in that item. With beam search or best-of every
+    hypothesis of the item must contain the same keyword. Logits are left
+    untouched (implements whisper's ``LogitFilter.apply`` interface).
+    """
+
+    def __init__(
+        self,
+        matcher: EarlyKeywordMatcher,
+        tokenizer,
+        sample_begin: int,
+        n_group: int,
+        on_keyword: Callable[[int, str, str], None],
+    ):
+        """
+        Initialize EarlyKeywordTrigger.
+
+        Args:
+            matcher: Keyword spellings to look for
+            tokenizer: ``whisper.tokenizer.Tokenizer`` of the task
+            sample_begin: Index of the first sampled token (after the prompt)
+            n_group: Rows per audio item (beam size or best-of, 1 when greedy)
+            on_keyword: Called with (item index, keyword_id, text decoded so far)
+        """
+        self.matcher = matcher
+        self.tokenizer = tokenizer
+        self.sample_begin = sample_begin
+        self.n_group = max(int(n_group), 1)
+        self.on_keyword = on_keyword
+        self.fired: Dict[int, str] = {}
+
+    def apply(self, logits, tokens) -> None:
+        """
+        Check the decoded prefixes (logits are not modified).
+
+        Args:
+            logits: Tensor (n_batch, vocab) of the next-token logits
+            tokens: Tensor (n_batch, length) of the tokens so far
+        """
+        if tokens.shape[1] <= self.sample_begin:
+            return
+        rows = tokens[:, self.sample_begin:].tolist()
+        eot = self.tokenizer.eot
+        for item in range(len(rows) // self.n_group):
+            if item in self.fired:
+                continue
+            group = rows[item * self.n_group:(item + 1) * self.n_group]
+            texts = [self.tokenizer.decode([t for t in row if t < eot]) for row in group]
+            matches: Set[Optional[str]] = {self.matcher.match(text) for text in texts}
+            if len(matches) != 1 or None in matches:
+                continue
+            keyword_id = matches.pop()
+            self.fired[item] = keyword_id
+            try:
+                self.on_keyword(item, keyword_id, texts[0].strip())
+            except Exception as e:
+                logger.error(f"Error in early keyword callback: {e}")
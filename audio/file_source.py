@@ -0,0 +1,312 @@
+"""Replayable WAV / raw PCM audio source (no sound card required)."""
+
+import threading
+import queue
+import time
+import wave
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Optional, List, Callable, Tuple
+from utils.exceptions import AudioDeviceException
+from .audio_utils import (
+    PCM_FORMATS,
+    StreamResampler,
+    detect_silence,
+    get_audio_energy,
+    pcm_to_float32,
+)
+
+logger = logging.getLogger(__name__)
+
+class FileAudioSource:
+    """Audio source that replays a WAV or raw PCM file.
+
+    Implements the same start/get_chunk/stop contract as AudioProcessor, so it
+    can be plugged into MicrophoneAnalyzer in place of the microphone.
+
+    Pacing:
+    - realtime=True: chunks are released at ``speed`` x real time and, like
+      the microphone, the oldest chunk is dropped if the consumer falls behind.
+    - realtime=False: chunks are produced as fast as the consumer drains them
+      (blocking put, nothing is dropped) - useful for benchmarks.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        sample_rate: int = 16000,
+        chunk_size: int = 2048,
+        channels: int = 1,
+        silence_threshold: float = 0.02,
+        realtime: bool = True,
+        speed: float = 1.0,
+        loop: bool = False,
+        pcm_format: str = "int16",
+        pcm_sample_rate: Optional[int] = None,
+        pcm_channels: int = 1,
+    ):
+        """
+        Initialize FileAudioSource.
+
+        Args:
+            file_path: Path to a .wav file or a raw PCM file
+            sample_rate: Output sample rate in Hz (file is resampled if needed)
+            chunk_size: Chunk size in samples
+            channels: Output channels (always mono; kept for API compatibility)
+            silence_threshold: Silence detection threshold
+            realtime: Pace output at real time (False = as fast as possible)
+            speed: Real-time multiplier when realtime=True
+            loop: Restart from the beginning at end of file
+            pcm_format: Raw PCM sample format (float32, int16, int32)
+            pcm_sample_rate: Raw PCM sample rate (default: sample_rate)
+            pcm_channels: Raw PCM interleaved channel count
+        """
+        if pcm_format not in PCM_FORMATS:
+            raise AudioDeviceException(
+                f"Unsupported PCM format '{pcm_format}'. Use: {list(PCM_FORMATS)}"
+            )
+
+        self.file_path = Path(file_path)
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.channels = channels
+        self.silence_threshold = silence_threshold
+        self.realtime = realtime
+        self.speed = max(float(speed), 1e-3)
+        self.loop = loop
+        self.pcm_format = pcm_format
+        self.pcm_sample_rate = pcm_sample_rate or sample_rate
+        self.pcm_channels = pcm_channels
+
+        # Compatibilidade com AudioProcessor
+        self.device_id = -1
+        self.is_recording = False
+        self.audio_queue: queue.Queue = queue.Queue(maxsize=100)
+        self._thread: Optional[threading.Thread] = None
+        self._last_chunk: Optional[np.ndarray] = None
+
+        # Estatísticas para planejamento de capacidade
+        self.finished = threading.Event()
+        self.samples_emitted = 0
+        self.dropped_chunks = 0
+        self._started_at: Optional[float] = None
+
+        if not self.file_path.is_file():
+            raise AudioDeviceException(f"Audio file not found: {self.file_path}")
+
+    def _open_reader(self) -> Tuple[Callable[[], Optional[np.ndarray]], Callable[[], None], int]:
+        """
+        Open the file and return (read_chunk, close, source_rate).
+
+        read_chunk returns mono float32 samples at the file's own rate, or
+        None at end of file.
+        """
+        if self.file_path.suffix.lower() == ".wav":
+            wav = wave.open(str(self.file_path), "rb")
+            width = wav.getsampwidth()
+            channels = wav.getnchannels()
+            if width == 2:
+                dtype, scale = np.int16, 32768.0
+            elif width == 4:
+                dtype, scale = np.int32, 2147483648.0
+            elif width == 1:
+                dtype, scale = np.uint8, 128.0
+            else:
+                wav.close()
+                raise AudioDeviceException(f"Unsupported WAV sample width: {width}")
+
+            def read_wav() -> Optional[np.ndarray]:
+                data = wav.readframes(self.chunk_size)
+                if not data:
+                    return None
+                raw = np.frombuffer(data, dtype=dtype)
+                if dtype == np.uint8:
+                    raw = raw.astype(np.int16) - 128
+                return pcm_to_float32(raw, scale, channels)
+
+            return read_wav, wav.close, wav.getframerate()
+
+        dtype, scale = PCM_FORMATS[self.pcm_format]
+        frame_bytes = np.dtype(dtype).itemsize * self.pcm_channels
+        handle = open(self.file_path, "rb")
+
+        def read_pcm() -> Optional[np.ndarray]:
+            data = handle.read(self.chunk_size * frame_bytes)
+            usable = len(data) - len(data) % frame_bytes
+            if usable <= 0:
+                return None
+            raw = np.frombuffer(data[:usable], dtype=dtype)
+            return pcm_to_float32(raw, scale, self.pcm_channels)
+
+        return read_pcm, handle.close, self.pcm_sample_rate
+
+    def list_devices(self) -> List[dict]:
+        """List available devices (the file itself)."""
+        return [{
+            "index": -1,
+            "name": f"file:{self.file_path.name}",
+            "max_input_channels": 1,
+            "max_output_channels": 0,
+            "default_input": True,
+        }]
+
+    def start(self) -> None:
+        """Start replaying the file."""
+        if self.is_recording:
+            logger.warning("File replay already in progress")
+            return
+
+        self.finished.clear()
+        self.samples_emitted = 0
+        self.dropped_chunks = 0
+        self._started_at = time.time()
+        self.is_recording = True
+        self._thread = threading.Thread(target=self._replay_loop, daemon=True)
+        self._thread.start()
+        logger.info(
+            f"File audio source started ({self.file_path}, realtime={self.realtime}, speed={self.speed})"
+        )
+
+    def stop(self) -> None:
+        """Stop replaying."""
+        self.is_recording = False
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        logger.info("File audio source stopped")
+
+    def _emit(self, chunk: np.ndarray) -> None:
+        """Hand a chunk to the consumer according to the pacing mode."""
+        if self.realtime:
+            if self.audio_queue.full():
+                try:
+                    self.audio_queue.get_nowait()  # Discard oldest, como o microfone
+                    self.dropped_chunks += 1
+                except queue.Empty:
+                    pass
+            try:
+                self.audio_queue.put_nowait(chunk)
+            except queue.Full:
+                self.dropped_chunks += 1
+            return
+
+        # Modo rápido: backpressure em vez de descarte
+        while self.is_recording:
+            try:
+                self.audio_queue.put(chunk, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _replay_loop(self) -> None:
+        """Read the file chunk by chunk and feed the queue."""
+        try:
+            while self.is_recording:
+                read_chunk, close, source_rate = self._open_reader()
+                # Estado fracionário mantido entre chunks (sem deriva nas bordas)
+                resampler = StreamResampler(source_rate, self.sample_rate) if source_rate != self.sample_rate else None
+                try:
+                    pending = np.zeros(0, dtype=np.float32)
+                    while self.is_recording:
+                        samples = read_chunk()
+                        if samples is None:
+                            break
+                        if resampler is not None:
+                            samples = resampler.process(samples)
+
+                        # Re-fatiar em chunks de tamanho fixo
+                        pending = np.concatenate([pending, samples]) if len(pending) else samples
+                        while len(pending) >= self.chunk_size and self.is_recording:
+                            chunk, pending = pending[:self.chunk_size], pending[self.chunk_size:]
+                            self._pace()
+                            self._emit(chunk)
+                            self.samples_emitted += len(chunk)
+
+                    if len(pending) and self.is_recording:
+                        self._pace()
+                        self._emit(pending)
+                        self.samples_emitted += len(pending)
+                finally:
+                    close()
+
+                if not self.loop:
+                    break
+        except Exception as e:
+            logger.error(f"File replay failed: {e}")
+        finally:
+            self.finished.set()
+            logger.info(f"File replay ended ({self.samples_emitted / self.sample_rate:.1f}s of audio)")
+
+    def _pace(self) -> None:
+        """Sleep until the next chunk is due (realtime mode only)."""
+        if not self.realtime or self._started_at is None:
+            return
+        due = self._started_at + self.samples_emitted / (self.sample_rate * self.speed)
+        delay = due - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_chunk(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Get next audio chunk.
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            Audio data as numpy array or None if timeout
+        """
+        try:
+            chunk = self.audio_queue.get(timeout=timeout)
+            self._last_chunk = chunk
+            return chunk
+        except queue.Empty:
+            return None
+
+    def is_finished(self) -> bool:
+        """True once the file was fully replayed and consumed."""
+        return self.finished.is_set() and self.audio_queue.empty()
+
+    def get_energy(self) -> float:
+        """Get energy of the most recently consumed chunk."""
+        if self._last_chunk is None:
+            return 0.0
+        return get_audio_energy(self._last_chunk)
+
+    def is_silent(self) -> bool:
+        """Check if the most recently consumed chunk is silent."""
+        if self._last_chunk is None:
+            return True
+        is_silent, _ = detect_silence(self._last_chunk, self.sample_rate, self.silence_threshold)
+        return is_silent
+
+    def get_queue_size(self) -> int:
+        """Get current queue size."""
+        return self.audio_queue.qsize()
+
+    def get_capture_stats(self) -> dict:
+        """Get replay statistics (audio seconds vs wall-clock seconds)."""
+        wall = time.time() - self._started_at if self._started_at else 0.0
+        audio_seconds = self.samples_emitted / self.sample_rate
+        return {
+            "capture_mode": "file",
+            "file_path": str(self.file_path),
+            "realtime": self.realtime,
+            "audio_seconds": round(audio_seconds, 2),
+            "wall_seconds": round(wall, 2),
+            "speed_factor": round(audio_seconds / wall, 2) if wall > 0 else 0.0,
+            "dropped_chunks": self.dropped_chunks,
+            "finished": self.finished.is_set(),
+        }
+
+    def clear_queue(self) -> None:
+        """Clear audio queue."""
+        while not self.audio_queue.empty():
+            try:
+                self.audio_queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def set_device(self, device_id: int) -> None:
+        """Devices do not apply to file sources; kept for API compatibility."""
+        logger.warning("set_device ignored: audio source is a file")
@@ -0,0 +1,121 @@
+"""Hotword biasing of Whisper decoding from the configured keywords."""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Whisper mantém só o fim do prompt (223 tokens): a lista fica no final e limitada
+HOTWORD_PROMPT_MAX_WORDS = 40
+
+
+def hotwords_from_keywords(keywords: Iterable[Dict]) -> List[str]:
+    """
+    Words to bias decoding towards: patterns and variations of enabled keywords.
+
+    Args:
+        keywords: Keyword configurations (``config.get_keywords()``)
+
+    Returns:
+        Distinct words, in keyword order
+    """
+    words: List[str] = []
+    seen: Set[str] = set()
+    for keyword in keywords:
+        if not keyword.get("enabled", True):
+            continue
+        for word in [keyword.get("pattern", "")] + list(keyword.get("variations", [])):
+            word = (word or "").strip()
+            if word and word.lower() not in seen:
+                seen.add(word.lower())
+                words.append(word)
+    return words
+
+
+def hotword_prompt(initial_prompt: Optional[str], words: List[str]) -> Optional[str]:
+    """
+    Append the hotwords to the initial prompt.
+
+    Whisper conditions on the prompt as if it were preceding speech, so
+    words listed there are more likely to be spelled the same way.
+
+    Args:
+        initial_prompt: Configured prompt (may be empty)
+        words: Hotwords
+
+    Returns:
+        Prompt text, or ``initial_prompt`` unchanged without hotwords
+    """
+    if not words:
+        return initial_prompt
+    listed = ", ".join(words[:HOTWORD_PROMPT_MAX_WORDS])
+    return f"{initial_prompt.strip()} {listed}." if initial_prompt else f"{listed}."
+
+
+class HotwordBias:
+    """Logit filter that boosts the tokens spelling each hotword.
+
+    A hotword spelled by a single token gets ``boost`` added at each step.
+    The first piece of a multi-token hotword (" Cr" of " Cringe") is left
+    alone, since it starts many other words; its following pieces are
+    boosted only right after the preceding ones were emitted. Implements
+    whisper's ``LogitFilter.apply`` interface.
+    """
+
+    def __init__(self, sequences: List[List[int]], boost: float):
+        """
+        Initialize HotwordBias.
+
+        Args:
+            sequences: Token ids of each hotword spelling
+            boost: Value added to the logits of the boosted tokens
+        """
+        self.boost = boost
+        # Só palavras inteiras em um token: o primeiro pedaço das outras é comum
+        self.first_tokens = sorted({seq[0] for seq in sequences if len(seq) == 1})
+        # prefixo (tupla de tokens) -> próximos tokens possíveis
+        self.continuations: Dict[Tuple[int, ...], Set[int]] = {}
+        for seq in sequences:
+            for k in range(1, len(seq)):
+                self.continuations.setdefault(tuple(seq[:k]), set()).add(seq[k])
+        self.max_prefix = max((len(p) for p in self.continuations), default=0)
+
+    @classmethod
+    def from_words(cls, tokenizer, words: List[str], boost: float) -> "HotwordBias":
+        """
+        Build the filter for a Whisper tokenizer.
+
+        Each word is tokenized with a leading space, in lower case and
+        capitalized, the spellings Whisper emits inside a sentence.
+
+        Args:
+            tokenizer: ``whisper.tokenizer.Tokenizer``
+            words: Hotwords
+            boost: Value added to the logits of the boosted tokens
+        """
+        sequences = []
+        for word in words:
+            for spelling in {word, word.lower(), word.capitalize()}:
+                sequences.append(tokenizer.encode(" " + spelling))
+        return cls(sequences, boost)
+
+    def apply(self, logits, tokens) -> None:
+        """
+        Add the boosts in place.
+
+        Args:
+            logits: Tensor (n_batch, vocab) of the next-token logits
+            tokens: Tensor (n_batch, length) of the tokens so far
+        """
+        if self.first_tokens:
+            logits[:, self.first_tokens] += self.boost
+        if not self.max_prefix:
+            return
+
+        tails = tokens[:, -self.max_prefix:].tolist()
+        for row, tail in enumerate(tails):
+            boosted: Set[int] = set()
+            for k in range(1, min(self.max_prefix, len(tail)) + 1):
+                boosted |= self.continuations.get(tuple(tail[-k:]), set())
+            if boosted:
+                logits[row, sorted(boosted)] += self.boost
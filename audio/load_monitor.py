@@ -0,0 +1,225 @@
+"""Real-time-factor telemetry and the automatic model downgrade policy."""
+
+import time
+from collections import deque
+from typing import Optional, Dict, Any, List
+
+# Decodificação gulosa: o primeiro degrau antes de trocar de modelo
+GREEDY_OVERRIDES = {"beam_size": None, "best_of": None, "patience": None}
+
+# Tamanho relativo dos modelos Whisper (large, large-v2 e large-v3 são equivalentes)
+MODEL_RANKS = {
+    "tiny": 0,
+    "base": 1,
+    "small": 2,
+    "medium": 3,
+    "large": 4,
+    "large-v2": 4,
+    "large-v3": 4,
+}
+DOWNGRADE_MODELS = ("medium", "small", "base", "tiny")
+
+
+class RealTimeFactorMonitor:
+    """Rolling real-time factor and input queue depth of a transcriber.
+
+    The real-time factor (RTF) is inference time divided by audio duration:
+    above 1.0 the transcriber takes longer than the speech lasts and its
+    input queue grows until segments are dropped.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        """
+        Initialize RealTimeFactorMonitor.
+
+        Args:
+            max_samples: Batches kept for the rolling windows
+        """
+        self._samples: deque = deque(maxlen=max_samples)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget history (e.g. after the model or decoding changed)."""
+        self._samples.clear()
+        self._started = time.monotonic()
+        self.segments = 0
+        self.total_audio_seconds = 0.0
+        self.total_inference_seconds = 0.0
+        self.last_rtf: Optional[float] = None
+        self.queue_depth = 0
+
+    def record(
+        self,
+        inference_seconds: float,
+        audio_seconds: float,
+        queue_depth: int = 0,
+        segments: int = 1,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Record one transcribed batch.
+
+        Args:
+            inference_seconds: Wall time spent transcribing
+            audio_seconds: Total duration of the transcribed audio
+            queue_depth: Segments still waiting when the batch finished
+            segments: Segments in the batch
+            now: Timestamp (monotonic), defaults to now
+        """
+        if audio_seconds <= 0:
+            return
+        now = time.monotonic() if now is None else now
+        self._samples.append((now, inference_seconds, audio_seconds, queue_depth))
+        self.segments += segments
+        self.total_audio_seconds += audio_seconds
+        self.total_inference_seconds += inference_seconds
+        self.last_rtf = inference_seconds / audio_seconds
+        self.queue_depth = queue_depth
+
+    def history_seconds(self, now: Optional[float] = None) -> float:
+        """Seconds since monitoring started (or was reset)."""
+        now = time.monotonic() if now is None else now
+        return now - self._started
+
+    def rtf_over(self, seconds: float, now: Optional[float] = None) -> Optional[float]:
+        """
+        Aggregate RTF of the batches finished in the last ``seconds``.
+
+        Args:
+            seconds: Window length
+            now: Timestamp (monotonic), defaults to now
+
+        Returns:
+            Total inference time / total audio time, or None without samples
+        """
+        now = time.monotonic() if now is None else now
+        inference = audio = 0.0
+        for timestamp, inference_s, audio_s, _ in reversed(self._samples):
+            if now - timestamp > seconds:
+                break
+            inference += inference_s
+            audio += audio_s
+        return inference / audio if audio > 0 else None
+
+    def queue_depth_over(self, seconds: float, now: Optional[float] = None) -> Dict[str, float]:
+        """Average and maximum queue depth over the last ``seconds``."""
+        now = time.monotonic() if now is None else now
+        depths = [d for t, _, _, d in self._samples if now - t <= seconds]
+        if not depths:
+            return {"avg": 0.0, "max": 0}
+        return {"avg": sum(depths) / len(depths), "max": max(depths)}
+
+    def summary(self) -> Dict[str, Any]:
+        """Telemetry for get_status()."""
+        now = time.monotonic()
+        total_rtf = (
+            self.total_inference_seconds / self.total_audio_seconds
+            if self.total_audio_seconds > 0 else None
+        )
+        return {
+            "last": self.last_rtf,
+            "avg_10s": self.rtf_over(10.0, now),
+            "avg_60s": self.rtf_over(60.0, now),
+            "total": total_rtf,
+            "segments": self.segments,
+            "audio_seconds": self.total_audio_seconds,
+            "queue_depth": self.queue_depth,
+            "queue_depth_60s": self.queue_depth_over(60.0, now),
+        }
+
+
+class DowngradePolicy:
+    """Steps to faster decoding when RTF stays above 1.0, back up with headroom.
+
+    Level 0 is the configured setup. Each level after it is faster: greedy
+    decoding first (if beam search is configured), then each smaller model
+    down to ``min_model``.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        beam_size: Optional[int] = 5,
+        min_model: str = "tiny",
+        downgrade_rtf: float = 1.0,
+        downgrade_window_seconds: float = 10.0,
+        upgrade_rtf: float = 0.5,
+        upgrade_window_seconds: float = 60.0,
+    ):
+        """
+        Initialize DowngradePolicy.
+
+        Args:
+            model: Configured model name
+            beam_size: Configured beam size (None/1 = already greedy)
+            min_model: Smallest model to step down to
+            downgrade_rtf: Step down when RTF stays above this
+            downgrade_window_seconds: How long RTF must stay above downgrade_rtf
+            upgrade_rtf: Step back up when RTF stays below this
+            upgrade_window_seconds: How long RTF must stay below upgrade_rtf
+        """
+        self.levels = self.build_levels(model, beam_size, min_model)
+        self.level = 0
+        self.downgrade_rtf = downgrade_rtf
+        self.downgrade_window_seconds = downgrade_window_seconds
+        self.upgrade_rtf = upgrade_rtf
+        self.upgrade_window_seconds = upgrade_window_seconds
+
+    @staticmethod
+    def build_levels(model: str, beam_size: Optional[int], min_model: str = "tiny") -> List[Dict[str, Any]]:
+        """
+        Build the downgrade ladder.
+
+        Args:
+            model: Configured model name
+            beam_size: Configured beam size
+            min_model: Smallest model to step down to
+
+        Returns:
+            List of config overrides, index 0 = configured setup
+        """
+        levels: List[Dict[str, Any]] = [{}]
+        if beam_size and beam_size > 1:
+            levels.append(dict(GREEDY_OVERRIDES))
+
+        rank = MODEL_RANKS.get(model)
+        min_rank = MODEL_RANKS.get(min_model, 0)
+        if rank is not None:
+            for smaller in DOWNGRADE_MODELS:
+                if min_rank <= MODEL_RANKS[smaller] < rank:
+                    levels.append({"model": smaller, **GREEDY_OVERRIDES})
+        return levels
+
+    @property
+    def overrides(self) -> Dict[str, Any]:
+        """Config overrides of the current level."""
+        return self.levels[self.level]
+
+    def evaluate(self, monitor: RealTimeFactorMonitor, now: Optional[float] = None) -> Optional[int]:
+        """
+        Decide whether to change level.
+
+        The monitor must have been watching the current level for the whole
+        window (callers reset it when the level changes).
+
+        Args:
+            monitor: RTF monitor of the current transcriber
+            now: Timestamp (monotonic), defaults to now
+
+        Returns:
+            New level, or None to keep the current one
+        """
+        now = time.monotonic() if now is None else now
+        history = monitor.history_seconds(now)
+
+        if self.level < len(self.levels) - 1 and history >= self.downgrade_window_seconds:
+            rtf = monitor.rtf_over(self.downgrade_window_seconds, now)
+            if rtf is not None and rtf > self.downgrade_rtf:
+                return self.level + 1
+
+        if self.level > 0 and history >= self.upgrade_window_seconds:
+            rtf = monitor.rtf_over(self.upgrade_window_seconds, now)
+            if rtf is not None and rtf < self.upgrade_rtf:
+                return self.level - 1
+
+        return None
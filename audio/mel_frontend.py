@@ -0,0 +1,186 @@
+"""Incremental Whisper log-mel frontend over the capture stream."""
+
+import logging
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros do frontend do Whisper (whisper.audio)
+SAMPLE_RATE = 16000
+N_FFT = 400
+HOP_LENGTH = 160
+
+# log10 da potência de um frame de silêncio digital (clamp do whisper)
+SILENCE_LOG_POWER = -10.0
+
+# _prepare_audio centraliza clipes curtos em 1.5 s de silêncio
+MIN_CLIP_FRAMES = int(1.5 * SAMPLE_RATE) // HOP_LENGTH
+
+
+@dataclass
+class MelFeatures:
+    """Precomputed log-mel frames of one segment.
+
+    ``frames`` holds log10 mel power of the raw (unnormalized) audio, so the
+    segment's peak normalization is a constant shift applied in
+    ``to_log_mel`` instead of a pass over the samples.
+    """
+
+    frames: np.ndarray
+    peak: float
+    num_samples: int
+
+    @property
+    def n_mels(self) -> int:
+        """Number of mel bins."""
+        return self.frames.shape[0]
+
+    def to_log_mel(self, n_frames: int) -> np.ndarray:
+        """
+        Finish the features the way ``whisper.log_mel_spectrogram`` does.
+
+        Args:
+            n_frames: Frames of the encoder input (the clip is padded with silence)
+
+        Returns:
+            Array (n_mels, n_frames) ready for the encoder
+        """
+        content = self.frames[:, :n_frames]
+        log_spec = np.full((self.n_mels, n_frames), SILENCE_LOG_POWER, dtype=np.float32)
+
+        # Mesmo padding de _prepare_audio: clipes curtos ficam no meio de 1.5 s
+        offset = 0
+        if content.shape[1] < MIN_CLIP_FRAMES:
+            offset = min((MIN_CLIP_FRAMES - content.shape[1]) // 2, n_frames - content.shape[1])
+
+        # Normalização de pico = deslocamento constante no domínio log
+        shift = -2.0 * np.log10(self.peak) if self.peak > 0 else 0.0
+        log_spec[:, offset:offset + content.shape[1]] = content + shift
+
+        np.maximum(log_spec, log_spec.max() - 8.0, out=log_spec)
+        log_spec += 4.0
+        log_spec /= 4.0
+        return log_spec
+
+
+class LogMelFrontend:
+    """Computes Whisper log-mel frames as audio chunks arrive.
+
+    Frames are kept in a ring indexed by absolute stream position, so a
+    segment (or the growing window of a partial transcription) is
+    featurized once, when its samples are captured, rather than each time
+    it is decoded. Frame ``f`` is centered on stream sample ``f * 160``,
+    like ``whisper.log_mel_spectrogram`` on a clip starting at sample 0.
+    """
+
+    def __init__(self, n_mels: int = 80, ring_seconds: float = 60.0):
+        """
+        Initialize LogMelFrontend.
+
+        Args:
+            n_mels: Mel bins of the model (80, or 128 for large-v3)
+            ring_seconds: Seconds of frames kept for later segments
+        """
+        import whisper
+
+        self.n_mels = n_mels
+        self._filters = whisper.audio.mel_filters("cpu", n_mels).numpy().astype(np.float32)
+        # Janela de Hann periódica (torch.hann_window)
+        self._window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+
+        self.capacity = max(int(ring_seconds * SAMPLE_RATE / HOP_LENGTH), 1)
+        self._ring = np.empty((n_mels, self.capacity), dtype=np.float32)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all frames and restart the stream at position 0."""
+        self.position = 0
+        self.next_frame = 0
+        # Amostras ainda necessárias para os próximos frames; o stream começa
+        # com N_FFT // 2 zeros (o whisper usa reflexão, irrelevante após 10 ms)
+        self._pending = np.zeros(N_FFT // 2, dtype=np.float32)
+        self._pending_start = -(N_FFT // 2)
+
+    def push(self, chunk: np.ndarray) -> int:
+        """
+        Append captured samples and compute every frame they complete.
+
+        Args:
+            chunk: Mono float32 samples at 16 kHz
+
+        Returns:
+            Number of new frames
+        """
+        self._pending = np.concatenate([self._pending, np.asarray(chunk, dtype=np.float32)])
+        self.position += len(chunk)
+
+        # Frame f precisa das amostras [f*hop - n_fft/2, f*hop + n_fft/2)
+        first_start = self.next_frame * HOP_LENGTH - N_FFT // 2 - self._pending_start
+        available = (len(self._pending) - first_start - N_FFT) // HOP_LENGTH + 1
+        if available <= 0:
+            return 0
+
+        windows = np.lib.stride_tricks.sliding_window_view(self._pending[first_start:], N_FFT)[::HOP_LENGTH]
+        windows = windows[:available]
+        power = np.abs(np.fft.rfft(windows * self._window, axis=1)) ** 2
+        mel = self._filters @ power.T.astype(np.float32)
+        log_mel = np.log10(np.maximum(mel, 1e-10))
+
+        columns = (np.arange(self.next_frame, self.next_frame + available)) % self.capacity
+        self._ring[:, columns] = log_mel
+        self.next_frame += available
+
+        # Descartar amostras que nenhum frame futuro usa
+        drop = self.next_frame * HOP_LENGTH - N_FFT // 2 - self._pending_start
+        self._pending = self._pending[drop:].copy()
+        self._pending_start += drop
+        return available
+
+    def frames(self, start: int, end: int) -> Optional[np.ndarray]:
+        """
+        Log10 mel power of the stream samples [start, end).
+
+        Frames that need audio not captured yet (at most the last
+        ``N_FFT // 2`` samples) are left out.
+
+        Args:
+            start: First stream sample of the segment
+            end: Stream sample after the segment
+
+        Returns:
+            Copy (n_mels, frames), or None if the range has left the ring
+        """
+        first = -(-start // HOP_LENGTH)  # ceil: centro do frame 0 no início do clipe
+        last = min(first + -(-(end - start) // HOP_LENGTH), self.next_frame)
+        if first < self.next_frame - self.capacity or first >= last:
+            return None
+        columns = np.arange(first, last) % self.capacity
+        return self._ring[:, columns]
+
+    def features(self, span: Tuple[int, int], audio_data: np.ndarray) -> Optional[MelFeatures]:
+        """
+        Precomputed features of a segment cut from the stream.
+
+        Args:
+            span: (start, end) stream samples of the segment
+            audio_data: The segment's samples (only its peak is read)
+
+        Returns:
+            MelFeatures, or None if the frames are no longer available or the
+            segment does not start on the hop grid
+        """
+        start, end = span
+        if end - start != len(audio_data) or len(audio_data) == 0:
+            return None
+        if start % HOP_LENGTH:
+            # Os frames do stream ficariam deslocados até 159 amostras em relação
+            # aos do clipe: usar as amostras
+            return None
+        frames = self.frames(start, end)
+        if frames is None:
+            return None
+        peak = float(max(audio_data.max(), -audio_data.min()))
+        return MelFeatures(frames=frames, peak=peak, num_samples=len(audio_data))
@@ -0,0 +1,247 @@
+"""Raw PCM capture from a named pipe (FIFO) or stdin for headless servers."""
+
+import os
+import sys
+import time
+import select
+import threading
+import logging
+import numpy as np
+from typing import Optional, List, Tuple
+from utils.exceptions import AudioDeviceException
+from .audio_utils import PCM_FORMATS, detect_silence, get_audio_energy, pcm_to_float32
+from .ring_buffer import AudioRingBuffer
+
+logger = logging.getLogger(__name__)
+
+STDIN_PATHS = ("-", "stdin")
+
+
+class PipeAudioSource:
+    """Reads fixed-size raw PCM frames from a FIFO or stdin.
+
+    Frames are read with ``os.readv`` into one preallocated buffer and
+    wrapped with ``np.frombuffer`` (no copy); the only copy is into the
+    ``AudioRingBuffer`` that consumers read views from. No PortAudio/PyAudio
+    objects are created, so this source works on machines without ALSA.
+
+    Typical producers:
+        ffmpeg -i input -f s16le -ac 1 -ar 16000 - > /tmp/audio.fifo
+        ffmpeg -i input -f s16le -ac 1 -ar 16000 - | python main.py
+
+    The stream must already be at ``sample_rate``; it is not resampled.
+    Uses ``select`` on the file descriptor, so it requires a POSIX system.
+    """
+
+    def __init__(
+        self,
+        pipe_path: str = "-",
+        sample_rate: int = 16000,
+        chunk_size: int = 2048,
+        channels: int = 1,
+        silence_threshold: float = 0.02,
+        pcm_format: str = "int16",
+        pcm_channels: int = 1,
+        ring_buffer_seconds: float = 30.0,
+    ):
+        """
+        Initialize PipeAudioSource.
+
+        Args:
+            pipe_path: FIFO path, or "-"/"stdin" for standard input
+            sample_rate: Sample rate of the incoming stream in Hz
+            chunk_size: Frame size in samples (per channel)
+            channels: Output channels (always mono; kept for API compatibility)
+            silence_threshold: Silence detection threshold
+            pcm_format: Raw PCM sample format (float32, int16, int32)
+            pcm_channels: Interleaved channel count of the incoming stream
+            ring_buffer_seconds: Ring buffer size in seconds
+        """
+        if pcm_format not in PCM_FORMATS:
+            raise AudioDeviceException(
+                f"Unsupported PCM format '{pcm_format}'. Use: {list(PCM_FORMATS)}"
+            )
+
+        self.pipe_path = pipe_path
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.channels = channels
+        self.silence_threshold = silence_threshold
+        self.pcm_format = pcm_format
+        self.pcm_channels = pcm_channels
+
+        # Compatibilidade com AudioProcessor
+        self.device_id = -1
+        self.capture_mode = "pipe"
+        self.is_recording = False
+        self._thread: Optional[threading.Thread] = None
+
+        capacity = max(int(ring_buffer_seconds * sample_rate), chunk_size * 4)
+        self.ring_buffer = AudioRingBuffer(capacity)
+        self.frames_read = 0
+        self.finished = threading.Event()
+
+        if not self._is_stdin() and not os.path.exists(pipe_path):
+            raise AudioDeviceException(f"Pipe not found: {pipe_path}")
+
+    def _is_stdin(self) -> bool:
+        return self.pipe_path in STDIN_PATHS
+
+    def _open_fd(self) -> Tuple[int, bool]:
+        """Open the input and return (fd, owns_fd)."""
+        if self._is_stdin():
+            return sys.stdin.fileno(), False
+        # O_NONBLOCK: abrir um FIFO sem writer não bloqueia (o writer pode vir depois)
+        return os.open(self.pipe_path, os.O_RDONLY | os.O_NONBLOCK), True
+
+    def list_devices(self) -> List[dict]:
+        """List available devices (the pipe itself)."""
+        return [{
+            "index": -1,
+            "name": "stdin" if self._is_stdin() else f"pipe:{self.pipe_path}",
+            "max_input_channels": self.pcm_channels,
+            "max_output_channels": 0,
+            "default_input": True,
+        }]
+
+    def start(self) -> None:
+        """Start reading from the pipe."""
+        if self.is_recording:
+            logger.warning("Pipe capture already in progress")
+            return
+
+        self.ring_buffer.reset()
+        self.finished.clear()
+        self.frames_read = 0
+        self.is_recording = True
+        self._thread = threading.Thread(target=self._read_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"Pipe audio capture started ({self.pipe_path}, format={self.pcm_format})")
+
+    def stop(self) -> None:
+        """Stop reading from the pipe."""
+        self.is_recording = False
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        logger.info("Pipe audio capture stopped")
+
+    def _read_loop(self) -> None:
+        """Read fixed-size frames and write them into the ring buffer."""
+        dtype, scale = PCM_FORMATS[self.pcm_format]
+        frame = bytearray(self.chunk_size * self.pcm_channels * np.dtype(dtype).itemsize)
+        frame_view = memoryview(frame)
+        # View fixa sobre o buffer do frame - reutilizada a cada leitura
+        raw = np.frombuffer(frame, dtype=dtype)
+        filled = 0
+        fd = None
+        owns_fd = False
+
+        try:
+            fd, owns_fd = self._open_fd()
+            while self.is_recording:
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+
+                try:
+                    n = os.readv(fd, [frame_view[filled:]])
+                except BlockingIOError:
+                    continue
+
+                if n == 0:
+                    if not owns_fd:
+                        logger.info("stdin closed (EOF)")
+                        if filled:
+                            # Último frame incompleto: completar com silêncio para não perder o fim da fala
+                            frame[filled:] = bytes(len(frame) - filled)
+                            self.ring_buffer.write(pcm_to_float32(raw, scale, self.pcm_channels))
+                            self.frames_read += 1
+                        break
+                    # FIFO sem writer: aguardar o produtor reconectar
+                    time.sleep(0.1)
+                    continue
+
+                filled += n
+                if filled < len(frame):
+                    continue
+
+                filled = 0
+                self.ring_buffer.write(pcm_to_float32(raw, scale, self.pcm_channels))
+                self.frames_read += 1
+
+        except Exception as e:
+            logger.error(f"Pipe capture failed: {e}")
+        finally:
+            if owns_fd and fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+            self.finished.set()
+            logger.info("Pipe capture loop ended")
+
+    def get_chunk(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Get next audio chunk (owned copy).
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            Audio data as numpy array or None if timeout
+        """
+        view = self.get_chunk_view(timeout)
+        return view.copy() if view is not None else None
+
+    def get_chunk_view(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Get next audio chunk as a view into the ring buffer.
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            Audio data view or None if timeout
+        """
+        return self.ring_buffer.read(self.chunk_size, timeout=timeout)
+
+    def is_finished(self) -> bool:
+        """True once stdin reached EOF and every buffered frame was consumed."""
+        return self.finished.is_set() and self.ring_buffer.available() < self.chunk_size
+
+    def get_energy(self) -> float:
+        """Get current audio energy level."""
+        return get_audio_energy(self.ring_buffer.peek_latest(self.chunk_size))
+
+    def is_silent(self) -> bool:
+        """Check if current audio is silent."""
+        chunk = self.ring_buffer.peek_latest(self.chunk_size)
+        if len(chunk) == 0:
+            return True
+        is_silent, _ = detect_silence(chunk, self.sample_rate, self.silence_threshold)
+        return is_silent
+
+    def get_queue_size(self) -> int:
+        """Get current queue size (in chunks)."""
+        return self.ring_buffer.available() // self.chunk_size
+
+    def get_capture_stats(self) -> dict:
+        """Get capture statistics."""
+        return {
+            "capture_mode": self.capture_mode,
+            "pipe_path": self.pipe_path,
+            "frames_read": self.frames_read,
+            "ring_capacity_samples": self.ring_buffer.capacity,
+            "ring_available_samples": self.ring_buffer.available(),
+            "ring_overruns": self.ring_buffer.overrun_count,
+            "ring_dropped_samples": self.ring_buffer.dropped_samples,
+            "finished": self.finished.is_set(),
+        }
+
+    def clear_queue(self) -> None:
+        """Clear buffered audio."""
+        self.ring_buffer.clear()
+
+    def set_device(self, device_id: int) -> None:
+        """Devices do not apply to pipe sources; kept for API compatibility."""
+        logger.warning("set_device ignored: audio source is a pipe")
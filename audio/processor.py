@@ -8,12 +8,22 @@ import logging
 from typing import Optional, Callable, List
 from utils.exceptions import AudioDeviceException, AudioCaptureException
 from .audio_utils import detect_silence, get_audio_energy, convert_bytes_to_numpy
+from .ring_buffer import AudioRingBuffer
 
 logger = logging.getLogger(__name__)
 
 
 class AudioProcessor:
-    """Captures audio from microphone in real-time."""
+    """Captures audio from microphone in real-time.
+
+    Two capture modes are available:
+    - "blocking": a capture thread calls ``stream.read()`` and pushes chunks
+      into ``audio_queue`` (original behaviour).
+    - "callback": PortAudio's ``stream_callback`` writes straight into a
+      preallocated ``AudioRingBuffer``; consumers read views from it.
+    """
+
+    CAPTURE_MODES = ("blocking", "callback")
 
     def __init__(
         self,
@@ -22,6 +32,8 @@ class AudioProcessor:
         chunk_size: int = 2048,
         channels: int = 1,
         silence_threshold: float = 0.02,
+        capture_mode: str = "blocking",
+        ring_buffer_seconds: float = 30.0,
     ):
         """
         Initialize AudioProcessor.
@@ -32,12 +44,19 @@ class AudioProcessor:
             chunk_size: Chunk size in samples
             channels: Number of audio channels
             silence_threshold: Silence detection threshold
+            capture_mode: "blocking" (read thread + queue) or "callback" (ring buffer)
+            ring_buffer_seconds: Ring buffer size in seconds (callback mode)
         """
+        if capture_mode not in self.CAPTURE_MODES:
+            logger.warning(f"Unknown capture_mode '{capture_mode}', using 'blocking'")
+            capture_mode = "blocking"
+
         self.device_id = device_id
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size
         self.channels = channels
         self.silence_threshold = silence_threshold
+        self.capture_mode = capture_mode
 
         self.pa = pyaudio.PyAudio()
         self.stream: Optional[pyaudio.Stream] = None
@@ -48,6 +67,12 @@ class AudioProcessor:
         self._stream_lock = threading.Lock()
         self._capture_thread: Optional[threading.Thread] = None
 
+        # Ring buffer (modo callback) - intercalado se channels > 1
+        self.ring_buffer: Optional[AudioRingBuffer] = None
+        if self.capture_mode == "callback":
+            capacity = max(int(ring_buffer_seconds * sample_rate), chunk_size * 4) * channels
+            self.ring_buffer = AudioRingBuffer(capacity)
+
         self._validate_device()
 
     def _validate_device(self) -> None:
@@ -100,8 +125,16 @@ class AudioProcessor:
                 return
 
             # Log tentativa de abertura
-            logger.info(f"Attempting to open audio stream (device={self.device_id}, sr={self.sample_rate})")
-            
+            logger.info(
+                f"Attempting to open audio stream (device={self.device_id}, sr={self.sample_rate}, "
+                f"mode={self.capture_mode})"
+            )
+
+            use_callback = self.capture_mode == "callback"
+            stream_callback = self._stream_callback if use_callback else None
+            if use_callback:
+                self.ring_buffer.reset()
+
             # Tentar abrir o device
             try:
                 self.stream = self.pa.open(
@@ -111,7 +144,7 @@ class AudioProcessor:
                     input=True,
                     input_device_index=self.device_id if self.device_id != -1 else None,
                     frames_per_buffer=self.chunk_size,
-                    stream_callback=None,  # We'll use blocking mode
+                    stream_callback=stream_callback,
                 )
             except Exception as e:
                 logger.error(f"Failed to open audio stream with device {self.device_id}: {e}")
@@ -125,12 +158,15 @@ class AudioProcessor:
                     input=True,
                     input_device_index=None,  # Use default
                     frames_per_buffer=self.chunk_size,
-                    stream_callback=None,
+                    stream_callback=stream_callback,
                 )
 
             self.is_recording = True
-            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
-            self._capture_thread.start()
+            # No modo callback o PortAudio chama _stream_callback na sua própria thread
+            # (o stream já inicia ativo); no modo blocking usamos a thread de leitura
+            if not use_callback:
+                self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+                self._capture_thread.start()
 
             # CORREÇÃO: Aguardar um pouco para a fila começar a ser preenchida
             # Evita o timeout inicial no primeiro get_chunk()
@@ -166,6 +202,12 @@ class AudioProcessor:
             logger.error(f"Error stopping audio capture: {e}")
             raise AudioCaptureException(f"Error stopping audio capture: {e}")
 
+    def _stream_callback(self, in_data, frame_count, time_info, status_flags):
+        """PortAudio callback (callback mode): copy input straight into the ring buffer."""
+        if in_data:
+            self.ring_buffer.write(np.frombuffer(in_data, dtype=np.float32))
+        return (None, pyaudio.paContinue)
+
     def _capture_loop(self) -> None:
         """Main audio capture loop."""
         import time
@@ -255,13 +297,36 @@ class AudioProcessor:
         Returns:
             Audio data as numpy array or None if timeout
         """
+        if self.ring_buffer is not None:
+            view = self.get_chunk_view(timeout)
+            return view.copy() if view is not None else None
         try:
             return self.audio_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
+    def get_chunk_view(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        Get the next chunk as a view into the ring buffer (callback mode).
+
+        The view is only valid until the producer wraps around the ring, so
+        callers that keep the samples must copy them. In blocking mode this is
+        the same as get_chunk().
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            Audio data (interleaved if channels > 1) or None if timeout
+        """
+        if self.ring_buffer is None:
+            return self.get_chunk(timeout)
+        return self.ring_buffer.read(self.chunk_size * self.channels, timeout=timeout)
+
     def get_energy(self) -> float:
         """Get current audio energy level."""
+        if self.ring_buffer is not None:
+            return get_audio_energy(self.ring_buffer.peek_latest(self.chunk_size * self.channels))
         try:
             # Peek at queue without removing
             chunk = self.audio_queue.get(timeout=0.1)
@@ -273,6 +338,12 @@ class AudioProcessor:
 
     def is_silent(self) -> bool:
         """Check if current audio is silent."""
+        if self.ring_buffer is not None:
+            chunk = self.ring_buffer.peek_latest(self.chunk_size * self.channels)
+            if len(chunk) == 0:
+                return True
+            is_silent, _ = detect_silence(chunk, self.sample_rate, self.silence_threshold)
+            return is_silent
         try:
             chunk = self.audio_queue.get(timeout=0.1)
             is_silent, _ = detect_silence(chunk, self.sample_rate, self.silence_threshold)
@@ -282,11 +353,28 @@ class AudioProcessor:
             return True
 
     def get_queue_size(self) -> int:
-        """Get current queue size."""
+        """Get current queue size (in chunks)."""
+        if self.ring_buffer is not None:
+            return self.ring_buffer.available() // (self.chunk_size * self.channels)
         return self.audio_queue.qsize()
 
+    def get_capture_stats(self) -> dict:
+        """Get capture statistics (overruns/drops in callback mode)."""
+        stats = {"capture_mode": self.capture_mode}
+        if self.ring_buffer is not None:
+            stats.update({
+                "ring_capacity_samples": self.ring_buffer.capacity,
+                "ring_available_samples": self.ring_buffer.available(),
+                "ring_overruns": self.ring_buffer.overrun_count,
+                "ring_dropped_samples": self.ring_buffer.dropped_samples,
+            })
+        return stats
+
     def clear_queue(self) -> None:
         """Clear audio queue."""
+        if self.ring_buffer is not None:
+            self.ring_buffer.clear()
+            return
         while not self.audio_queue.empty():
             try:
                 self.audio_queue.get_nowait()
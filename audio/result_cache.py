@@ -0,0 +1,166 @@
+"""Content-addressed cache of transcription results (memory LRU + optional disk)."""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionCache:
+    """Transcription results keyed by a hash of the audio and the decoding settings.
+
+    Replaying a fixed corpus (file source, benchmarks) decodes each clip
+    once; later runs are served from memory or, with ``disk_dir``, from
+    one JSON file per result that survives restarts and is shared by the
+    worker processes of a TranscriberPool.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: Optional[str] = None):
+        """
+        Initialize TranscriptionCache.
+
+        Args:
+            max_entries: Results kept in memory (least recently used evicted first)
+            disk_dir: Directory of the on-disk tier (None = memory only)
+        """
+        self.max_entries = max(int(max_entries), 1)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(audio_data: np.ndarray, sample_rate: int, settings: Dict[str, Any]) -> str:
+        """
+        Fingerprint of one transcription request.
+
+        Args:
+            audio_data: Samples as submitted (preparation is deterministic, so
+                the raw samples identify the prepared ones)
+            sample_rate: Sample rate in Hz
+            settings: Everything else that changes the result (model, decoding options)
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        samples = np.ascontiguousarray(audio_data, dtype=np.float32)
+        digest.update(f"{sample_rate}:{len(samples)}:".encode())
+        digest.update(samples.tobytes())
+        digest.update(json.dumps(settings, sort_keys=True, default=repr).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached result for ``key`` (a copy), or None.
+
+        Args:
+            key: Fingerprint from ``key()``
+        """
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(result)
+
+        result = self._read_disk(key)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, result)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store a result in memory and, if configured, on disk.
+
+        Args:
+            key: Fingerprint from ``key()``
+            result: Transcription result (copied)
+        """
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._store(key, result)
+        self._write_disk(key, result)
+
+    def clear(self) -> None:
+        """Forget the in-memory results (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "disk_dir": str(self.disk_dir) if self.disk_dir else None,
+            }
+
+    def _store(self, key: str, result: Dict[str, Any]) -> None:
+        """Insert into the LRU (lock held)."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Path:
+        # Subpastas pelo prefixo do hash: evita diretórios com milhares de arquivos
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.disk_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached transcription {path.name}: {e}")
+            return None
+
+    def _write_disk(self, key: str, result: Dict[str, Any]) -> None:
+        if self.disk_dir is None:
+            return
+        path = self._path(key)
+        # Escrita atômica: workers de outros processos podem ler ao mesmo tempo
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, default=_to_json)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cached transcription: {e}")
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _to_json(value: Any) -> Any:
+    """JSON fallback for numpy scalars/arrays in results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,148 @@
+"""Preallocated float32 ring buffer for real-time audio capture."""
+
+import threading
+import logging
+import numpy as np
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """Single-producer / single-consumer ring buffer of float32 samples.
+
+    The producer (PortAudio callback) only advances the write cursor and the
+    consumer only advances the read cursor, so no lock is needed between them.
+    Cursors are monotonic sample counters; the physical position is
+    ``cursor % capacity``.
+
+    Every sample is written twice (at ``pos`` and ``pos + capacity``) into a
+    buffer of ``2 * capacity`` samples. This mirroring makes any window of up
+    to ``capacity`` samples contiguous, so readers always get a plain view
+    without concatenating the wrapped parts.
+
+    Views are only valid until the producer laps them (``capacity`` samples
+    later). Consumers that keep data longer must copy it.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize AudioRingBuffer.
+
+        Args:
+            capacity: Maximum number of buffered samples
+        """
+        if capacity <= 0:
+            raise ValueError(f"Invalid ring buffer capacity: {capacity}")
+
+        self.capacity = int(capacity)
+        self._buffer = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._write_pos = 0
+        self._read_pos = 0
+        self._data_event = threading.Event()
+
+        # Estatísticas de overrun (consumidor não acompanhou o produtor)
+        self.overrun_count = 0
+        self.dropped_samples = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Append samples (producer side).
+
+        Args:
+            samples: float32 samples to append
+        """
+        n = len(samples)
+        if n == 0:
+            return
+
+        # Bloco maior que o buffer: só os últimos `capacity` samples sobrevivem
+        if n > self.capacity:
+            samples = samples[-self.capacity:]
+            self._write_pos += n - self.capacity
+            n = self.capacity
+
+        cap = self.capacity
+        start = self._write_pos % cap
+        first = min(n, cap - start)
+
+        # Região principal + espelho
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[start + cap:start + cap + first] = samples[:first]
+        if first < n:
+            rest = n - first
+            self._buffer[:rest] = samples[first:]
+            self._buffer[cap:cap + rest] = samples[first:]
+
+        self._write_pos += n
+        self._data_event.set()
+
+    def available(self) -> int:
+        """Number of unread samples (capped at capacity)."""
+        return min(self._write_pos - self._read_pos, self.capacity)
+
+    def _check_overrun(self) -> None:
+        """Skip the read cursor past data the producer already overwrote."""
+        lag = self._write_pos - self._read_pos
+        if lag > self.capacity:
+            dropped = lag - self.capacity
+            self._read_pos += dropped
+            self.overrun_count += 1
+            self.dropped_samples += dropped
+            logger.debug(f"Ring buffer overrun: dropped {dropped} samples")
+
+    def read(self, num_samples: int, timeout: Optional[float] = 1.0) -> Optional[np.ndarray]:
+        """
+        Read the next ``num_samples`` samples as a view (consumer side).
+
+        Args:
+            num_samples: Number of samples to read (<= capacity)
+            timeout: Max seconds to wait for data (None waits forever)
+
+        Returns:
+            Contiguous view into the buffer, or None on timeout
+        """
+        num_samples = min(int(num_samples), self.capacity)
+
+        while self._write_pos - self._read_pos < num_samples:
+            self._data_event.clear()
+            # Re-checar após limpar o evento para não perder um write concorrente
+            if self._write_pos - self._read_pos >= num_samples:
+                break
+            if not self._data_event.wait(timeout):
+                return None
+
+        self._check_overrun()
+        start = self._read_pos % self.capacity
+        self._read_pos += num_samples
+        return self._buffer[start:start + num_samples]
+
+    def peek_latest(self, num_samples: int) -> np.ndarray:
+        """
+        View of the most recently written samples without consuming them.
+
+        Args:
+            num_samples: Number of samples wanted
+
+        Returns:
+            Contiguous view with up to ``num_samples`` samples
+        """
+        num_samples = min(int(num_samples), self.capacity, self._write_pos)
+        if num_samples <= 0:
+            return self._buffer[:0]
+        end = self._write_pos % self.capacity or self.capacity
+        if end < num_samples:
+            end += self.capacity
+        return self._buffer[end - num_samples:end]
+
+    def clear(self) -> None:
+        """Discard all unread samples (consumer side)."""
+        self._read_pos = self._write_pos
+
+    def reset(self) -> None:
+        """Reset cursors and statistics. Only call while the producer is stopped."""
+        self._write_pos = 0
+        self._read_pos = 0
+        self.overrun_count = 0
+        self.dropped_samples = 0
+        self._data_event.clear()
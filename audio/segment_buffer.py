@@ -0,0 +1,94 @@
+"""Growable preallocated sample accumulator for speech segments."""
+
+import numpy as np
+
+
+class SampleAccumulator:
+    """Accumulates float32 chunks into one preallocated contiguous array.
+
+    Replaces ``list.append`` + ``sum(len(c) ...)`` + ``np.concatenate``: the
+    length is tracked in O(1), each chunk is copied once, and the finished
+    segment is handed out as a slice of the storage (no concatenate copy).
+    """
+
+    def __init__(self, initial_capacity: int = 16000):
+        """
+        Initialize SampleAccumulator.
+
+        Args:
+            initial_capacity: Initial capacity in samples (grows by doubling)
+        """
+        self._capacity = max(int(initial_capacity), 1)
+        self._buffer = np.empty(self._capacity, dtype=np.float32)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        """Current storage capacity in samples."""
+        return self._capacity
+
+    def _grow(self, min_capacity: int) -> None:
+        """Grow storage to at least ``min_capacity`` samples."""
+        new_capacity = self._capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+        new_buffer = np.empty(new_capacity, dtype=np.float32)
+        new_buffer[:self._length] = self._buffer[:self._length]
+        self._buffer = new_buffer
+        self._capacity = new_capacity
+
+    def append(self, chunk: np.ndarray) -> None:
+        """
+        Copy a chunk to the end of the segment.
+
+        Args:
+            chunk: Audio samples
+        """
+        n = len(chunk)
+        end = self._length + n
+        if end > self._capacity:
+            self._grow(end)
+        self._buffer[self._length:end] = chunk
+        self._length = end
+
+    def view(self) -> np.ndarray:
+        """View of the accumulated samples (invalidated by append/clear)."""
+        return self._buffer[:self._length]
+
+    def detach(self) -> np.ndarray:
+        """
+        Hand out the accumulated segment and start a new one.
+
+        The returned slice keeps the current storage alive; fresh storage
+        (uninitialised, so effectively free until written) is allocated for
+        the next segment. This lets another thread own the segment without a
+        copy.
+
+        Returns:
+            Contiguous array with the accumulated samples
+        """
+        segment = self._buffer[:self._length]
+        self._buffer = np.empty(self._capacity, dtype=np.float32)
+        self._length = 0
+        return segment
+
+    def clear(self) -> None:
+        """Drop accumulated samples, reusing the storage."""
+        self._length = 0
+
+    def keep_tail(self, num_samples: int) -> None:
+        """
+        Keep only the newest ``num_samples`` samples, reusing the storage.
+
+        Args:
+            num_samples: Number of samples to keep
+        """
+        num_samples = min(max(int(num_samples), 0), self._length)
+        if num_samples == self._length:
+            return
+        # Origem e destino podem se sobrepor; o numpy trata a cópia corretamente
+        self._buffer[:num_samples] = self._buffer[self._length - num_samples:self._length]
+        self._length = num_samples
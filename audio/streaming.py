@@ -0,0 +1,65 @@
+"""LocalAgreement commit policy for streaming (partial) transcription."""
+
+import re
+from typing import List, Tuple
+
+_PUNCTUATION = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def _normalize(word: str) -> str:
+    """Compare words ignoring case and punctuation."""
+    return _PUNCTUATION.sub("", word.lower())
+
+
+class LocalAgreement:
+    """Commits the word prefix that consecutive hypotheses agree on.
+
+    The same growing window of audio is re-decoded periodically. Words near
+    the end of the window change between decodes, so they are only shown as
+    unstable text; once two consecutive hypotheses share a prefix
+    (LocalAgreement-2), that prefix is committed and never retracted.
+    """
+
+    def __init__(self):
+        """Initialize LocalAgreement."""
+        self.committed: List[str] = []
+        self._previous: List[str] = []
+
+    def insert(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        Add a hypothesis for the current window.
+
+        Args:
+            text: Full transcription of the window
+
+        Returns:
+            Tuple of (newly committed words, unstable tail words)
+        """
+        words = text.split()
+        start = len(self.committed)
+
+        # Hipóteses que contradizem o já confirmado: manter o confirmado
+        head = [_normalize(w) for w in words[:start]]
+        if head != [_normalize(w) for w in self.committed[:len(head)]]:
+            self._previous = words
+            return [], words[start:]
+
+        agreed = start
+        limit = min(len(words), len(self._previous))
+        while agreed < limit and _normalize(words[agreed]) == _normalize(self._previous[agreed]):
+            agreed += 1
+
+        new_words = words[start:agreed]
+        self.committed.extend(new_words)
+        self._previous = words
+        return new_words, words[agreed:]
+
+    @property
+    def committed_text(self) -> str:
+        """Committed words joined as text."""
+        return " ".join(self.committed)
+
+    def reset(self) -> None:
+        """Start a new utterance."""
+        self.committed = []
+        self._previous = []
@@ -7,15 +7,68 @@ import queue
 import logging
 import torch
 import gc
-from typing import Optional, Dict, Any
+import time
+import warnings
+from collections import deque
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from pathlib import Path
 from utils.exceptions import WhisperException
+from .asr_backend import ASRBackend, create_backend
+from .load_monitor import RealTimeFactorMonitor
+from .cpu_tuning import apply_cpu_affinity, apply_torch_threads, cpu_affinity_scope, parse_cpu_list
+from .mel_frontend import MelFeatures
+from .hotwords import HotwordBias
+from .early_trigger import EarlyKeywordMatcher, EarlyKeywordTrigger, next_segment_id
+from .result_cache import TranscriptionCache
+from . import weight_cache
 
 logger = logging.getLogger(__name__)
 
+# Decodificação parcial (streaming): gulosa e sem contexto anterior - a janela é
+# decodificada de novo a cada intervalo, então a velocidade importa mais
+PARTIAL_DECODE_OPTIONS = {
+    "beam_size": None,
+    "best_of": None,
+    "patience": None,
+    "temperature": 0.0,
+    "condition_on_previous_text": False,
+    "word_timestamps": False,
+}
 
-class Transcriber:
-    """Transcribes audio using OpenAI Whisper."""
+# Primeira passada da política greedy_first: gulosa e sem fallback de temperatura
+GREEDY_DECODE_OPTIONS = {
+    "beam_size": None,
+    "best_of": None,
+    "patience": None,
+    "temperature": 0.0,
+}
+
+DECODING_POLICIES = ("beam", "greedy_first")
+
+QUANTIZE_MODES = ("none", "int8")
+
+
+def _state_dict_bytes(model: torch.nn.Module) -> int:
+    """Size of a model's weights in bytes (includes packed quantized weights)."""
+
+    def tensor_bytes(value) -> int:
+        if torch.is_tensor(value):
+            return value.element_size() * value.nelement()
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(v) for v in value)
+        return 0
+
+    return sum(tensor_bytes(v) for v in model.state_dict().values())
+
+
+# Marcador na fila de entrada: "há uma janela parcial pendente"
+_PARTIAL = object()
+
+
+class Transcriber(ASRBackend):
+    """Transcribes audio using OpenAI Whisper (PyTorch backend)."""
+
+    name = "whisper"
 
     def __init__(
         self,
@@ -38,6 +91,20 @@ class Transcriber:
         initial_prompt: Optional[str] = None,
         word_timestamps: bool = False,
         hallucination_silence_threshold: Optional[float] = None,
+        encoder_mode: str = "accuracy",
+        short_clip_max_seconds: float = 5.0,
+        short_clip_padding_seconds: float = 1.0,
+        quantize: str = "none",
+        num_threads: int = 0,
+        interop_threads: int = 0,
+        hotwords: Optional[List[str]] = None,
+        hotword_prompt: bool = False,
+        hotword_boost: float = 0.0,
+        early_keywords: Optional[List[Dict]] = None,
+        result_cache_entries: int = 0,
+        result_cache_dir: Optional[str] = None,
+        weight_cache: bool = False,
+        weight_cache_dir: Optional[str] = None,
     ):
         """
         Initialize Transcriber.
@@ -61,6 +128,24 @@ class Transcriber:
             initial_prompt: Initial prompt to guide transcription
             word_timestamps: Extract word-level timestamps
             hallucination_silence_threshold: Skip silent periods during hallucinations
+            encoder_mode: "accuracy" (always 30 s window) or "latency" (truncated
+                encoder context for clips up to short_clip_max_seconds)
+            short_clip_max_seconds: Longest clip that uses the truncated context
+            short_clip_padding_seconds: Silence kept after the clip in the truncated context
+            quantize: "int8" applies dynamic int8 quantization to the Linear
+                layers after loading (CPU only); "none" keeps float weights
+            num_threads: torch intra-op threads set on load (0 = torch default)
+            interop_threads: torch inter-op threads set on load (0 = torch default)
+            hotwords: Words decoding is biased towards (e.g. the keyword patterns)
+            hotword_prompt: Append the hotwords to the initial prompt
+            hotword_boost: Logit boost for the hotword tokens (0 = no logit bias)
+            early_keywords: Keyword configurations reported through
+                ``on_early_keyword`` as soon as they are decoded (None = off)
+            result_cache_entries: Results cached in memory by audio fingerprint (0 = no cache)
+            result_cache_dir: Directory that also keeps cached results on disk (None = memory only)
+            weight_cache: Load the weights memory-mapped from a converted copy
+                (see weight_cache.load_model)
+            weight_cache_dir: Directory of the converted weights (None = next to whisper's downloads)
         """
         # Auto-detect CUDA if device not specified or is "auto"
         if device is None or device == "auto":
@@ -97,18 +182,182 @@ class Transcriber:
         self.initial_prompt = initial_prompt
         self.word_timestamps = word_timestamps
         self.hallucination_silence_threshold = hallucination_silence_threshold
+        self.encoder_mode = encoder_mode
+        self.short_clip_max_seconds = short_clip_max_seconds
+        self.short_clip_padding_seconds = short_clip_padding_seconds
+        self.quantize = quantize if quantize in QUANTIZE_MODES else "none"
+        self.quantization_info: Dict[str, Any] = {}
+        self.num_threads = max(int(num_threads or 0), 0)
+        self.interop_threads = max(int(interop_threads or 0), 0)
+        self.threads: Dict[str, Any] = {}
+        self.hotwords = tuple(hotwords or ())
+        self.hotword_prompt = hotword_prompt
+        self.hotword_boost = max(float(hotword_boost or 0.0), 0.0)
+        self._hotword_bias: Optional[HotwordBias] = None
+        self._early_matcher: Optional[EarlyKeywordMatcher] = None
+        self.set_early_keywords(early_keywords)
+        self.result_cache: Optional[TranscriptionCache] = None
+        if result_cache_entries and int(result_cache_entries) > 0:
+            self.result_cache = TranscriptionCache(result_cache_entries, result_cache_dir or None)
+        self.weight_cache = weight_cache
+        self.weight_cache_dir = weight_cache_dir or None
+        self.weight_cache_info: Dict[str, Any] = {}
         
         logger.info(f"Whisper transcriber initialized with device: {device}, fp16: {fp16}, language: {language}")
         logger.info(f"Advanced settings: beam_size={beam_size}, best_of={best_of}, temperature={temperature}")
 
-        logger.info(f"Loading Whisper model: {model_name}")
+        self.model = None
+        self.load()
+
+    def load(self) -> None:
+        """Load the Whisper model on the configured device."""
+        logger.info(f"Loading Whisper model: {self.model_name}")
+        # Threads do torch valem para o processo inteiro; definidas antes da primeira inferência
+        self.threads = apply_torch_threads(self.num_threads, self.interop_threads)
+        logger.info(
+            f"torch threads: intra-op={self.threads['num_threads']}, "
+            f"inter-op={self.threads['interop_threads']}"
+        )
         try:
-            self.model = whisper.load_model(model_name, device=device)
-            logger.info(f"Whisper model loaded successfully on {device}")
+            if self.weight_cache:
+                self.model, self.weight_cache_info = weight_cache.load_model(
+                    self.model_name, self.device, self.weight_cache_dir
+                )
+                logger.info(f"Weight cache: {self.weight_cache_info}")
+            else:
+                self.model = whisper.load_model(self.model_name, device=self.device)
+            logger.info(f"Whisper model loaded successfully on {self.device}")
         except Exception as e:
             logger.error(f"Failed to load Whisper model: {e}")
             raise WhisperException(f"Failed to load Whisper model: {e}")
 
+        self.quantization_info = {}
+        if self.quantize == "int8":
+            if self.device == "cpu":
+                self._quantize_int8()
+            else:
+                logger.info(f"whisper.quantize=int8 ignored on {self.device} (CPU only)")
+
+        # model.transcribe decodifica via model.decode: usar as mesmas tarefas
+        # (com o viés de hotwords) que o passe único
+        self.model.decode = self._decode_with_hook
+        self.set_hotwords(list(self.hotwords))
+
+    def set_hotwords(self, words: List[str]) -> None:
+        """
+        Replace the hotwords and rebuild the logit bias.
+
+        Args:
+            words: Hotwords (see hotwords_from_keywords)
+        """
+        super().set_hotwords(words)
+        if not self.hotwords or self.hotword_boost <= 0 or self.model is None:
+            self._hotword_bias = None
+            return
+        from whisper.tokenizer import get_tokenizer
+        tokenizer = get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language=self.language,
+            task=self.task,
+        )
+        self._hotword_bias = HotwordBias.from_words(tokenizer, list(self.hotwords), self.hotword_boost)
+        logger.info(f"Hotword bias: {len(self.hotwords)} words, boost {self.hotword_boost}")
+
+    def set_early_keywords(self, keywords: Optional[List[Dict]]) -> None:
+        """
+        Replace the keywords reported through ``on_early_keyword`` while decoding.
+
+        Args:
+            keywords: Keyword configurations, or None to disable the early trigger
+        """
+        matcher = EarlyKeywordMatcher(keywords or [])
+        self._early_matcher = matcher if matcher else None
+
+    def _decoding_task(self, options: "whisper.DecodingOptions"):
+        """DecodingTask with the hotword bias and the early keyword trigger in its logit filters."""
+        from whisper.decoding import DecodingTask
+
+        task = DecodingTask(self.model, options)
+        bias = self._hotword_bias
+        if bias is not None:
+            task.logit_filters.append(bias)
+        if self._early_matcher is not None and self.on_early_keyword is not None:
+            # Observador novo por tarefa: cada decodificação dispara no máximo uma vez por item
+            task.logit_filters.append(EarlyKeywordTrigger(
+                self._early_matcher, task.tokenizer, task.sample_begin, task.n_group,
+                self._report_early_keyword,
+            ))
+        return task
+
+    def _decode_with_hook(self, mel: torch.Tensor, options: "whisper.DecodingOptions" = None):
+        """Replacement for ``model.decode`` (same contract as whisper.decoding.decode)."""
+        options = options or whisper.DecodingOptions()
+        single = mel.ndim == 2
+        if single:
+            mel = mel.unsqueeze(0)
+        with torch.no_grad():
+            result = self._decoding_task(options).run(mel)
+        return result[0] if single else result
+
+    def _quantize_int8(self) -> None:
+        """Apply dynamic int8 quantization to the model's Linear layers.
+
+        Weights are stored as int8 and activations are quantized on the fly,
+        which roughly halves the model's RAM and speeds up the matmul-bound
+        decoder on CPU. Memory and a short forward-pass timing are measured
+        before and after and reported in get_status().
+        """
+        try:
+            bytes_before = _state_dict_bytes(self.model)
+            seconds_before = self._time_forward()
+
+            for module in self.model.modules():
+                if isinstance(module, whisper.model.Linear):
+                    # quantize_dynamic só converte nn.Linear exato; o Linear do
+                    # whisper só acrescenta um cast de dtype, inútil em fp32 no CPU
+                    module.__class__ = torch.nn.Linear
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")  # API torch.ao marcada como obsoleta
+                torch.ao.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+
+            bytes_after = _state_dict_bytes(self.model)
+            seconds_after = self._time_forward()
+        except Exception as e:
+            logger.error(f"int8 quantization failed, keeping float weights: {e}")
+            self.quantization_info = {"error": str(e)}
+            return
+
+        self.quantization_info = {
+            "memory_before_mb": round(bytes_before / 1024**2, 1),
+            "memory_after_mb": round(bytes_after / 1024**2, 1),
+            "memory_saved_mb": round((bytes_before - bytes_after) / 1024**2, 1),
+            "forward_ms_before": round(seconds_before * 1000, 1),
+            "forward_ms_after": round(seconds_after * 1000, 1),
+            "speedup": round(seconds_before / seconds_after, 2) if seconds_after > 0 else None,
+        }
+        logger.info(
+            f"✓ Whisper quantized to int8: {self.quantization_info['memory_before_mb']} MB -> "
+            f"{self.quantization_info['memory_after_mb']} MB, speedup x{self.quantization_info['speedup']}"
+        )
+
+    def _time_forward(self, repeats: int = 3) -> float:
+        """Best-of-N time of one encoder pass (3 s context) plus a short decoder step."""
+        n_mels = self.model.dims.n_mels
+        mel = torch.zeros((1, n_mels, 300), device=self.model.device)
+        tokens = torch.zeros((1, 4), dtype=torch.long, device=self.model.device)
+        best = float("inf")
+        with torch.no_grad():
+            for _ in range(repeats):
+                start = time.perf_counter()
+                features = self._encode(mel)
+                self.model.decoder(tokens, features)
+                best = min(best, time.perf_counter() - start)
+        return best
+
     def _detect_best_device(self) -> str:
         """Detect best available device for Whisper.
         
@@ -132,6 +381,8 @@ class Transcriber:
         """Unload Whisper model from memory to free VRAM/RAM."""
         try:
             if hasattr(self, 'model') and self.model is not None:
+                # Mover para CPU antes de deletar (libera VRAM)
+                self.model.cpu()
                 del self.model
                 self.model = None
                 
@@ -172,7 +423,7 @@ class Transcriber:
                 self.fp16 = False
             
             logger.info(f"Loading Whisper model: {self.model_name} on {self.device}")
-            self.model = whisper.load_model(self.model_name, device=self.device)
+            self.load()
             logger.info(f"✓ Whisper model reloaded successfully")
             return True
             
@@ -182,13 +433,18 @@ class Transcriber:
 
     def get_status(self) -> Dict[str, Any]:
         """Get transcriber status."""
-        status = {
-            "model_name": self.model_name,
-            "device": self.device,
-            "fp16": self.fp16,
-            "language": self.language,
-            "loaded": self.model is not None,
-        }
+        status = super().get_status()
+        status["encoder_mode"] = self.encoder_mode
+        status["quantize"] = self.quantize
+        status["threads"] = dict(self.threads)
+        status["hotword_boost"] = self.hotword_boost
+        status["early_keyword_trigger"] = self._early_matcher is not None
+        if self.result_cache is not None:
+            status["result_cache"] = self.result_cache.get_stats()
+        if self.weight_cache_info:
+            status["weight_cache"] = dict(self.weight_cache_info)
+        if self.quantization_info:
+            status["quantization"] = dict(self.quantization_info)
         
         if self.device == "cuda" and torch.cuda.is_available():
             try:
@@ -199,21 +455,95 @@ class Transcriber:
         
         return status
 
+    def _prepare_audio(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
+        """Pad very short audio and normalize peak.
+
+        No sample-level noise gate: it cannot be reproduced on precomputed
+        log-mel features, and zeroing samples under 1% of the peak distorts
+        every zero crossing; Whisper's log-mel copes with low-level noise.
+        """
+        # Ensure audio is in correct format
+        if audio_data.dtype != np.float32:
+            audio_data = audio_data.astype(np.float32)
+
+        # MELHORIA: Whisper precisa de pelo menos 30 frames (cada frame = 400 samples em 16kHz)
+        # Isso equivale a aproximadamente 0.75 segundos de áudio
+        # Para melhor precisão, vamos garantir pelo menos 1.5 segundos (24000 samples)
+        min_samples = int(sample_rate * 1.5)  # 1.5 segundos
+
+        if len(audio_data) < min_samples:
+            # Adicionar padding de silêncio no início e fim para melhorar a detecção
+            padding_needed = min_samples - len(audio_data)
+            padding_start = padding_needed // 2
+            padding_end = padding_needed - padding_start
+
+            # Usar valores muito pequenos (não zero) para evitar problemas de normalização
+            audio_data = np.concatenate([
+                np.full(padding_start, 1e-6, dtype=np.float32),
+                audio_data,
+                np.full(padding_end, 1e-6, dtype=np.float32)
+            ])
+            logger.debug(f"Áudio muito curto, adicionado padding: {padding_start} + {padding_end} samples")
+
+        # Normalize audio (importante para Whisper)
+        max_val = np.max(np.abs(audio_data))
+        if max_val > 0:
+            audio_data = audio_data / max_val
+        return audio_data
+
     def transcribe(
         self,
         audio_data: np.ndarray,
         sample_rate: int = 16000,
+        options: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Transcribe audio data.
 
+        Short clips use the truncated-context encoder when
+        ``encoder_mode="latency"``; everything else goes through
+        ``model.transcribe`` with the full 30 s window.
+
         Args:
             audio_data: Audio samples as numpy array
             sample_rate: Sample rate in Hz
+            options: Per-call overrides of the Whisper decoding options
 
         Returns:
             Dictionary with transcription result
         """
+        key = self._cache_key(audio_data, sample_rate, options)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = self._transcribe_uncached(audio_data, sample_rate, options)
+        if key is not None:
+            self.result_cache.put(key, result)
+        return result
+
+    def _transcribe_uncached(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Transcribe one clip (short-clip single pass or full window)."""
+        if self._short_clip_samples(len(audio_data), sample_rate) is not None:
+            try:
+                return self._transcribe_single_pass([(audio_data, sample_rate)], options)[0]
+            except Exception as e:
+                logger.warning(f"Short-clip transcription failed ({e}), using full window")
+        return self._transcribe_full(audio_data, sample_rate, options)
+
+    def _transcribe_full(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Transcribe with ``model.transcribe`` (30 s window, temperature fallback)."""
         try:
             if len(audio_data) == 0:
                 return {
@@ -222,37 +552,7 @@ class Transcriber:
                     "language": self.language,
                 }
 
-            # Ensure audio is in correct format
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-
-            # MELHORIA: Whisper precisa de pelo menos 30 frames (cada frame = 400 samples em 16kHz)
-            # Isso equivale a aproximadamente 0.75 segundos de áudio
-            # Para melhor precisão, vamos garantir pelo menos 1.5 segundos (24000 samples)
-            min_samples = int(sample_rate * 1.5)  # 1.5 segundos
-            
-            if len(audio_data) < min_samples:
-                # Adicionar padding de silêncio no início e fim para melhorar a detecção
-                padding_needed = min_samples - len(audio_data)
-                padding_start = padding_needed // 2
-                padding_end = padding_needed - padding_start
-                
-                # Usar valores muito pequenos (não zero) para evitar problemas de normalização
-                audio_data = np.concatenate([
-                    np.full(padding_start, 1e-6, dtype=np.float32),
-                    audio_data,
-                    np.full(padding_end, 1e-6, dtype=np.float32)
-                ])
-                logger.debug(f"Áudio muito curto, adicionado padding: {padding_start} + {padding_end} samples")
-
-            # Normalize audio (importante para Whisper)
-            max_val = np.max(np.abs(audio_data))
-            if max_val > 0:
-                audio_data = audio_data / max_val
-            
-            # Aplicar filtro de ruído simples: suprimir valores muito baixos
-            noise_floor = 0.01
-            audio_data = np.where(np.abs(audio_data) < noise_floor, 0, audio_data)
+            audio_data = self._prepare_audio(audio_data, sample_rate)
 
             # Log para debug do idioma
             logger.debug(f"Transcrevendo com idioma: {self.language}")
@@ -286,12 +586,15 @@ class Transcriber:
                 transcribe_options["compression_ratio_threshold"] = self.compression_ratio_threshold
             if hasattr(self, 'logprob_threshold') and self.logprob_threshold:
                 transcribe_options["logprob_threshold"] = self.logprob_threshold
-            if hasattr(self, 'initial_prompt') and self.initial_prompt:
-                transcribe_options["initial_prompt"] = self.initial_prompt
+            prompt = self._decoding_prompt()
+            if prompt:
+                transcribe_options["initial_prompt"] = prompt
             if hasattr(self, 'word_timestamps'):
                 transcribe_options["word_timestamps"] = self.word_timestamps
             if hasattr(self, 'hallucination_silence_threshold') and self.hallucination_silence_threshold:
                 transcribe_options["hallucination_silence_threshold"] = self.hallucination_silence_threshold
+            if options:
+                transcribe_options.update(options)
             
             logger.debug(f"Opções de transcrição: {transcribe_options}")
             
@@ -312,30 +615,344 @@ class Transcriber:
             logger.error(f"Transcription error: {e}")
             raise WhisperException(f"Transcription failed: {e}")
 
-    def _calculate_confidence(self, result: Dict) -> float:
+    @property
+    def n_mels(self) -> Optional[int]:
+        """Mel bins the loaded model expects (for precomputed features)."""
+        return self.model.dims.n_mels if self.model is not None else None
+
+    def transcribe_batch(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        options: Optional[Dict[str, Any]] = None,
+        features: Optional[List[Optional[MelFeatures]]] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Calculate average confidence from segments.
+        Transcribe several segments in one batched encoder/decoder pass.
+
+        Each segment (at most 30 s) is padded to a common length and the mels
+        are stacked, so the encoder runs once for the whole batch (greedy
+        decoding is batched too; beam search decodes per item). Segments whose
+        batched result fails the compression-ratio/log-prob checks are
+        transcribed again individually (temperature fallback).
 
         Args:
-            result: Whisper result dictionary
+            items: List of (audio_data, sample_rate)
+            options: Per-call overrides of the decoding options (no fallback)
+            features: Precomputed log-mel frames per item (None = compute from samples)
 
         Returns:
-            Average confidence score
+            List of results in the same order as ``items``
         """
+        if self.result_cache is None:
+            return self._transcribe_batch_uncached(items, options, features)
+
+        # Só os itens ainda não vistos vão ao modelo
+        if not features or len(features) != len(items):
+            features = None
+        usable = self._usable_features(items, features) if features and not self.word_timestamps else None
+        keys = [
+            self._cache_key(audio, sr, options, features=usable is not None and usable[i] is not None)
+            for i, (audio, sr) in enumerate(items)
+        ]
+        results: List[Optional[Dict[str, Any]]] = [self.result_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            with self.early_items(missing):
+                decoded = self._transcribe_batch_uncached(
+                    [items[i] for i in missing],
+                    options,
+                    [features[i] for i in missing] if features else None,
+                )
+            for i, result in zip(missing, decoded):
+                self.result_cache.put(keys[i], result)
+                results[i] = result
+        return results
+
+    def _transcribe_batch_uncached(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        options: Optional[Dict[str, Any]] = None,
+        features: Optional[List[Optional[MelFeatures]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Batched transcription without the result cache (see transcribe_batch)."""
+        long = [i for i, (audio, sr) in enumerate(items) if len(audio) / sr > whisper.audio.CHUNK_LENGTH]
+        if long and len(long) < len(items):
+            # Mais de 30 s não cabe na janela do passe único (pad_or_trim cortaria o
+            # fim sem aviso): esses itens vão sozinhos pelo model.transcribe
+            rest = [i for i in range(len(items)) if i not in long]
+            results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+            with self.early_items(rest):
+                batched = self._transcribe_batch_uncached(
+                    [items[i] for i in rest], options, [features[i] for i in rest] if features else None
+                )
+            with self.early_items(long):
+                separate = self._transcribe_each([items[i] for i in long], options)
+            for i, result in zip(rest + long, batched + separate):
+                results[i] = result
+            return results
+        if long:
+            return self._transcribe_each(items, options)
+
+        features = self._usable_features(items, features)
+        if features is not None and not self.word_timestamps:
+            # Features prontas: sempre o passe único (model.transcribe recalcula o mel)
+            try:
+                return self._transcribe_single_pass(items, options, features)
+            except Exception as e:
+                logger.warning(f"Transcription from precomputed features failed ({e}), using samples")
+
+        if len(items) == 1 or self.word_timestamps:
+            # Timestamps por palavra não são suportados no decode em lote
+            return self._transcribe_each(items, options)
+
         try:
-            segments = result.get("segments", [])
-            if not segments:
-                return 0.0
+            return self._transcribe_single_pass(items, options)
+        except Exception as e:
+            logger.warning(f"Batched transcription failed ({e}), falling back to sequential")
+            return self._transcribe_each(items, options)
 
-            # Use probability from segments if available
-            probs = []
-            for segment in segments:
-                if "confidence" in segment:
-                    probs.append(segment["confidence"])
+    def _transcribe_each(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Transcribe items one at a time, without the result cache."""
+        results = []
+        for index, (audio, sr) in enumerate(items):
+            with self.early_items([index]):
+                results.append(self._transcribe_uncached(audio, sr, options))
+        return results
 
-            return sum(probs) / len(probs) if probs else 0.8  # Default confidence
-        except Exception:
-            return 0.8
+    def _cache_key(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        options: Optional[Dict[str, Any]] = None,
+        features: bool = False,
+    ) -> Optional[str]:
+        """Result-cache fingerprint of the clip and every setting that changes its result (None = no cache).
+
+        ``features`` marks clips decoded from precomputed log-mel frames: their
+        mel is not bit-identical to the one computed from the samples.
+        """
+        if self.result_cache is None:
+            return None
+        settings = {
+            "model": self.model_name,
+            "quantize": self.quantize,
+            "language": self.language,
+            "task": self.task,
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "temperature": self.temperature,
+            "patience": self.patience,
+            "length_penalty": self.length_penalty,
+            "suppress_blank": self.suppress_blank,
+            "condition_on_previous_text": self.condition_on_previous_text,
+            "no_speech_threshold": self.no_speech_threshold,
+            "compression_ratio_threshold": self.compression_ratio_threshold,
+            "logprob_threshold": self.logprob_threshold,
+            "prompt": self._decoding_prompt(),
+            "word_timestamps": self.word_timestamps,
+            "hallucination_silence_threshold": self.hallucination_silence_threshold,
+            "encoder_mode": self.encoder_mode,
+            "short_clip": [self.short_clip_max_seconds, self.short_clip_padding_seconds],
+            "hotwords": list(self.hotwords),
+            "hotword_boost": self.hotword_boost,
+            "options": options or {},
+            "features": features,
+        }
+        return self.result_cache.key(audio_data, sample_rate, settings)
+
+    def _usable_features(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        features: Optional[List[Optional[MelFeatures]]],
+    ) -> Optional[List[Optional[MelFeatures]]]:
+        """Drop features that do not fit the loaded model; None if none are left."""
+        if not features or len(features) != len(items):
+            return None
+        usable = [
+            f if f is not None and f.n_mels == self.n_mels and sr == whisper.audio.SAMPLE_RATE
+            and len(audio) <= whisper.audio.N_SAMPLES else None
+            for f, (audio, sr) in zip(features, items)
+        ]
+        return usable if any(f is not None for f in usable) else None
+
+    def _short_clip_samples(self, num_samples: int, sample_rate: int) -> Optional[int]:
+        """
+        Audio length (in 16 kHz samples) of the truncated encoder window.
+
+        Returns None when the clip should use the full 30 s window: accuracy
+        mode, word timestamps, empty or long clips.
+        """
+        if self.encoder_mode != "latency" or self.word_timestamps or num_samples == 0:
+            return None
+        duration = max(num_samples / sample_rate, 1.5)  # _prepare_audio garante 1.5 s
+        if duration > self.short_clip_max_seconds:
+            return None
+        seconds = min(duration + self.short_clip_padding_seconds, whisper.audio.CHUNK_LENGTH)
+        # Múltiplo de 2 frames de mel (o encoder reduz o tempo pela metade)
+        step = 2 * whisper.audio.HOP_LENGTH
+        return int(np.ceil(seconds * whisper.audio.SAMPLE_RATE / step)) * step
+
+    def _encode(self, mel_batch: torch.Tensor) -> torch.Tensor:
+        """
+        Run the audio encoder, allowing mels shorter than 30 s.
+
+        The stock encoder asserts the full 1500-position context; for short
+        clips the same layers are applied with the positional embedding
+        sliced to the real length, so the cost scales with the clip duration.
+        """
+        encoder = self.model.encoder
+        with torch.no_grad():
+            if mel_batch.shape[-1] == whisper.audio.N_FRAMES:
+                return encoder(mel_batch)
+
+            x = torch.nn.functional.gelu(encoder.conv1(mel_batch))
+            x = torch.nn.functional.gelu(encoder.conv2(x))
+            x = x.permute(0, 2, 1)
+            x = (x + encoder.positional_embedding[:x.shape[1]]).to(x.dtype)
+            for block in encoder.blocks:
+                x = block(x)
+            return encoder.ln_post(x)
+
+    def _decode_features(self, audio_features: torch.Tensor, options: "whisper.DecodingOptions") -> list:
+        """Decode precomputed audio features (full or truncated context)."""
+        def decode(features: torch.Tensor) -> list:
+            task = self._decoding_task(options)
+            # Features já codificadas; a checagem de forma do whisper só
+            # reconhece o contexto completo de 1500 posições
+            task._get_audio_features = lambda mel: features
+            return task.run(features)
+
+        if options.beam_size or options.best_of:
+            # Beam search/best-of em lote falha no whisper (features não são
+            # repetidas por grupo): decodificar item a item
+            results = []
+            for i in range(len(audio_features)):
+                with self.early_items([i]):
+                    results.append(decode(audio_features[i:i + 1])[0])
+            return results
+        return decode(audio_features)
+
+    def _transcribe_single_pass(
+        self,
+        items: List[Tuple[np.ndarray, int]],
+        options: Optional[Dict[str, Any]] = None,
+        features: Optional[List[Optional[MelFeatures]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Encode and decode items in one pass (no temperature fallback loop).
+
+        Items whose result fails the quality checks are sent through the
+        full-window path, unless ``options`` (partial decodes) are given.
+        Items with precomputed ``features`` skip _prepare_audio and the STFT.
+        """
+        features = features or [None] * len(items)
+        # _prepare_audio garante 1.5 s; o mesmo mínimo vale para as features
+        min_samples = [int(sr * 1.5) for _, sr in items]
+        prepared = [
+            None if feature is not None else self._prepare_audio(audio, sr)
+            for (audio, sr), feature in zip(items, features)
+        ]
+        lengths = [
+            max(len(audio), minimum) if ready is None else len(ready)
+            for (audio, _), ready, minimum in zip(items, prepared, min_samples)
+        ]
+        durations = [length / sr for length, (_, sr) in zip(lengths, items)]
+
+        short = [self._short_clip_samples(length, sr) for length, (_, sr) in zip(lengths, items)]
+        if all(n is not None for n in short):
+            n_samples = max(short)
+        else:
+            n_samples = whisper.audio.N_SAMPLES
+
+        n_mels = self.model.dims.n_mels
+        n_frames = n_samples // whisper.audio.HOP_LENGTH
+        mels = [
+            torch.from_numpy(feature.to_log_mel(n_frames)) if feature is not None
+            else whisper.log_mel_spectrogram(whisper.pad_or_trim(audio, n_samples), n_mels=n_mels)
+            for audio, feature in zip(prepared, features)
+        ]
+        mel_batch = torch.stack(mels).to(self.model.device)
+        if self.fp16:
+            mel_batch = mel_batch.half()
+
+        decoding_options = self._single_pass_decoding_options(options)
+        results = self._decode_features(self._encode(mel_batch), decoding_options)
+
+        outputs: List[Dict[str, Any]] = []
+        for index, ((audio_data, sample_rate), decoded, duration) in enumerate(zip(items, results, durations)):
+            needs_fallback = options is None and (
+                (self.compression_ratio_threshold and decoded.compression_ratio > self.compression_ratio_threshold)
+                or (self.logprob_threshold and decoded.avg_logprob < self.logprob_threshold)
+            )
+            is_silence = (
+                self.no_speech_threshold
+                and decoded.no_speech_prob > self.no_speech_threshold
+                and (not self.logprob_threshold or decoded.avg_logprob < self.logprob_threshold)
+            )
+
+            if is_silence:
+                text = ""
+            elif needs_fallback:
+                with self.early_items([index]):
+                    outputs.append(self._transcribe_full(audio_data, sample_rate))
+                continue
+            else:
+                text = decoded.text.strip()
+
+            segment = {
+                "start": 0.0,
+                "end": duration,
+                "text": text,
+                "avg_logprob": decoded.avg_logprob,
+                "no_speech_prob": decoded.no_speech_prob,
+                "compression_ratio": decoded.compression_ratio,
+            }
+            outputs.append({
+                "text": text,
+                "confidence": self._calculate_confidence({"segments": [segment]}),
+                "language": decoded.language or self.language,
+                "segments": [segment] if text else [],
+            })
+
+        return outputs
+
+    def _single_pass_decoding_options(
+        self, overrides: Optional[Dict[str, Any]] = None
+    ) -> "whisper.DecodingOptions":
+        """Decoding options for one pass (single temperature, no fallback)."""
+        options: Dict[str, Any] = {
+            "task": self.task,
+            "language": self.language,
+            "temperature": self.temperature,
+            "beam_size": self.beam_size,
+            "best_of": self.best_of,
+            "patience": self.patience,
+            "length_penalty": self.length_penalty,
+            "suppress_blank": self.suppress_blank,
+            "prompt": self._decoding_prompt(),
+            "without_timestamps": True,
+            "fp16": self.fp16,
+        }
+        if overrides:
+            fields = whisper.DecodingOptions.__dataclass_fields__
+            options.update({k: v for k, v in overrides.items() if k in fields})
+
+        # Mesmas regras que model.transcribe aplica por temperatura
+        temperature = options["temperature"]
+        if isinstance(temperature, (list, tuple)):
+            temperature = temperature[0]
+        options["temperature"] = temperature
+        if temperature > 0:
+            options["beam_size"] = None
+        else:
+            options["best_of"] = None
+        if not options["beam_size"]:
+            options["patience"] = None
+        return whisper.DecodingOptions(**options)
 
     def __del__(self):
         """Cleanup on deletion."""
@@ -345,6 +962,102 @@ class Transcriber:
             pass
 
 
+class GreedyFirstDecoder:
+    """Greedy decoding first; beam search only for uncertain results.
+
+    Beam search multiplies decoder cost by ``beam_size``, and clean short
+    utterances usually decode the same way with greedy search. A greedy
+    result is re-decoded with the configured (beam) settings only when its
+    average log probability is low, its compression ratio is high
+    (repetition), or ``uncertainty_check`` (e.g. a keyword near miss) flags
+    the text. Each result is tagged with ``decoding``: "greedy",
+    "beam:logprob", "beam:compression" or "beam:keyword".
+    """
+
+    def __init__(
+        self,
+        logprob_threshold: float = -0.5,
+        compression_ratio_threshold: float = 2.0,
+        uncertainty_check: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Initialize GreedyFirstDecoder.
+
+        Args:
+            logprob_threshold: Re-decode if the average log probability is below this
+            compression_ratio_threshold: Re-decode if a segment's compression ratio is above this
+            uncertainty_check: Optional text check that forces a re-decode
+        """
+        self.logprob_threshold = logprob_threshold
+        self.compression_ratio_threshold = compression_ratio_threshold
+        self.uncertainty_check = uncertainty_check
+
+    def transcribe(
+        self,
+        backend: ASRBackend,
+        items: List[Tuple[np.ndarray, int]],
+        features: Optional[List[Optional[MelFeatures]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Transcribe items greedily, re-decoding uncertain ones with the backend settings.
+
+        Args:
+            backend: Loaded ASR backend
+            items: List of (audio_data, sample_rate)
+            features: Precomputed log-mel frames per item (None = compute from samples)
+
+        Returns:
+            List of results in the same order as ``items``
+        """
+        if not backend.beam_size or backend.beam_size <= 1:
+            # Já é gulosa (config ou downgrade): não há busca em feixe para recorrer
+            results = backend.transcribe_batch(items, features=features)
+            for result in results:
+                result["decoding"] = "greedy"
+            return results
+
+        results = backend.transcribe_batch(items, options=GREEDY_DECODE_OPTIONS, features=features)
+        for index, result in enumerate(results):
+            reason = self.fallback_reason(result)
+            if reason is None:
+                result["decoding"] = "greedy"
+                continue
+            with backend.early_items([index]):
+                if features is not None and features[index] is not None:
+                    results[index] = backend.transcribe_batch([items[index]], features=[features[index]])[0]
+                else:
+                    results[index] = backend.transcribe(*items[index])
+            results[index]["decoding"] = f"beam:{reason}"
+        return results
+
+    def fallback_reason(self, result: Dict[str, Any]) -> Optional[str]:
+        """
+        Why a greedy result should be re-decoded with beam search.
+
+        Args:
+            result: Greedy transcription result
+
+        Returns:
+            "logprob", "compression", "keyword" or None to accept it
+        """
+        text = result.get("text", "").strip()
+        if not text:
+            return None  # Silêncio: a busca em feixe não ajuda
+
+        segments = result.get("segments") or []
+        logprobs = [s["avg_logprob"] for s in segments if s.get("avg_logprob") is not None]
+        if logprobs and sum(logprobs) / len(logprobs) < self.logprob_threshold:
+            return "logprob"
+
+        ratios = [s["compression_ratio"] for s in segments if s.get("compression_ratio") is not None]
+        if ratios and max(ratios) > self.compression_ratio_threshold:
+            return "compression"
+
+        if self.uncertainty_check is not None and self.uncertainty_check(text):
+            return "keyword"
+        return None
+
+
 class TranscriberThread:
     """Threaded transcriber for non-blocking transcription."""
 
@@ -368,6 +1081,32 @@ class TranscriberThread:
         initial_prompt: Optional[str] = None,
         word_timestamps: bool = False,
         hallucination_silence_threshold: Optional[float] = None,
+        batch_size: int = 4,
+        batch_max_wait_ms: float = 0.0,
+        encoder_mode: str = "accuracy",
+        short_clip_max_seconds: float = 5.0,
+        short_clip_padding_seconds: float = 1.0,
+        backend: str = "whisper",
+        model_path: Optional[str] = None,
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        quantize: str = "none",
+        decoding_policy: str = "beam",
+        greedy_logprob_threshold: float = -0.5,
+        greedy_compression_ratio: float = 2.0,
+        latency_slo_seconds: float = 0.0,
+        max_merge_seconds: float = 25.0,
+        num_threads: int = 0,
+        interop_threads: int = 0,
+        cpu_affinity: Optional[Any] = None,
+        hotwords: Optional[List[str]] = None,
+        hotword_prompt: bool = False,
+        hotword_boost: float = 0.0,
+        early_keywords: Optional[List[Dict]] = None,
+        result_cache_entries: int = 0,
+        result_cache_dir: Optional[str] = None,
+        weight_cache: bool = False,
+        weight_cache_dir: Optional[str] = None,
     ):
         """
         Initialize TranscriberThread.
@@ -377,33 +1116,126 @@ class TranscriberThread:
             language: Language code
             device: Device to use
             + all advanced Whisper parameters
+            batch_size: Maximum queued segments decoded in one batched pass
+            batch_max_wait_ms: Extra time to wait for a batch to fill
+            encoder_mode: "accuracy" or "latency" (truncated context for short clips)
+            short_clip_max_seconds: Longest clip that uses the truncated context
+            short_clip_padding_seconds: Silence kept after the clip in the truncated context
+            backend: ASR backend ("whisper" or "ctranslate2")
+            model_path: Local model directory (ctranslate2 backend)
+            compute_type: CTranslate2 compute type (ctranslate2 backend)
+            cpu_threads: CTranslate2 CPU threads, 0 = default (ctranslate2 backend)
+            quantize: "int8" for dynamic int8 quantization on CPU (whisper backend)
+            decoding_policy: "beam" (configured settings) or "greedy_first"
+            greedy_logprob_threshold: greedy_first re-decodes below this average log probability
+            greedy_compression_ratio: greedy_first re-decodes above this compression ratio
+            latency_slo_seconds: Skip segments older than this when behind (0 = never skip)
+            max_merge_seconds: Longest audio formed by merging queued segments when behind
+            num_threads: torch intra-op threads (0 = torch default, whisper backend)
+            interop_threads: torch inter-op threads (0 = torch default, whisper backend)
+            cpu_affinity: CPUs the inference thread is pinned to ("2-5,7" or list, empty = any)
+            hotwords: Words decoding is biased towards (e.g. the keyword patterns)
+            hotword_prompt: Append the hotwords to the initial prompt
+            hotword_boost: Logit boost for the hotword tokens (0 = no logit bias)
+            early_keywords: Keyword configurations reported to ``early_keyword_callback``
+                while a final segment is still decoding (None = off, whisper backend)
+            result_cache_entries: Results cached in memory by audio fingerprint (0 = no cache, whisper backend)
+            result_cache_dir: Directory that also keeps cached results on disk (None = memory only)
+            weight_cache: Load the weights memory-mapped from a converted copy (whisper backend)
+            weight_cache_dir: Directory of the converted weights (None = next to whisper's downloads)
         """
-        # Criar Transcriber com todas as configurações
-        self.transcriber = Transcriber(
-            model_name=model_name,
-            language=language,
-            device=device,
-            fp16=False,  # Auto-detectado pelo Transcriber
-            task=task,
-            beam_size=beam_size,
-            best_of=best_of,
-            temperature=temperature,
-            patience=patience,
-            length_penalty=length_penalty,
-            suppress_blank=suppress_blank,
-            condition_on_previous_text=condition_on_previous_text,
-            no_speech_threshold=no_speech_threshold,
-            compression_ratio_threshold=compression_ratio_threshold,
-            logprob_threshold=logprob_threshold,
-            initial_prompt=initial_prompt,
-            word_timestamps=word_timestamps,
-            hallucination_silence_threshold=hallucination_silence_threshold,
-        )
+        # Afinidade: a thread de inferência é fixada em _transcribe_loop; a carga e o
+        # aquecimento rodam na thread chamadora, fixada nas mesmas CPUs enquanto duram
+        self.cpu_affinity = parse_cpu_list(cpu_affinity)
+        self.pinned_cpus: Optional[List[int]] = None
+
+        # Criar o backend com todas as configurações (as não suportadas são ignoradas)
+        with cpu_affinity_scope(self.cpu_affinity):
+            self.transcriber: ASRBackend = create_backend(
+                backend,
+                model_name=model_name,
+                language=language,
+                device=device,
+                fp16=False,  # Auto-detectado pelo Transcriber
+                task=task,
+                beam_size=beam_size,
+                best_of=best_of,
+                temperature=temperature,
+                patience=patience,
+                length_penalty=length_penalty,
+                suppress_blank=suppress_blank,
+                condition_on_previous_text=condition_on_previous_text,
+                no_speech_threshold=no_speech_threshold,
+                compression_ratio_threshold=compression_ratio_threshold,
+                logprob_threshold=logprob_threshold,
+                initial_prompt=initial_prompt,
+                word_timestamps=word_timestamps,
+                hallucination_silence_threshold=hallucination_silence_threshold,
+                encoder_mode=encoder_mode,
+                short_clip_max_seconds=short_clip_max_seconds,
+                short_clip_padding_seconds=short_clip_padding_seconds,
+                model_path=model_path,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                quantize=quantize,
+                num_threads=num_threads,
+                interop_threads=interop_threads,
+                hotwords=hotwords,
+                hotword_prompt=hotword_prompt,
+                hotword_boost=hotword_boost,
+                early_keywords=early_keywords,
+                result_cache_entries=result_cache_entries,
+                result_cache_dir=result_cache_dir,
+                weight_cache=weight_cache,
+                weight_cache_dir=weight_cache_dir,
+            )
         self.input_queue: queue.Queue = queue.Queue(maxsize=10)
         self.output_queue: queue.Queue = queue.Queue(maxsize=10)
         self.is_running = False
         self._thread: Optional[threading.Thread] = None
 
+        # Decodificação em lote dos segmentos acumulados na fila
+        self.batch_size = max(int(batch_size), 1)
+        self.batch_max_wait_ms = max(float(batch_max_wait_ms), 0.0)
+        self.batches_run = 0
+        self.batched_segments = 0
+
+        # Janela parcial mais recente (substitui a anterior se ainda não foi decodificada)
+        self._partial_slot: Optional[tuple] = None
+        self._partial_lock = threading.Lock()
+
+        # Segmentos enviados e ainda não transcritos (fila + lote em andamento)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+        self.warmup_ms: Optional[float] = None
+
+        # Fator de tempo real (inferência / duração do áudio) e profundidade da fila
+        self.rtf = RealTimeFactorMonitor()
+        self._decoding_defaults: Dict[str, Any] = {}
+
+        # Política gulosa primeiro (o analyzer pode definir greedy_first.uncertainty_check)
+        if decoding_policy not in DECODING_POLICIES:
+            raise WhisperException(f"Invalid decoding_policy '{decoding_policy}'. Use: {list(DECODING_POLICIES)}")
+        self.greedy_first: Optional[GreedyFirstDecoder] = None
+        if decoding_policy == "greedy_first":
+            self.greedy_first = GreedyFirstDecoder(greedy_logprob_threshold, greedy_compression_ratio)
+        self.decoding_counts: Dict[str, int] = {}
+
+        # Prazo por segmento: atrasado demais é descartado; com fila atrasada,
+        # segmentos vizinhos são unidos numa só decodificação
+        self.latency_slo_seconds = max(float(latency_slo_seconds), 0.0)
+        self.max_merge_seconds = max_merge_seconds
+        self.skipped_segments = 0
+        self.skipped_seconds = 0.0
+        self.merged_segments = 0
+        self.recent_skips: deque = deque(maxlen=50)
+
+        # Keyword confirmada durante a decodificação de um segmento final: chamado
+        # na thread de inferência com {"early_keyword", "text", "segment_id"}, fora
+        # da output_queue (um disparo não pode descartar uma transcrição)
+        self.early_keyword_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+
     def start(self) -> None:
         """Start transcriber thread."""
         if self.is_running:
@@ -432,15 +1264,11 @@ class TranscriberThread:
         
         # Liberar modelo do transcriber
         if hasattr(self, 'transcriber') and self.transcriber:
-            if hasattr(self.transcriber, 'model'):
-                try:
-                    # Mover modelo para CPU antes de deletar (libera VRAM)
-                    self.transcriber.model.cpu()
-                    del self.transcriber.model
-                    self.transcriber.model = None
-                    logger.info("✓ Modelo movido para CPU e deletado")
-                except Exception as e:
-                    logger.warning(f"Erro ao deletar modelo: {e}")
+            try:
+                self.transcriber.unload()
+                logger.info("✓ Modelo descarregado")
+            except Exception as e:
+                logger.warning(f"Erro ao deletar modelo: {e}")
             
             try:
                 del self.transcriber
@@ -474,18 +1302,291 @@ class TranscriberThread:
         except Exception:
             pass
 
-    def submit_audio(self, audio_data: np.ndarray, sample_rate: int = 16000) -> None:
+    def submit_audio(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        captured_at: Optional[float] = None,
+        features: Optional[MelFeatures] = None,
+    ) -> None:
         """
         Submit audio for transcription.
 
         Args:
             audio_data: Audio samples
             sample_rate: Sample rate
+            captured_at: ``time.monotonic()`` when the segment finished capturing (default: now)
+            features: Log-mel frames already computed by the capture frontend
+        """
+        captured_at = time.monotonic() if captured_at is None else captured_at
+        item = (audio_data, sample_rate, captured_at, features)
+        with self._pending_lock:
+            self._pending += 1
+        try:
+            self.input_queue.put_nowait(item)
+            return
+        except queue.Full:
+            pass
+
+        if self.latency_slo_seconds > 0:
+            # Com prazo, o áudio mais antigo vale menos que o novo: descartar o mais antigo
+            try:
+                oldest = self.input_queue.get_nowait()
+                if oldest is _PARTIAL:
+                    self._take_partial()
+                else:
+                    self._record_skip(oldest[0], oldest[1], time.monotonic() - oldest[2])
+                    self._finish_pending(1)
+                self.input_queue.put_nowait(item)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self._finish_pending(1)
+        logger.warning("Transcriber input queue full")
+
+    def submit_partial(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        utterance_id: int = 0,
+        features: Optional[MelFeatures] = None,
+    ) -> None:
+        """
+        Submit the in-progress utterance for a partial (streaming) decode.
+
+        Only the latest window is kept: a pending window that was not decoded
+        yet is replaced. Complete segments from submit_audio are decoded first.
+
+        Args:
+            audio_data: Audio samples of the utterance so far (owned by the caller)
+            sample_rate: Sample rate
+            utterance_id: Identifier of the utterance the window belongs to
+            features: Log-mel frames already computed by the capture frontend
+        """
+        with self._partial_lock:
+            pending = self._partial_slot is not None
+            self._partial_slot = (audio_data, sample_rate, utterance_id, features)
+        if pending:
+            return
+        try:
+            self.input_queue.put_nowait(_PARTIAL)
+        except queue.Full:
+            # Fila ocupada com segmentos completos: o parcial não compensa
+            with self._partial_lock:
+                self._partial_slot = None
+
+    def set_hotwords(self, words: List[str]) -> None:
+        """
+        Replace the hotwords of the loaded backend (takes effect on the next segment).
+
+        Args:
+            words: Hotwords (see hotwords_from_keywords)
+        """
+        self.transcriber.set_hotwords(words)
+
+    def set_early_keywords(self, keywords: Optional[List[Dict]]) -> None:
+        """
+        Replace the keywords of the early trigger (takes effect on the next segment).
+
+        Args:
+            keywords: Keyword configurations, or None to disable the early trigger
+        """
+        self.transcriber.set_early_keywords(keywords)
+
+    def _early_reporter(self, segment_ids: List[int]) -> Optional[Callable[[int, str, str], None]]:
+        """Backend ``on_early_keyword`` for one batch of final segments (None if no callback)."""
+        callback = self.early_keyword_callback
+        if callback is None:
+            return None
+
+        def report(item: int, keyword_id: str, text: str) -> None:
+            callback({"early_keyword": keyword_id, "text": text, "segment_id": segment_ids[item]})
+        return report
+
+    @property
+    def feature_mels(self) -> Optional[int]:
+        """Mel bins accepted as precomputed features (None = backend computes its own)."""
+        return getattr(self.transcriber, "n_mels", None)
+
+    def _finish_pending(self, count: int) -> None:
+        """Mark submitted segments as done (transcribed, failed or dropped)."""
+        with self._pending_lock:
+            self._pending = max(self._pending - count, 0)
+
+    def is_idle(self) -> bool:
+        """True when no submitted segment is queued or being transcribed."""
+        with self._pending_lock:
+            return self._pending == 0
+
+    def warm_up(self, seconds: float = 1.0) -> float:
+        """
+        Run a synthetic inference before real traffic.
+
+        Args:
+            seconds: Length of the synthetic clip
+
+        Returns:
+            Elapsed time in milliseconds
+        """
+        with cpu_affinity_scope(self.cpu_affinity):
+            self.warmup_ms = self.transcriber.warm_up(seconds)
+        return self.warmup_ms
+
+    def set_decoding_overrides(self, overrides: Optional[Dict[str, Any]]) -> None:
+        """
+        Change decoding settings (e.g. greedy instead of beam search) without reloading.
+
+        Args:
+            overrides: Backend attributes to override, or None to restore the configured ones
+        """
+        for key, value in self._decoding_defaults.items():
+            setattr(self.transcriber, key, value)
+        self._decoding_defaults = {}
+        for key, value in (overrides or {}).items():
+            if hasattr(self.transcriber, key):
+                self._decoding_defaults[key] = getattr(self.transcriber, key)
+                setattr(self.transcriber, key, value)
+        self.rtf.reset()
+
+    def model_bytes(self) -> int:
+        """Approximate size of the loaded model weights (0 if unknown)."""
+        model = getattr(self.transcriber, "model", None)
+        if isinstance(model, torch.nn.Module):
+            return _state_dict_bytes(model)
+        return 0
+
+    def _record_skip(self, audio_data: np.ndarray, sample_rate: int, age: float) -> None:
+        """Record a segment skipped because its deadline passed."""
+        duration = len(audio_data) / sample_rate
+        self.skipped_segments += 1
+        self.skipped_seconds += duration
+        self.recent_skips.append({
+            "captured_at": time.time() - age,
+            "duration": round(duration, 2),
+            "age": round(age, 2),
+        })
+        logger.warning(
+            f"Skipped {duration:.1f}s segment captured {age:.1f}s ago "
+            f"(latency SLO {self.latency_slo_seconds:.1f}s)"
+        )
+
+    def _schedule(self, batch: List[tuple]) -> List[tuple]:
+        """
+        Apply the latency SLO to a collected batch.
+
+        Segments older than ``latency_slo_seconds`` are skipped. When the
+        queue is behind (segments still waiting, or the oldest kept segment
+        past half the SLO), adjacent segments are merged up to
+        ``max_merge_seconds`` so one decode covers several of them.
+
+        Args:
+            batch: List of (audio_data, sample_rate, captured_at[, features])
+
+        Returns:
+            List of (audio_data, sample_rate[, features]) to transcribe; merged
+            segments lose their precomputed features
+        """
+        if self.latency_slo_seconds <= 0:
+            return [item[:2] + item[3:] for item in batch]
+
+        now = time.monotonic()
+        fresh = []
+        for item in batch:
+            audio, sr, captured_at = item[:3]
+            age = now - captured_at
+            if age > self.latency_slo_seconds:
+                self._record_skip(audio, sr, age)
+            else:
+                fresh.append(item)
+
+        behind = not self.input_queue.empty() or (
+            fresh and now - fresh[0][2] > self.latency_slo_seconds / 2
+        )
+        if not behind or len(fresh) < 2:
+            return [item[:2] + item[3:] for item in fresh]
+
+        merged: List[tuple] = []
+        for item in fresh:
+            audio, sr = item[:2]
+            if merged and merged[-1][1] == sr:
+                previous = merged[-1][0]
+                # Pausa curta entre os enunciados unidos
+                gap = np.zeros(int(0.2 * sr), dtype=np.float32)
+                if (len(previous) + len(gap) + len(audio)) / sr <= self.max_merge_seconds:
+                    merged[-1] = (np.concatenate([previous, gap, audio.astype(np.float32, copy=False)]), sr)
+                    self.merged_segments += 1
+                    continue
+            merged.append(item[:2] + item[3:])
+        return merged
+
+    def _collect_batch(self, first: tuple) -> Tuple[List[tuple], bool]:
         """
+        Gather queued segments into a batch.
+
+        Waits at most ``batch_max_wait_ms`` for more segments after the first.
+
+        Args:
+            first: First (audio_data, sample_rate, captured_at) item
+
+        Returns:
+            Tuple of (batch, whether a partial window was seen while collecting)
+        """
+        import time
+        batch = [first]
+        partial_pending = False
+        deadline = time.monotonic() + self.batch_max_wait_ms / 1000.0
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self.input_queue.get(timeout=remaining)
+                else:
+                    item = self.input_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _PARTIAL:
+                partial_pending = True
+            else:
+                batch.append(item)
+
+        return batch, partial_pending
+
+    def _run_partial(self) -> None:
+        """Decode the pending partial window, if any."""
+        partial = self._take_partial()
+        if partial is None:
+            return
+        audio_data, sample_rate, utterance_id, features = partial
+        if features is not None:
+            # A janela cresce a cada parcial: o mel já calculado é reaproveitado
+            result = self.transcriber.transcribe_batch(
+                [(audio_data, sample_rate)], options=PARTIAL_DECODE_OPTIONS, features=[features]
+            )[0]
+        else:
+            result = self.transcriber.transcribe(
+                audio_data, sample_rate, options=PARTIAL_DECODE_OPTIONS
+            )
+        result["partial"] = True
+        result["utterance_id"] = utterance_id
+        self._put_result(result)
+
+    def _take_partial(self) -> Optional[tuple]:
+        """Pop the pending partial window, if any."""
+        with self._partial_lock:
+            item, self._partial_slot = self._partial_slot, None
+        return item
+
+    def _put_result(self, result: Dict[str, Any]) -> None:
+        """Put a result in the output queue, discarding the oldest if full."""
         try:
-            self.input_queue.put_nowait((audio_data, sample_rate))
+            self.output_queue.put_nowait(result)
         except queue.Full:
-            logger.warning("Transcriber input queue full")
+            try:
+                self.output_queue.get_nowait()  # Discard oldest
+                self.output_queue.put_nowait(result)
+            except queue.Empty:
+                pass
 
     def get_result(self, timeout: float = 1.0) -> Optional[Dict]:
         """
@@ -507,13 +1608,18 @@ class TranscriberThread:
         import time
         consecutive_errors = 0
         max_errors = 5
+
+        try:
+            self.pinned_cpus = apply_cpu_affinity(self.cpu_affinity)
+        except OSError as e:
+            logger.warning(f"Could not apply whisper.cpu_affinity {self.cpu_affinity}: {e}")
         
         try:
             while self.is_running:
                 try:
                     # Get audio from queue
                     try:
-                        audio_data, sample_rate = self.input_queue.get(timeout=0.5)
+                        item = self.input_queue.get(timeout=0.5)
                     except queue.Empty:
                         continue
 
@@ -521,21 +1627,63 @@ class TranscriberThread:
                     if not self.is_running:
                         break
 
-                    # Transcribe com timeout implícito (evita travar para sempre)
-                    result = self.transcriber.transcribe(audio_data, sample_rate)
-                    
-                    # Reset contador de erros em sucesso
-                    consecutive_errors = 0
+                    if item is _PARTIAL:
+                        if self.latency_slo_seconds > 0 and not self.input_queue.empty():
+                            # Fila atrasada: segmentos completos têm prioridade
+                            self._take_partial()
+                            continue
+                        self._run_partial()
+                        consecutive_errors = 0
+                        continue
 
-                    # Put result in output queue
+                    # Juntar segmentos já enfileirados num único passe do modelo
+                    collected, partial_pending = self._collect_batch(item)
+                    scheduled = self._schedule(collected)
+                    batch = [entry[:2] for entry in scheduled]
+                    features = [entry[2] if len(entry) > 2 else None for entry in scheduled]
+                    if all(f is None for f in features):
+                        features = None
+                    # Ids ligam os disparos antecipados ao resultado final de cada segmento
+                    segment_ids = [next_segment_id() for _ in batch]
+                    self.transcriber.on_early_keyword = self._early_reporter(segment_ids)
+                    started = time.perf_counter()
                     try:
-                        self.output_queue.put_nowait(result)
-                    except queue.Full:
-                        try:
-                            self.output_queue.get_nowait()  # Discard oldest
-                            self.output_queue.put_nowait(result)
-                        except queue.Empty:
-                            pass
+                        if not batch:
+                            results = []
+                        elif self.greedy_first is not None:
+                            results = self.greedy_first.transcribe(self.transcriber, batch, features)
+                            for result in results:
+                                tag = result.get("decoding", "greedy")
+                                self.decoding_counts[tag] = self.decoding_counts.get(tag, 0) + 1
+                        elif len(batch) == 1 and features is None:
+                            # Transcribe com timeout implícito (evita travar para sempre)
+                            results = [self.transcriber.transcribe(*batch[0])]
+                        else:
+                            results = self.transcriber.transcribe_batch(batch, features=features)
+                        if len(batch) > 1:
+                            self.batches_run += 1
+                            self.batched_segments += len(batch)
+
+                        # Reset contador de erros em sucesso
+                        consecutive_errors = 0
+                        self.rtf.record(
+                            time.perf_counter() - started,
+                            sum(len(audio) / sr for audio, sr in batch),
+                            self.input_queue.qsize(),
+                            segments=len(batch),
+                        )
+
+                        # Put results in output queue
+                        for result, segment_id in zip(results, segment_ids):
+                            result["segment_id"] = segment_id
+                            self._put_result(result)
+                    finally:
+                        # Parciais e warm-up não disparam
+                        self.transcriber.on_early_keyword = None
+                        self._finish_pending(len(collected))
+
+                    if partial_pending:
+                        self._run_partial()
 
                 except RuntimeError as e:
                     # Erros de CUDA/PyTorch (OOM, device errors)
@@ -577,6 +1725,7 @@ class TranscriberThread:
         return {
             "available": True,
             "is_running": self.is_running,
+            "backend": self.transcriber.name,
             "model": self.transcriber.model_name,
             "device": self.transcriber.device,
             "language": self.transcriber.language,
@@ -584,6 +1733,23 @@ class TranscriberThread:
             "gpu_name": gpu_name,
             "using_gpu": self.transcriber.device == "cuda",
             "fp16_enabled": self.transcriber.fp16,
+            "quantize": getattr(self.transcriber, "quantize", "none"),
+            "quantization": dict(getattr(self.transcriber, "quantization_info", {})),
+            "threads": dict(getattr(self.transcriber, "threads", {})),
+            "pinned_cpus": self.pinned_cpus,
             "input_queue_size": self.input_queue.qsize(),
             "output_queue_size": self.output_queue.qsize(),
+            "batch_size": self.batch_size,
+            "batches_run": self.batches_run,
+            "batched_segments": self.batched_segments,
+            "warmup_ms": self.warmup_ms,
+            "rtf": self.rtf.summary(),
+            "latency_slo_seconds": self.latency_slo_seconds,
+            "skipped_segments": self.skipped_segments,
+            "skipped_seconds": self.skipped_seconds,
+            "merged_segments": self.merged_segments,
+            "recent_skips": list(self.recent_skips)[-10:],
+            "decoding_policy": "greedy_first" if self.greedy_first is not None else "beam",
+            "decoding_counts": dict(self.decoding_counts),
+            "decoding_overrides": {k: getattr(self.transcriber, k) for k in self._decoding_defaults},
         }
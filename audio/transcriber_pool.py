@@ -0,0 +1,702 @@
+"""Transcription worker processes fed through shared-memory audio blocks."""
+
+import os
+import queue
+import threading
+import logging
+import time
+import multiprocessing as mp
+from collections import deque
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from .load_monitor import RealTimeFactorMonitor
+from .cpu_tuning import parse_cpu_list
+from .early_trigger import next_segment_id
+
+logger = logging.getLogger(__name__)
+
+# Tipos de tarefa enviados aos workers
+TASK_FINAL = "final"
+TASK_PARTIAL = "partial"
+
+
+def _worker_main(
+    worker_index: int,
+    backend: Any,
+    settings: Dict[str, Any],
+    torch_threads: int,
+    warmup_seconds: float,
+    greedy_first: Optional[Dict[str, float]],
+    cpu_affinity: Optional[List[int]],
+    task_queue,
+    result_queue,
+    slot: int,
+    current_tasks,
+) -> None:
+    """
+    Worker process: load one ASR backend and transcribe tasks until None.
+
+    The worker reports "ready" (with its warm-up time) only after the model
+    is loaded and, if ``warmup_seconds`` > 0, a synthetic inference has run.
+    ``greedy_first`` holds GreedyFirstDecoder thresholds (None = beam policy).
+    ``cpu_affinity`` pins the whole worker process (None = any CPU).
+
+    Tasks are (task_id, shm_name, num_samples, sample_rate, kind, utterance_id,
+    options, deadline, hotwords, early_keywords, dedicated). The worker writes the id
+    of each task it takes to ``current_tasks[slot]`` (shared memory, no message
+    to lose), so the pool knows which task a crashed worker held. A final segment whose ``time.time()``
+    deadline has passed is not transcribed; the worker answers ``{"skipped": True}``.
+    ``hotwords`` is the pool's current list; a worker rebuilds its bias when it changes.
+    ``early_keywords`` likewise; a keyword confirmed while a final segment is
+    decoding is sent ahead as an "early" message (partial windows never fire). The audio is read straight from the shared-memory block; only
+    the task tuple and the result dict cross the process boundary. Pool blocks
+    stay attached for reuse; a ``dedicated`` block (oversized segment, unlinked
+    by the pool afterwards) is closed as soon as its task is done.
+    """
+    # Import no processo filho (spawn): torch/whisper não são herdados
+    import torch
+    from audio.asr_backend import create_backend
+    from audio.transcriber import PARTIAL_DECODE_OPTIONS, GreedyFirstDecoder
+
+    from audio.cpu_tuning import apply_cpu_affinity
+
+    try:
+        # Fixada no processo antes de o torch criar suas threads: todas herdam
+        apply_cpu_affinity(cpu_affinity)
+    except OSError as e:
+        logger.warning(f"Worker {worker_index}: could not apply CPU affinity {cpu_affinity}: {e}")
+    if torch_threads > 0:
+        torch.set_num_threads(torch_threads)
+
+    try:
+        transcriber = create_backend(backend, **settings)
+        warmup_ms = transcriber.warm_up(warmup_seconds) if warmup_seconds > 0 else None
+    except Exception as e:
+        result_queue.put(("error", worker_index, None, f"Failed to load model: {e}"))
+        return
+    result_queue.put(("ready", worker_index, warmup_ms, None))
+
+    decoder = GreedyFirstDecoder(**greedy_first) if greedy_first else None
+    current_hotwords = tuple(settings.get("hotwords") or ())
+    current_early = tuple(settings.get("early_keywords") or ())
+
+    def early_reporter(task_id: int):
+        # O id da tarefa identifica o segmento (único no processo principal)
+        return lambda item, keyword_id, text: result_queue.put(
+            ("early", worker_index, {"early_keyword": keyword_id, "text": text, "segment_id": task_id}, None)
+        )
+
+    # Blocos são reutilizados pelo processo principal: anexar uma vez por nome
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+
+            (task_id, shm_name, num_samples, sample_rate, kind, utterance_id, options, deadline,
+             hotwords, early_keywords, dedicated) = task
+            current_tasks[slot] = task_id
+            if hotwords != current_hotwords:
+                transcriber.set_hotwords(list(hotwords))
+                current_hotwords = hotwords
+            if early_keywords != current_early:
+                transcriber.set_early_keywords(list(early_keywords) or None)
+                current_early = early_keywords
+            if deadline is not None and time.time() > deadline:
+                result_queue.put((task_id, worker_index, {"skipped": True, "late": time.time() - deadline}, None))
+                continue
+            audio_data = None
+            try:
+                block = attached.get(shm_name)
+                if block is None:
+                    block = shared_memory.SharedMemory(name=shm_name)
+                    attached[shm_name] = block
+                audio_data = np.ndarray((num_samples,), dtype=np.float32, buffer=block.buf)
+
+                started = time.perf_counter()
+                if kind == TASK_PARTIAL:
+                    transcriber.on_early_keyword = None
+                    result = transcriber.transcribe(audio_data, sample_rate, options=PARTIAL_DECODE_OPTIONS)
+                    result["partial"] = True
+                    result["utterance_id"] = utterance_id
+                else:
+                    transcriber.on_early_keyword = early_reporter(task_id)
+                    if decoder is not None and options is None:
+                        result = decoder.transcribe(transcriber, [(audio_data, sample_rate)])[0]
+                    else:
+                        result = transcriber.transcribe(audio_data, sample_rate, options=options)
+                    result["segment_id"] = task_id
+                result["inference_seconds"] = time.perf_counter() - started
+                audio_data = None  # Não manter referências ao bloco
+                result_queue.put((task_id, worker_index, result, None))
+            except Exception as e:
+                result_queue.put((task_id, worker_index, None, str(e)))
+            finally:
+                audio_data = None
+                if dedicated:
+                    # Bloco avulso: o processo principal o remove após o resultado
+                    _close_block(attached.pop(shm_name, None))
+    finally:
+        for block in attached.values():
+            _close_block(block)
+
+
+def _close_block(block: Optional[shared_memory.SharedMemory]) -> None:
+    """Detach a worker from a shared-memory block."""
+    if block is None:
+        return
+    try:
+        block.close()
+    except BufferError as e:
+        # Alguma view do áudio ainda vive: o mapeamento fica até ela ser coletada
+        logger.warning(f"Shared-memory block {block.name} still referenced: {e}")
+
+
+class _AudioBlock:
+    """Reusable shared-memory block holding one segment."""
+
+    def __init__(self, num_samples: int):
+        self.capacity = num_samples
+        self.shm = shared_memory.SharedMemory(create=True, size=num_samples * 4)
+        self.array = np.ndarray((num_samples,), dtype=np.float32, buffer=self.shm.buf)
+
+    def release(self) -> None:
+        """Close and unlink the block."""
+        self.array = None
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class TranscriberPool:
+    """Runs N ASR workers in separate processes.
+
+    Drop-in replacement for TranscriberThread (submit_audio/submit_partial/
+    get_result/start/stop/cleanup/get_status). Inference runs outside the
+    web server process, so it does not compete for the GIL with capture,
+    segmentation and the web server, and several cores decode in parallel.
+
+    Segments are copied once into preallocated ``multiprocessing.shared_memory``
+    blocks; workers map the same memory instead of unpickling arrays. Final
+    results are released in submission order even when workers finish out of
+    order. Each worker loads its own copy of the model.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_segment_seconds: float = 30.0,
+        max_pending: int = 10,
+        torch_threads: int = 0,
+        warmup_seconds: float = 1.0,
+        decoding_policy: str = "beam",
+        greedy_logprob_threshold: float = -0.5,
+        greedy_compression_ratio: float = 2.0,
+        latency_slo_seconds: float = 0.0,
+        cpu_affinity: Optional[Any] = None,
+        backend: Any = "whisper",
+        sample_rate: int = 16000,
+        **settings,
+    ):
+        """
+        Initialize TranscriberPool.
+
+        Args:
+            workers: Number of worker processes
+            max_segment_seconds: Size of each shared-memory block in seconds
+            max_pending: Segments queued or in progress before new ones are dropped
+            torch_threads: Torch threads per worker (0 = cores / workers)
+            warmup_seconds: Synthetic warm-up clip run by each worker after loading (0 = none)
+            decoding_policy: "beam" or "greedy_first" (see GreedyFirstDecoder)
+            greedy_logprob_threshold: greedy_first re-decodes below this average log probability
+            greedy_compression_ratio: greedy_first re-decodes above this compression ratio
+            latency_slo_seconds: Workers skip segments older than this (0 = never skip)
+            cpu_affinity: CPUs the worker processes are pinned to ("2-5,7" or list, empty = any)
+            backend: ASR backend for the workers ("whisper", "ctranslate2" or an ASRBackend subclass)
+            sample_rate: Expected sample rate (sizes the blocks)
+            **settings: Backend settings (same as TranscriberThread)
+        """
+        self.workers = max(int(workers), 1)
+        self.backend = backend
+        self.torch_threads = torch_threads or max((os.cpu_count() or 1) // self.workers, 1)
+        # O Transcriber do worker aplica num_threads ao carregar: mesmo valor por worker
+        self.settings = dict(settings, num_threads=self.torch_threads)
+        self.cpu_affinity = parse_cpu_list(cpu_affinity)
+        self._hotwords = tuple(settings.get("hotwords") or ())
+        self._early_keywords = tuple(settings.get("early_keywords") or ())
+        self.warmup_seconds = warmup_seconds
+        self.decoding_policy = decoding_policy
+        self._greedy_first = None
+        if decoding_policy == "greedy_first":
+            self._greedy_first = {
+                "logprob_threshold": greedy_logprob_threshold,
+                "compression_ratio_threshold": greedy_compression_ratio,
+            }
+        self.decoding_counts: Dict[str, int] = {}
+
+        self.latency_slo_seconds = max(float(latency_slo_seconds), 0.0)
+        self.skipped_segments = 0
+        self.skipped_seconds = 0.0
+        self.recent_skips: deque = deque(maxlen=50)
+        self.max_pending = max(int(max_pending), self.workers)
+        self.block_samples = int(max_segment_seconds * sample_rate)
+
+        # Compatibilidade com TranscriberThread / get_status do analyzer
+        self.model_name = settings.get("model_name", "base")
+        self.device = settings.get("device", "cpu")
+        self.language = settings.get("language", "pt")
+
+        self.output_queue: queue.Queue = queue.Queue(maxsize=10)
+        # Como em TranscriberThread: chamado (na thread coletora) com
+        # {"early_keyword", "text", "segment_id"} fora da output_queue
+        self.early_keyword_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.is_running = False
+
+        self._ctx = mp.get_context("spawn")
+        self._task_queue = None
+        self._result_queue = None
+        self._processes: List[mp.Process] = []
+        self._collector: Optional[threading.Thread] = None
+
+        self._lock = threading.Lock()
+        self._free_blocks: List[_AudioBlock] = []
+        self._all_blocks: List[_AudioBlock] = []
+        # task_id -> (bloco, ordem de entrega ou None para parciais, segundos de áudio)
+        self._in_flight: Dict[int, Tuple[_AudioBlock, Optional[int], float]] = {}
+        self._next_order = 0
+        self._release_order = 0
+        self._reorder: Dict[int, Optional[Dict[str, Any]]] = {}
+
+        # RTF dividido pelo número de workers (capacidade em paralelo)
+        self.rtf = RealTimeFactorMonitor()
+        self._decoding_overrides: Optional[Dict[str, Any]] = None
+
+        self.ready_workers = 0
+        self._ready: set = set()
+        # Última tarefa pega por cada worker (escrita pelo próprio worker): a de
+        # um worker morto é dada como falha para não travar a ordem dos finais
+        self._current_tasks = None
+        self._dead_workers: set = set()
+        # Id único por processo iniciado (um worker reiniciado ganha outro id)
+        self._worker_ids: List[int] = []
+        self._next_worker_id = 0
+        self._last_liveness_check = 0.0
+        self.restarted_workers = 0
+        self.warmup_ms: Optional[float] = None
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start worker processes (models load in the background)."""
+        if self.is_running:
+            logger.warning("Transcriber pool already running")
+            return
+
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        self.ready_workers = 0
+        self._ready.clear()
+        self._current_tasks = self._ctx.Array("q", [-1] * self.workers, lock=False)
+        self._dead_workers.clear()
+        self._reorder.clear()
+        self._next_order = self._release_order = 0
+
+        with self._lock:
+            if not self._all_blocks:
+                self._all_blocks = [_AudioBlock(self.block_samples) for _ in range(self.max_pending)]
+            self._free_blocks = list(self._all_blocks)
+            self._in_flight.clear()
+
+        self._worker_ids = [0] * self.workers
+        self._processes = [self._spawn_worker(slot) for slot in range(self.workers)]
+
+        self.is_running = True
+        self._collector = threading.Thread(target=self._collect_loop, daemon=True)
+        self._collector.start()
+        logger.info(f"Transcriber pool started ({self.workers} workers, {self.torch_threads} torch threads each)")
+
+    def _spawn_worker(self, slot: int) -> mp.Process:
+        """Start the worker process of ``slot`` under a new worker id."""
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        self._worker_ids[slot] = worker_id
+        self._current_tasks[slot] = -1
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id, self.backend, self.settings, self.torch_threads, self.warmup_seconds,
+                self._greedy_first, self.cpu_affinity, self._task_queue, self._result_queue,
+                slot, self._current_tasks,
+            ),
+            daemon=True,
+        )
+        process.start()
+        return process
+
+    def stop(self) -> None:
+        """Stop worker processes."""
+        self.is_running = False
+        if self._task_queue is not None:
+            for _ in self._processes:
+                self._task_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        if self._collector and self._collector is not threading.current_thread():
+            self._collector.join(timeout=2.0)
+        logger.info("Transcriber pool stopped")
+
+    def cleanup(self) -> None:
+        """Stop workers and release the shared-memory blocks."""
+        if self.is_running or self._processes:
+            self.stop()
+        with self._lock:
+            for block in self._all_blocks:
+                block.release()
+            self._all_blocks = []
+            self._free_blocks = []
+            self._in_flight.clear()
+
+    def __del__(self):
+        """Destructor - release shared memory."""
+        try:
+            self.cleanup()
+        except Exception:
+            pass
+
+    def _dispatch(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        kind: str,
+        utterance_id: int = 0,
+        captured_at: Optional[float] = None,
+    ) -> bool:
+        """Copy audio into a free block and queue a task. Returns False if dropped."""
+        if not self.is_running:
+            return False
+
+        num_samples = len(audio_data)
+        with self._lock:
+            if kind == TASK_PARTIAL and len(self._in_flight) >= self.workers:
+                return False  # Todos os workers ocupados: parcial não compensa
+            if not self._free_blocks:
+                return False
+
+            block = self._free_blocks.pop()
+            dedicated = num_samples > block.capacity
+            if dedicated:
+                # Segmento maior que o bloco padrão: bloco dedicado, liberado ao final
+                block_to_use = _AudioBlock(num_samples)
+                self._free_blocks.append(block)
+                block = block_to_use
+
+            order = None
+            if kind == TASK_FINAL:
+                order = self._next_order
+                self._next_order += 1
+            task_id = next_segment_id()
+            self._in_flight[task_id] = (block, order, num_samples / sample_rate)
+
+        options = self._decoding_overrides if kind == TASK_FINAL else None
+        deadline = None
+        if kind == TASK_FINAL and self.latency_slo_seconds > 0:
+            # Relógio de parede: comparável entre processos
+            age = time.monotonic() - captured_at if captured_at is not None else 0.0
+            deadline = time.time() + self.latency_slo_seconds - age
+        block.array[:num_samples] = audio_data
+        self._task_queue.put(
+            (task_id, block.shm.name, num_samples, sample_rate, kind, utterance_id, options, deadline,
+             self._hotwords, self._early_keywords, dedicated)
+        )
+        return True
+
+    def submit_audio(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int = 16000,
+        captured_at: Optional[float] = None,
+    ) -> None:
+        """
+        Submit audio for transcription.
+
+        Args:
+            audio_data: Audio samples
+            sample_rate: Sample rate
+            captured_at: ``time.monotonic()`` when the segment finished capturing (default: now)
+        """
+        if not self._dispatch(audio_data, sample_rate, TASK_FINAL, captured_at=captured_at):
+            self.dropped += 1
+            logger.warning("Transcriber pool full, segment dropped")
+
+    def set_hotwords(self, words: List[str]) -> None:
+        """
+        Replace the hotwords; each worker picks them up with its next task.
+
+        Args:
+            words: Hotwords (see hotwords_from_keywords)
+        """
+        self._hotwords = tuple(words)
+        self.settings["hotwords"] = list(words)  # Workers iniciados depois
+
+    def set_early_keywords(self, keywords: Optional[List[Dict]]) -> None:
+        """
+        Replace the keywords of the early trigger; each worker picks them up with its next task.
+
+        Args:
+            keywords: Keyword configurations, or None to disable the early trigger
+        """
+        self._early_keywords = tuple(keywords or ())
+        self.settings["early_keywords"] = list(keywords) if keywords else None
+
+    def submit_partial(self, audio_data: np.ndarray, sample_rate: int = 16000, utterance_id: int = 0) -> None:
+        """
+        Submit the in-progress utterance for a partial decode (only if a worker is idle).
+
+        Args:
+            audio_data: Audio samples of the utterance so far
+            sample_rate: Sample rate
+            utterance_id: Identifier of the utterance the window belongs to
+        """
+        self._dispatch(audio_data, sample_rate, TASK_PARTIAL, utterance_id)
+
+    def _collect_loop(self) -> None:
+        """Receive worker results and release finals in submission order."""
+        while self.is_running:
+            self._check_workers()
+            try:
+                message = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            task_id, worker_index, result, error = message
+            if task_id == "ready":
+                self._ready.add(worker_index)
+                self.ready_workers = len(self._ready)
+                if result is not None:
+                    self.warmup_ms = max(self.warmup_ms or 0.0, result)
+                logger.info(f"Transcription worker {worker_index} ready")
+                continue
+            if task_id == "error":
+                logger.error(f"Transcription worker {worker_index}: {error}")
+                continue
+            if task_id == "early":
+                # Keyword confirmada no meio da decodificação: fora da ordem dos finais
+                self._deliver_early_keyword(result)
+                continue
+            self._complete(task_id, worker_index, result, error)
+
+    def _deliver_early_keyword(self, event: Dict[str, Any]) -> None:
+        """Pass an "early" message to ``early_keyword_callback`` (not the result queue)."""
+        callback = self.early_keyword_callback
+        if callback is None:
+            return
+        try:
+            callback(event)
+        except Exception as e:
+            logger.error(f"Error in early keyword callback: {e}")
+
+    def _complete(
+        self,
+        task_id: int,
+        worker_index: int,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ) -> None:
+        """Account for a finished task, release finals in order and free its block."""
+        with self._lock:
+            if task_id not in self._in_flight:
+                return  # Já dada como falha (worker morto)
+            block, order, audio_seconds = self._in_flight[task_id]
+            finals_pending = sum(1 for _, o, _ in self._in_flight.values() if o is not None) - 1
+
+        if error:
+            self.failed += 1
+            logger.error(f"Transcription failed in worker {worker_index}: {error}")
+        else:
+            self.completed += 1
+
+        if result and result.get("skipped"):
+            self._record_skip(audio_seconds, self.latency_slo_seconds + result.get("late", 0.0))
+            result = None
+
+        inference_seconds = result.pop("inference_seconds", None) if result else None
+        if order is not None and inference_seconds is not None:
+            self.rtf.record(inference_seconds / self.workers, audio_seconds, max(finals_pending, 0))
+        if result and "decoding" in result:
+            tag = result["decoding"]
+            self.decoding_counts[tag] = self.decoding_counts.get(tag, 0) + 1
+
+        if order is None:
+            # Parcial: entregue assim que chega (o analyzer descarta obsoletos)
+            if result:
+                self._put_result(result)
+        else:
+            self._reorder[order] = result
+            while self._release_order in self._reorder:
+                ready = self._reorder.pop(self._release_order)
+                self._release_order += 1
+                if ready:
+                    self._put_result(ready)
+
+        # Liberar o bloco só depois de entregar (is_idle não vê lacunas)
+        with self._lock:
+            self._in_flight.pop(task_id, None)
+            if block is not None:
+                if block in self._all_blocks:
+                    self._free_blocks.append(block)
+                else:
+                    block.release()
+
+    def _check_workers(self) -> None:
+        """
+        Handle worker processes that died (OOM kill, segfault).
+
+        The tasks a dead worker had taken are completed as failures, so the
+        finals after them are still released in order, and a worker that had
+        loaded its model is started again.
+        """
+        now = time.monotonic()
+        if now - self._last_liveness_check < 0.5:
+            return
+        self._last_liveness_check = now
+
+        for slot, process in enumerate(list(self._processes)):
+            worker_id = self._worker_ids[slot]
+            if process.is_alive() or worker_id in self._dead_workers:
+                continue
+            self._dead_workers.add(worker_id)
+            # Se o resultado dela ainda chegar, é ignorado (tarefa já concluída)
+            task_id = self._current_tasks[slot]
+            with self._lock:
+                lost = task_id in self._in_flight
+            logger.error(
+                f"Transcription worker {worker_id} exited (code {process.exitcode})"
+                + (f", task {task_id} lost" if lost else "")
+            )
+            if lost:
+                self._complete(task_id, worker_id, None, "worker exited")
+
+            if worker_id in self._ready and self.is_running:
+                # Modelo já carregou antes: a falha foi da tarefa, não do worker
+                self._ready.discard(worker_id)
+                self.ready_workers = len(self._ready)
+                self._processes[slot] = self._spawn_worker(slot)
+                self.restarted_workers += 1
+                logger.info(f"Transcription worker {worker_id} restarted as {self._worker_ids[slot]}")
+
+        if self._processes and not any(p.is_alive() for p in self._processes):
+            logger.error("All transcription workers exited")
+            self.is_running = False
+
+    def _record_skip(self, duration: float, age: float) -> None:
+        """Record a segment a worker skipped because its deadline passed."""
+        self.skipped_segments += 1
+        self.skipped_seconds += duration
+        self.recent_skips.append({
+            "captured_at": time.time() - age,
+            "duration": round(duration, 2),
+            "age": round(age, 2),
+        })
+        logger.warning(
+            f"Skipped {duration:.1f}s segment captured {age:.1f}s ago "
+            f"(latency SLO {self.latency_slo_seconds:.1f}s)"
+        )
+
+    def _put_result(self, result: Dict[str, Any]) -> None:
+        """Put a result in the output queue, discarding the oldest if full."""
+        try:
+            self.output_queue.put_nowait(result)
+        except queue.Full:
+            try:
+                self.output_queue.get_nowait()  # Discard oldest
+                self.output_queue.put_nowait(result)
+            except queue.Empty:
+                pass
+
+    def get_result(self, timeout: float = 1.0) -> Optional[Dict]:
+        """
+        Get transcription result.
+
+        Args:
+            timeout: Timeout in seconds
+
+        Returns:
+            Transcription result or None
+        """
+        try:
+            return self.output_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_idle(self) -> bool:
+        """True when no submitted segment is queued, in progress or awaiting reorder."""
+        with self._lock:
+            in_flight = any(order is not None for _, order, _ in self._in_flight.values())
+        return not in_flight and not self._reorder
+
+    def warm_up(self, seconds: float = 1.0) -> Optional[float]:
+        """Workers warm up before reporting ready; returns the slowest warm-up (ms)."""
+        return self.warmup_ms
+
+    def set_decoding_overrides(self, overrides: Optional[Dict[str, Any]]) -> None:
+        """
+        Change decoding settings for the next segments (sent with each task).
+
+        Args:
+            overrides: Decoding options, or None for the configured ones
+        """
+        self._decoding_overrides = dict(overrides) if overrides else None
+        self.rtf.reset()
+
+    def model_bytes(self) -> int:
+        """Model size is not known in the parent process (models live in the workers)."""
+        return 0
+
+    def get_queue_size(self) -> tuple:
+        """Get pending (queued + in progress) and output queue sizes."""
+        with self._lock:
+            pending = len(self._in_flight)
+        return (pending, self.output_queue.qsize())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get pool status."""
+        with self._lock:
+            pending = len(self._in_flight)
+        return {
+            "available": True,
+            "is_running": self.is_running,
+            "backend": getattr(self.backend, "name", self.backend),
+            "model": self.model_name,
+            "device": self.device,
+            "language": self.language,
+            "workers": self.workers,
+            "alive_workers": sum(1 for p in self._processes if p.is_alive()),
+            "ready_workers": self.ready_workers,
+            "restarted_workers": self.restarted_workers,
+            "torch_threads_per_worker": self.torch_threads,
+            "cpu_affinity": self.cpu_affinity,
+            "warmup_ms": self.warmup_ms,
+            "rtf": self.rtf.summary(),
+            "latency_slo_seconds": self.latency_slo_seconds,
+            "skipped_segments": self.skipped_segments,
+            "skipped_seconds": self.skipped_seconds,
+            "recent_skips": list(self.recent_skips)[-10:],
+            "decoding_policy": self.decoding_policy,
+            "decoding_counts": dict(self.decoding_counts),
+            "decoding_overrides": dict(self._decoding_overrides or {}),
+            "pending": pending,
+            "completed": self.completed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "output_queue_size": self.output_queue.qsize(),
+        }
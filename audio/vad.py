@@ -0,0 +1,384 @@
+"""Frame-level voice activity detection and speech segmentation."""
+
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .segment_buffer import SampleAccumulator
+
+logger = logging.getLogger(__name__)
+
+
+def frame_features(frames: np.ndarray, window: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute per-frame RMS energy, zero-crossing rate and spectral flatness.
+
+    All frames are processed in one vectorized pass.
+
+    Args:
+        frames: Array of shape (num_frames, frame_size)
+        window: Optional analysis window for the spectrum (frame_size,)
+
+    Returns:
+        Tuple of (rms, zcr, flatness), each of shape (num_frames,)
+    """
+    if frames.size == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return empty, empty, empty
+
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+
+    windowed = frames * window if window is not None else frames
+    power = np.abs(np.fft.rfft(windowed, axis=1)) ** 2 + 1e-12
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+    return rms, zcr, flatness
+
+
+class NoiseFloorTracker:
+    """Running noise-floor estimate from recent RMS values.
+
+    Keeps the last ``window_size`` RMS values in a preallocated circular
+    array and uses a low percentile of them as the noise floor (minimum
+    statistics: speech raises the upper percentiles, not the lower ones).
+    Speech and silence thresholds are derived from the floor with fixed
+    SNR margins, so each device gets its own thresholds.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 500,
+        percentile: float = 10.0,
+        speech_snr_db: float = 10.0,
+        silence_snr_db: float = 3.0,
+        min_speech_threshold: float = 0.003,
+        max_speech_threshold: float = 0.1,
+        warmup: int = 25,
+    ):
+        """
+        Initialize NoiseFloorTracker.
+
+        Args:
+            window_size: Number of recent RMS values considered
+            percentile: Percentile of the window used as the floor
+            speech_snr_db: Speech threshold margin above the floor (dB)
+            silence_snr_db: Silence threshold margin above the floor (dB)
+            min_speech_threshold: Lower clamp for the speech threshold
+            max_speech_threshold: Upper clamp for the speech threshold
+            warmup: Values needed before the estimate is used
+        """
+        self._values = np.zeros(max(int(window_size), 1), dtype=np.float32)
+        self._count = 0
+        self.percentile = percentile
+        self.speech_margin = 10 ** (speech_snr_db / 20.0)
+        self.silence_margin = 10 ** (silence_snr_db / 20.0)
+        self.min_speech_threshold = min_speech_threshold
+        self.max_speech_threshold = max_speech_threshold
+        self.warmup = warmup
+        self.noise_floor: Optional[float] = None
+
+    def update(self, rms_values: np.ndarray) -> Optional[float]:
+        """
+        Add RMS values and refresh the floor estimate.
+
+        Args:
+            rms_values: RMS of recent frames or chunks
+
+        Returns:
+            Current noise floor (None during warm-up)
+        """
+        rms_values = np.asarray(rms_values, dtype=np.float32).ravel()
+        n = len(rms_values)
+        if n == 0:
+            return self.noise_floor
+
+        size = len(self._values)
+        if n >= size:
+            self._values[:] = rms_values[-size:]
+        else:
+            idx = (self._count + np.arange(n)) % size
+            self._values[idx] = rms_values
+        self._count += n
+
+        if self._count >= self.warmup:
+            valid = self._values[:min(self._count, size)]
+            self.noise_floor = float(np.percentile(valid, self.percentile))
+        return self.noise_floor
+
+    @property
+    def ready(self) -> bool:
+        """True once enough values were seen."""
+        return self.noise_floor is not None
+
+    def speech_threshold(self, default: float) -> float:
+        """Speech threshold for the current floor (``default`` during warm-up)."""
+        if self.noise_floor is None:
+            return default
+        threshold = self.noise_floor * self.speech_margin
+        return float(min(max(threshold, self.min_speech_threshold), self.max_speech_threshold))
+
+    def silence_threshold(self, default: float) -> float:
+        """Silence threshold for the current floor (``default`` during warm-up)."""
+        if self.noise_floor is None:
+            return default
+        return float(min(self.noise_floor * self.silence_margin, self.speech_threshold(default)))
+
+    def reset(self) -> None:
+        """Forget all values (e.g. after a device change)."""
+        self._values[:] = 0.0
+        self._count = 0
+        self.noise_floor = None
+
+
+class FrameVAD:
+    """Classifies short frames (10-30 ms) as speech or non-speech.
+
+    A frame is speech when it is loud enough (RMS), tonal enough (spectral
+    flatness well below white noise, ~0.56) and not noise-like in its
+    zero-crossing rate.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: float = 20.0,
+        energy_threshold: float = 0.015,
+        flatness_threshold: float = 0.45,
+        zcr_threshold: float = 0.4,
+        noise_tracker: Optional[NoiseFloorTracker] = None,
+    ):
+        """
+        Initialize FrameVAD.
+
+        Args:
+            sample_rate: Sample rate in Hz
+            frame_ms: Frame length in milliseconds (10-30 ms recommended)
+            energy_threshold: Minimum frame RMS for speech
+            flatness_threshold: Maximum spectral flatness for speech (0..1)
+            zcr_threshold: Maximum zero-crossing rate for speech (0..1)
+            noise_tracker: If set, energy_threshold follows the tracked noise floor
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = max(int(sample_rate * frame_ms / 1000.0), 16)
+        self.energy_threshold = energy_threshold
+        self.flatness_threshold = flatness_threshold
+        self.zcr_threshold = zcr_threshold
+        self.noise_tracker = noise_tracker
+        self._base_energy_threshold = energy_threshold
+        self._window = np.hanning(self.frame_size).astype(np.float32)
+
+    def classify(self, frames: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify frames.
+
+        Args:
+            frames: Array of shape (num_frames, frame_size)
+
+        Returns:
+            Tuple of (is_speech bool array, rms array)
+        """
+        rms, zcr, flatness = frame_features(frames, self._window)
+        if self.noise_tracker is not None:
+            self.noise_tracker.update(rms)
+            self.energy_threshold = self.noise_tracker.speech_threshold(self._base_energy_threshold)
+        is_speech = (
+            (rms > self.energy_threshold)
+            & (flatness < self.flatness_threshold)
+            & (zcr < self.zcr_threshold)
+        )
+        return is_speech, rms
+
+
+class SpeechSegmenter:
+    """Turns a stream of chunks into tightly trimmed speech segments.
+
+    Before speech starts only the last ``pre_roll_ms`` of audio is kept, so
+    onsets are not clipped and leading silence is not sent. After the last
+    speech frame, ``hangover_ms`` of audio is kept; the segment is emitted
+    once the pause reaches ``silence_duration_to_stop`` and trailing silence
+    beyond the hangover is dropped. Segments are also cut at
+    ``max_duration_seconds``.
+
+    Stream positions (samples pushed since creation) of the segments
+    returned by the last ``push`` are in ``last_spans``, so they can be
+    matched with per-stream state such as precomputed features.
+    """
+
+    def __init__(
+        self,
+        vad: FrameVAD,
+        max_duration_seconds: float = 15.0,
+        silence_duration_to_stop: float = 1.0,
+        hangover_ms: float = 200.0,
+        pre_roll_ms: float = 300.0,
+        min_speech_ms: float = 200.0,
+    ):
+        """
+        Initialize SpeechSegmenter.
+
+        Args:
+            vad: Frame classifier
+            max_duration_seconds: Maximum segment duration
+            silence_duration_to_stop: Pause length that ends an utterance
+            hangover_ms: Audio kept after the last speech frame
+            pre_roll_ms: Audio kept before the first speech frame
+            min_speech_ms: Minimum voiced span; shorter bursts are discarded
+        """
+        self.vad = vad
+        sr = vad.sample_rate
+        self.frame_size = vad.frame_size
+        self.max_samples = int(max_duration_seconds * sr)
+        self.silence_samples_to_stop = int(silence_duration_to_stop * sr)
+        self.hangover_samples = int(hangover_ms * sr / 1000.0)
+        self.pre_roll_samples = int(pre_roll_ms * sr / 1000.0)
+        self.min_speech_samples = int(min_speech_ms * sr / 1000.0)
+
+        self._segment = SampleAccumulator(initial_capacity=self.max_samples + self.frame_size)
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self.stats: Dict[str, int] = {}
+        # Posição no stream: não volta a zero em reset() (o stream continua)
+        self._received = 0
+        self._buffer_end = 0
+        self.last_spans: List[Tuple[int, int]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop buffered audio and VAD state."""
+        self._segment.clear()
+        self._remainder = np.zeros(0, dtype=np.float32)
+        self.in_speech = False
+        self._speech_start = 0
+        self._last_speech_end = 0
+        self._silence_run = 0
+        # dropped_samples: áudio sem fala descartado (antes do pre-roll, bursts curtos, depois do hangover)
+        self.stats = {"segments": 0, "discarded_short": 0, "speech_frames": 0, "frames": 0, "dropped_samples": 0}
+
+    def push(self, chunk: np.ndarray) -> List[np.ndarray]:
+        """
+        Feed a chunk of audio.
+
+        Args:
+            chunk: Mono float32 samples
+
+        Returns:
+            List of finished speech segments (usually empty)
+        """
+        frames_start = self._received - len(self._remainder)
+        self._received += len(chunk)
+        self.last_spans = []
+
+        if len(self._remainder):
+            samples = np.concatenate([self._remainder, chunk])
+        else:
+            samples = chunk
+
+        num_frames = len(samples) // self.frame_size
+        used = num_frames * self.frame_size
+        self._remainder = samples[used:].copy()
+        if num_frames == 0:
+            return []
+
+        frames = samples[:used].reshape(num_frames, self.frame_size)
+        is_speech, _ = self.vad.classify(frames)
+        self.stats["frames"] += num_frames
+        self.stats["speech_frames"] += int(is_speech.sum())
+
+        segments: List[np.ndarray] = []
+        for index, (frame, speech) in enumerate(zip(frames, is_speech)):
+            self._buffer_end = frames_start + (index + 1) * self.frame_size
+            segment = self._step(frame, bool(speech))
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def _step(self, frame: np.ndarray, speech: bool) -> Optional[np.ndarray]:
+        """Advance the state machine by one frame."""
+        self._segment.append(frame)
+        length = len(self._segment)
+
+        if not self.in_speech:
+            if speech:
+                self.in_speech = True
+                self._speech_start = length - self.frame_size
+                self._last_speech_end = length
+                self._silence_run = 0
+            elif length > self.pre_roll_samples + self.frame_size:
+                # Manter apenas o pre-roll antes do início da fala
+                self._keep_pre_roll()
+            return None
+
+        if speech:
+            self._last_speech_end = length
+            self._silence_run = 0
+        else:
+            self._silence_run += self.frame_size
+
+        if length >= self.max_samples:
+            # Corte por duração máxima: a fala continua no próximo segmento
+            self.last_spans.append((self._buffer_end - length, self._buffer_end))
+            segment = self._segment.detach()
+            self._speech_start = 0
+            self._last_speech_end = 0
+            self.stats["segments"] += 1
+            return segment
+
+        if self._silence_run >= max(self.silence_samples_to_stop, self.hangover_samples):
+            return self._finish()
+
+        return None
+
+    def _finish(self) -> Optional[np.ndarray]:
+        """Close the current utterance and return it trimmed."""
+        voiced = self._last_speech_end - self._speech_start
+        end = min(self._last_speech_end + self.hangover_samples, len(self._segment))
+        start = max(self._speech_start - self.pre_roll_samples, 0)
+
+        self.in_speech = False
+        self._silence_run = 0
+
+        if voiced < self.min_speech_samples:
+            self.stats["discarded_short"] += 1
+            self._keep_pre_roll()
+            return None
+
+        buffer_start = self._buffer_end - len(self._segment)
+        self.last_spans.append((buffer_start + start, buffer_start + end))
+        self.stats["dropped_samples"] += len(self._segment) - (end - start)
+        segment = self._segment.detach()[start:end]
+        self.stats["segments"] += 1
+        return segment
+
+    def _keep_pre_roll(self) -> None:
+        """Drop buffered non-speech audio except the pre-roll."""
+        self.stats["dropped_samples"] += max(len(self._segment) - self.pre_roll_samples, 0)
+        self._segment.keep_tail(self.pre_roll_samples)
+
+    def current_utterance(self) -> Optional[np.ndarray]:
+        """
+        View of the utterance in progress, including pre-roll.
+
+        Returns:
+            View into the segment buffer (invalidated by the next push), or
+            None when no speech is in progress
+        """
+        if not self.in_speech:
+            return None
+        start = max(self._speech_start - self.pre_roll_samples, 0)
+        return self._segment.view()[start:]
+
+    def current_utterance_span(self) -> Optional[Tuple[int, int]]:
+        """Stream positions (start, end) of ``current_utterance()``."""
+        if not self.in_speech:
+            return None
+        start = max(self._speech_start - self.pre_roll_samples, 0)
+        buffer_end = self._received - len(self._remainder)
+        return buffer_end - len(self._segment) + start, buffer_end
+
+    def flush(self) -> Optional[np.ndarray]:
+        """Emit the in-progress utterance, if any (e.g. on stop)."""
+        if not self.in_speech:
+            return None
+        self.last_spans = []
+        return self._finish()
@@ -0,0 +1,161 @@
+"""Memory-mapped cache of converted Whisper weights for fast reloads."""
+
+import dataclasses
+import hashlib
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+
+logger = logging.getLogger(__name__)
+
+# Versão do layout do arquivo convertido (muda a chave se o formato mudar)
+CACHE_FORMAT = 1
+
+
+def default_cache_dir() -> str:
+    """``$XDG_CACHE_HOME/whisper/mmap`` (next to whisper's own downloads)."""
+    default = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(os.getenv("XDG_CACHE_HOME", default), "whisper", "mmap")
+
+
+def _source_identity(model_name: str) -> str:
+    """What the converted file was made from: the checkpoint URL (it embeds
+    the SHA-256) for official names, size and mtime for a local file."""
+    if model_name in whisper._MODELS:
+        return whisper._MODELS[model_name]
+    if os.path.isfile(model_name):
+        stat = os.stat(model_name)
+        return f"{os.path.abspath(model_name)}:{stat.st_size}:{stat.st_mtime_ns}"
+    raise RuntimeError(f"Model {model_name} not found; available models = {whisper.available_models()}")
+
+
+def cache_path(model_name: str, cache_dir: Optional[str] = None) -> Path:
+    """
+    File holding the converted weights of ``model_name``.
+
+    Args:
+        model_name: Official model name or checkpoint path
+        cache_dir: Cache directory (None = default_cache_dir())
+
+    Returns:
+        Path (the file may not exist yet)
+    """
+    identity = f"{CACHE_FORMAT}:{torch.get_default_dtype()}:{_source_identity(model_name)}"
+    digest = hashlib.blake2b(identity.encode(), digest_size=8).hexdigest()
+    stem = Path(model_name).stem if os.path.isfile(model_name) else model_name
+    return Path(cache_dir or default_cache_dir()) / f"{stem}-{digest}.pt"
+
+
+def _convert(model_name: str, path: Path) -> None:
+    """Load the original checkpoint once and save the float weights for mmap."""
+    model = whisper.load_model(model_name, device="cpu")
+    checkpoint = {
+        "dims": dataclasses.asdict(model.dims),
+        "model_state_dict": model.state_dict(),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Escrita atômica: workers do pool podem converter ao mesmo tempo
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        torch.save(checkpoint, tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+@contextmanager
+def _skip_init():
+    """Construct layers without initializing their weights.
+
+    The parameters are replaced by the mapped tensors right away; skipping
+    the random init leaves their (``torch.empty``) pages untouched, so they
+    never become resident. The meta device cannot be used: Whisper builds
+    a sparse buffer in ``__init__``.
+    """
+    layers = (torch.nn.Linear, torch.nn.Conv1d, torch.nn.LayerNorm, torch.nn.Embedding)
+    saved = [(layer, layer.__dict__.get("reset_parameters")) for layer in layers]
+    for layer in layers:
+        layer.reset_parameters = lambda self: None
+    try:
+        yield
+    finally:
+        for layer, method in saved:
+            if method is None:
+                del layer.reset_parameters
+            else:
+                layer.reset_parameters = method
+
+
+def _load_mapped(path: Path) -> Whisper:
+    """Build the model around tensors memory-mapped from ``path`` (no copy)."""
+    checkpoint = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+
+    with _skip_init():
+        model = Whisper(ModelDimensions(**checkpoint["dims"]))
+    # assign=True: os parâmetros passam a ser os próprios tensores mapeados
+    model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+    return model
+
+
+def load_model(model_name: str, device: str = "cpu", cache_dir: Optional[str] = None) -> Tuple[Whisper, Dict[str, Any]]:
+    """
+    Load a Whisper model through the memory-mapped weight cache.
+
+    The first load converts the checkpoint (the same weights
+    ``whisper.load_model`` produces) into a file that later loads map
+    instead of deserializing: reloads skip the checksum and the copy, and
+    processes on the same machine (pool workers, hot swap) share the
+    pages through the page cache. Needs torch >= 2.1 (``mmap`` and
+    ``assign``); otherwise the model is loaded normally.
+
+    Args:
+        model_name: Official model name or checkpoint path
+        device: Device the model is moved to (weights stay mapped on CPU)
+        cache_dir: Cache directory (None = default_cache_dir())
+
+    Returns:
+        Tuple of (model, info dict with path, hit flag and load time)
+    """
+    started = time.perf_counter()
+    path = cache_path(model_name, cache_dir)
+    hit = path.exists()
+    try:
+        model = None
+        if hit:
+            try:
+                model = _load_mapped(path)
+            except TypeError:
+                raise
+            except Exception as e:
+                # Arquivo truncado/corrompido: converter de novo
+                logger.warning(f"Unreadable weight cache {path.name} ({e}), converting again")
+                path.unlink(missing_ok=True)
+                hit = False
+        if model is None:
+            logger.info(f"Converting {model_name} weights for the mmap cache: {path}")
+            _convert(model_name, path)
+            model = _load_mapped(path)
+    except TypeError as e:
+        # torch sem mmap/assign (< 2.1): carregamento normal
+        logger.warning(f"Weight cache needs torch >= 2.1 ({e}), loading {model_name} normally")
+        model = whisper.load_model(model_name, device="cpu")
+        path, hit = None, False
+
+    if model_name in whisper._ALIGNMENT_HEADS:
+        model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_name])
+
+    info = {
+        "path": str(path) if path else None,
+        "hit": hit,
+        "load_seconds": round(time.perf_counter() - started, 3),
+    }
+    return model.to(device), info
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark de threads do torch para a transcrição Whisper.
+
+Transcreve o mesmo corpus de áudio com cada quantidade de threads intra-op e
+mostra o fator de tempo real (RTF) de cada uma, para escolher o melhor
+``whisper.num_threads`` da máquina.
+
+Uso:
+    python benchmark_threads.py --corpus pasta_com_wavs
+    python benchmark_threads.py --threads 1,2,4,8 --repeats 3 --save
+"""
+
+import argparse
+import os
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).parent
+sys.path.insert(0, str(BASE_DIR))
+
+SAMPLE_RATE = 16000
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """Lê um WAV PCM 16 bits mono/estéreo e reamostra para 16 kHz."""
+    with wave.open(str(path), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path.name}: only 16-bit PCM WAV is supported")
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != SAMPLE_RATE:
+        # Interpolação linear basta para medir tempo de inferência
+        positions = np.linspace(0, len(audio) - 1, int(len(audio) * SAMPLE_RATE / rate))
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def load_corpus(corpus_dir: str) -> list:
+    """Carrega os WAVs da pasta, ou um corpus sintético fixo se não houver pasta."""
+    if corpus_dir:
+        files = sorted(Path(corpus_dir).glob("*.wav"))
+        if not files:
+            sys.exit(f"❌ No .wav files in {corpus_dir}")
+        return [(f.name, load_wav(f)) for f in files]
+
+    # Sem corpus: ruído com semente fixa (1 s, 3 s e 8 s) - mede só o tempo
+    rng = np.random.default_rng(0)
+    print("⚠️  No --corpus given, using a fixed synthetic corpus (timings only)")
+    return [
+        (f"synthetic_{seconds}s", (rng.standard_normal(seconds * SAMPLE_RATE) * 0.05).astype(np.float32))
+        for seconds in (1, 3, 8)
+    ]
+
+
+def default_thread_counts() -> list:
+    """Potências de 2 até o número de CPUs, mais o próprio número de CPUs."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    counts = {cpus}
+    n = 1
+    while n < cpus:
+        counts.add(n)
+        n *= 2
+    return sorted(counts)
+
+
+def run_benchmark(transcriber, corpus: list, thread_counts: list, repeats: int) -> list:
+    """
+    Mede o RTF do corpus para cada quantidade de threads.
+
+    Returns:
+        Lista de dicts (threads, seconds, rtf), melhor tempo de ``repeats`` execuções
+    """
+    import torch
+
+    audio_seconds = sum(len(audio) for _, audio in corpus) / SAMPLE_RATE
+    results = []
+    for threads in thread_counts:
+        torch.set_num_threads(threads)
+        # Aquecimento: a primeira inferência com um novo pool de threads é mais lenta
+        transcriber.transcribe(corpus[0][1], SAMPLE_RATE)
+
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _, audio in corpus:
+                transcriber.transcribe(audio, SAMPLE_RATE)
+            best = min(best, time.perf_counter() - start)
+
+        rtf = best / audio_seconds
+        results.append({"threads": threads, "seconds": best, "rtf": rtf})
+        print(f"  {threads:>3} threads: {best:7.2f} s  RTF {rtf:.3f}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep torch thread counts for Whisper inference")
+    parser.add_argument("--corpus", default="", help="Folder with .wav files (default: synthetic)")
+    parser.add_argument("--model", default=None, help="Whisper model (default: whisper.model from config)")
+    parser.add_argument("--threads", default="", help="Comma-separated thread counts (default: 1,2,4,... up to CPUs)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per thread count (best is kept)")
+    parser.add_argument("--cpu-affinity", default=None, help="Pin to CPUs, e.g. 2-7 (default: whisper.cpu_affinity)")
+    parser.add_argument("--save", action="store_true", help="Save the best value as whisper.num_threads in config.json")
+    args = parser.parse_args()
+
+    from core.config_manager import ConfigManager
+    from audio.cpu_tuning import apply_cpu_affinity
+    from audio.transcriber import Transcriber
+
+    config = ConfigManager(config_dir=str(BASE_DIR))
+    whisper_config = config.get("whisper", {})
+
+    affinity = args.cpu_affinity if args.cpu_affinity is not None else whisper_config.get("cpu_affinity")
+    pinned = apply_cpu_affinity(affinity)
+    thread_counts = (
+        [int(t) for t in args.threads.split(",") if t.strip()] if args.threads else default_thread_counts()
+    )
+    corpus = load_corpus(args.corpus)
+
+    model = args.model or whisper_config.get("model", "base")
+    print(f"\n⏱  THREAD BENCHMARK - model {model}, {len(corpus)} clips, CPUs {pinned or 'all'}\n")
+
+    # Mesmas opções de decodificação da aplicação, sempre no CPU
+    transcriber = Transcriber(
+        model_name=model,
+        language=whisper_config.get("language", "pt"),
+        device="cpu",
+        beam_size=whisper_config.get("beam_size", 5),
+        best_of=whisper_config.get("best_of", 5),
+        patience=whisper_config.get("patience", 1.0) if whisper_config.get("beam_size", 5) else None,
+        condition_on_previous_text=False,
+        encoder_mode=whisper_config.get("encoder_mode", "accuracy"),
+        quantize=whisper_config.get("quantize", "none"),
+        interop_threads=whisper_config.get("interop_threads", 0),
+    )
+
+    results = run_benchmark(transcriber, corpus, thread_counts, max(args.repeats, 1))
+    best = min(results, key=lambda r: r["seconds"])
+    print(f"\n✅ Best: {best['threads']} threads (RTF {best['rtf']:.3f})")
+
+    if args.save:
+        config.set("whisper.num_threads", best["threads"])
+        print(f"💾 whisper.num_threads = {best['threads']} saved to config.json")
+    else:
+        print(f"   Set \"whisper.num_threads\": {best['threads']} (or run with --save)")
+
+
+if __name__ == "__main__":
+    main()
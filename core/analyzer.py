@@ -5,15 +5,23 @@ import queue
 import logging
 import time
 import numpy as np
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, List, Set, Union
 from collections import deque
 from datetime import datetime
 
 from core.config_manager import ConfigManager
 from core.event_logger import get_logger
-from audio.processor import AudioProcessor
+from audio.file_source import FileAudioSource
+from audio.pipe_source import PipeAudioSource
 from audio.transcriber import TranscriberThread
+from audio.transcriber_pool import TranscriberPool
 from audio.audio_utils import apply_gain
+from audio.segment_buffer import SampleAccumulator
+from audio.load_monitor import DowngradePolicy
+from audio.mel_frontend import HOP_LENGTH, LogMelFrontend, MelFeatures
+from audio.hotwords import hotwords_from_keywords
+from audio.streaming import LocalAgreement
+from audio.vad import FrameVAD, NoiseFloorTracker, SpeechSegmenter
 from ai.keyword_detector import KeywordDetector
 from ai.context_analyzer import ContextAnalyzer
 from ai.llm_engine import LLMEngine
@@ -22,6 +30,10 @@ from database.db_manager import DatabaseManager
 
 logger = get_logger(__name__)
 
+# Segmentos com disparo antecipado aguardando o resultado final (os mais antigos
+# saem: o final de um segmento descartado ou com falha nunca chega)
+EARLY_KEYWORD_MAX_SEGMENTS = 32
+
 
 class MicrophoneAnalyzer:
     """Main analyzer that orchestrates everything."""
@@ -43,8 +55,9 @@ class MicrophoneAnalyzer:
         self.database = DatabaseManager(database_dir)
 
         # Audio components
-        self.audio_processor: Optional[AudioProcessor] = None
-        self.transcriber: Optional[TranscriberThread] = None
+        # AudioProcessor, FileAudioSource ou PipeAudioSource (ver _create_audio_source)
+        self.audio_processor = None
+        self.transcriber: Optional[Union[TranscriberThread, TranscriberPool]] = None
 
         # AI components (lazy loaded - disabled by default to save memory)
         self.keyword_detector = KeywordDetector(self.config.get_keywords())
@@ -68,11 +81,56 @@ class MicrophoneAnalyzer:
         self._detection_callbacks = []
         self._status_callbacks = []
         self._audio_level_callbacks = []
+        self._partial_callbacks = []
+
+        # Transcrição parcial (streaming): id do enunciado em andamento e
+        # prefixo confirmado por LocalAgreement
+        self._utterance_id = 0
+        self._agreement = LocalAgreement()
+        self._agreement_utterance = -1
+
+        # Keywords cujo som já tocou durante a decodificação, por segmento
+        # (segment_id -> ids); escrito pela thread de inferência/coletora
+        self._early_triggered: Dict[int, Set[str]] = {}
+        self._early_lock = threading.Lock()
 
         # Threads
         self._processor_thread: Optional[threading.Thread] = None
+        self._result_thread: Optional[threading.Thread] = None
+        self._segmenter: Optional[SpeechSegmenter] = None
+        self._mel_frontend: Optional[LogMelFrontend] = None
+        self._noise_tracker: Optional[NoiseFloorTracker] = None
+        self._speech_threshold = 0.0
+
+        # Contadores de segmentos (enviados ao Whisper vs. descartados por silêncio).
+        # Modo rms: buffers de max_duration sem fala; modo frame: bursts curtos
+        # descartados pelo segmentador e todo o silêncio que ele deixou de fora
+        self._segment_stats = {
+            "submitted": 0,
+            "submitted_seconds": 0.0,
+            "silent_skipped": 0,
+            "silent_seconds_skipped": 0.0,
+        }
         self._event_thread: Optional[threading.Thread] = None
 
+        # Transcritores substituídos por reload: terminam a fila antes de liberar
+        # o modelo (transcriber, prazo limite)
+        self._retiring: deque = deque()
+        # Finais dos transcritores mais novos lidos durante a drenagem: retidos
+        # até os mais antigos terminarem (transcriber -> deque de resultados)
+        self._held_results: Dict[Any, deque] = {}
+        self._reload_lock = threading.Lock()
+
+        # Pré-carregamento do modelo no boot (whisper.preload_on_boot)
+        self._preload_thread: Optional[threading.Thread] = None
+        self._preload_state = "idle"
+        self._preload_error: Optional[str] = None
+
+        # Downgrade automático por fator de tempo real (whisper.auto_downgrade)
+        self._load_policy: Optional[DowngradePolicy] = None
+        self._load_policy_busy = False
+        self._last_policy_check = 0.0
+
         # Restart protection: prevent tight restart loops if capture is failing
         self._restart_timestamps = deque()
         self._delayed_restart_scheduled = False
@@ -161,53 +219,22 @@ class MicrophoneAnalyzer:
 
             # CORREÇÃO: Reutilizar AudioProcessor ao invés de recriar
             if not self.audio_processor:
-                audio_config = self.config.get("audio")
-                self.audio_processor = AudioProcessor(
-                    device_id=audio_config.get("device_id", -1),
-                    sample_rate=audio_config.get("sample_rate", 16000),
-                    chunk_size=audio_config.get("chunk_size", 2048),
-                    channels=audio_config.get("channels", 1),
-                    silence_threshold=audio_config.get("silence_threshold", 0.02),
-                )
+                self.audio_processor = self._create_audio_source(self.config.get("audio", {}))
 
             # Start audio capture
             if not self.audio_processor.is_recording:
                 self.audio_processor.start()
 
+            # Pré-carregamento em andamento: aguardar em vez de carregar outra cópia
+            if self._preload_thread and self._preload_thread.is_alive():
+                logger.info("Waiting for Whisper model preload to finish")
+                self._preload_thread.join()
+
             # CORREÇÃO: Reutilizar Transcriber ao invés de recriar
             if not self.transcriber:
-                whisper_config = self.config.get("whisper", {})
-                
-                # Auto-detect device (prefer GPU)
-                device = whisper_config.get("device", "auto")
-                if device == "auto":
-                    try:
-                        import torch
-                        device = "cuda" if torch.cuda.is_available() else "cpu"
-                        logger.info(f"Auto-detected Whisper device: {device}")
-                    except:
-                        device = "cpu"
-                
-                # Criar TranscriberThread com todas as configurações avançadas
-                self.transcriber = TranscriberThread(
-                    model_name=whisper_config.get("model", "base"),
-                    language=whisper_config.get("language", "pt"),
-                    device=device,
-                    task=whisper_config.get("task", "transcribe"),
-                    beam_size=whisper_config.get("beam_size", 5),
-                    best_of=whisper_config.get("best_of", 5),
-                    temperature=whisper_config.get("temperature", 0.0),
-                    patience=whisper_config.get("patience", 1.0),
-                    length_penalty=whisper_config.get("length_penalty", 1.0),
-                    suppress_blank=whisper_config.get("suppress_blank", True),
-                    condition_on_previous_text=whisper_config.get("condition_on_previous_text", True),
-                    no_speech_threshold=whisper_config.get("no_speech_threshold", 0.6),
-                    compression_ratio_threshold=whisper_config.get("compression_ratio_threshold", 2.4),
-                    logprob_threshold=whisper_config.get("logprob_threshold", -1.0),
-                    initial_prompt=whisper_config.get("initial_prompt", "Esta é uma transcrição em português brasileiro."),
-                    word_timestamps=whisper_config.get("word_timestamps", False),
-                    hallucination_silence_threshold=whisper_config.get("hallucination_silence_threshold"),
-                )
+                self.transcriber = self._create_transcriber(self.config.get("whisper", {}))
+            if self._load_policy is None:
+                self._load_policy = self._create_load_policy(self.config.get("whisper", {}))
             
             if hasattr(self.transcriber, 'is_running') and not self.transcriber.is_running:
                 self.transcriber.start()
@@ -218,6 +245,12 @@ class MicrophoneAnalyzer:
             )
             self._processor_thread.start()
 
+            # Start result consumer thread (transcrição em pipeline com a captura)
+            self._result_thread = threading.Thread(
+                target=self._result_loop, daemon=True
+            )
+            self._result_thread.start()
+
             # Start event thread
             self._event_thread = threading.Thread(
                 target=self._event_loop, daemon=True
@@ -241,6 +274,195 @@ class MicrophoneAnalyzer:
             self.is_running = False
             raise
 
+    def _create_transcriber(self, whisper_config: Dict[str, Any]):
+        """
+        Create the transcriber: in-process thread, or a worker-process pool
+        when ``whisper.workers`` > 0.
+
+        Args:
+            whisper_config: The ``whisper`` configuration section
+
+        Returns:
+            TranscriberThread or TranscriberPool (same interface)
+        """
+        # Auto-detect device (prefer GPU)
+        device = whisper_config.get("device", "auto")
+        if device == "auto":
+            try:
+                import torch
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                logger.info(f"Auto-detected Whisper device: {device}")
+            except:
+                device = "cpu"
+
+        settings = dict(
+            model_name=whisper_config.get("model", "base"),
+            language=whisper_config.get("language", "pt"),
+            device=device,
+            task=whisper_config.get("task", "transcribe"),
+            beam_size=whisper_config.get("beam_size", 5),
+            best_of=whisper_config.get("best_of", 5),
+            temperature=whisper_config.get("temperature", 0.0),
+            patience=whisper_config.get("patience", 1.0),
+            length_penalty=whisper_config.get("length_penalty", 1.0),
+            suppress_blank=whisper_config.get("suppress_blank", True),
+            condition_on_previous_text=whisper_config.get("condition_on_previous_text", True),
+            no_speech_threshold=whisper_config.get("no_speech_threshold", 0.6),
+            compression_ratio_threshold=whisper_config.get("compression_ratio_threshold", 2.4),
+            logprob_threshold=whisper_config.get("logprob_threshold", -1.0),
+            initial_prompt=whisper_config.get("initial_prompt", "Esta é uma transcrição em português brasileiro."),
+            word_timestamps=whisper_config.get("word_timestamps", False),
+            hallucination_silence_threshold=whisper_config.get("hallucination_silence_threshold"),
+            encoder_mode=whisper_config.get("encoder_mode", "accuracy"),
+            short_clip_max_seconds=whisper_config.get("short_clip_max_seconds", 5.0),
+            short_clip_padding_seconds=whisper_config.get("short_clip_padding_seconds", 1.0),
+            backend=whisper_config.get("backend", "whisper"),
+            model_path=whisper_config.get("model_path") or None,
+            compute_type=whisper_config.get("compute_type", "int8"),
+            cpu_threads=whisper_config.get("cpu_threads", 0),
+            quantize=whisper_config.get("quantize", "none"),
+            decoding_policy=whisper_config.get("decoding_policy", "beam"),
+            greedy_logprob_threshold=whisper_config.get("greedy_logprob_threshold", -0.5),
+            greedy_compression_ratio=whisper_config.get("greedy_compression_ratio", 2.0),
+            latency_slo_seconds=whisper_config.get("latency_slo_seconds", 0.0),
+            num_threads=whisper_config.get("num_threads", 0),
+            interop_threads=whisper_config.get("interop_threads", 0),
+            cpu_affinity=whisper_config.get("cpu_affinity") or None,
+            hotwords=self._hotwords(whisper_config),
+            hotword_prompt=whisper_config.get("hotword_prompt", False),
+            hotword_boost=whisper_config.get("hotword_boost", 0.0),
+            early_keywords=self._early_keywords(whisper_config),
+            result_cache_entries=whisper_config.get("result_cache_entries", 0),
+            result_cache_dir=whisper_config.get("result_cache_dir") or None,
+            weight_cache=whisper_config.get("weight_cache", False),
+            weight_cache_dir=whisper_config.get("weight_cache_dir") or None,
+        )
+
+        workers = int(whisper_config.get("workers", 0) or 0)
+        if workers > 0:
+            # Processos separados: inferência fora do GIL do servidor web
+            warmup_seconds = whisper_config.get("warmup_seconds", 1.0) if whisper_config.get("warmup", True) else 0.0
+            # Um segmento no máximo passa de max_duration por até um chunk mais o
+            # pre-roll: blocos desse tamanho evitam blocos avulsos a cada enunciado longo
+            sample_rate = self.config.get("audio.sample_rate", 16000)
+            overshoot = (
+                self.config.get("audio.chunk_size", 2048)
+                + self.config.get("audio.vad_pre_roll_ms", 300.0) * sample_rate / 1000.0
+            )
+            pool = TranscriberPool(
+                workers=workers,
+                torch_threads=whisper_config.get("worker_threads", 0),
+                warmup_seconds=warmup_seconds,
+                max_segment_seconds=self.config.get("audio.max_duration_seconds", 15.0) + overshoot / sample_rate,
+                sample_rate=sample_rate,
+                **settings,
+            )
+            pool.early_keyword_callback = self._handle_early_keyword
+            return pool
+
+        # Criar TranscriberThread com todas as configurações avançadas
+        transcriber = TranscriberThread(
+            batch_size=whisper_config.get("batch_size", 4),
+            batch_max_wait_ms=whisper_config.get("batch_max_wait_ms", 0.0),
+            max_merge_seconds=whisper_config.get("max_merge_seconds", 25.0),
+            **settings,
+        )
+        transcriber.early_keyword_callback = self._handle_early_keyword
+        margin = whisper_config.get("greedy_keyword_margin", 10)
+        if transcriber.greedy_first is not None and margin > 0:
+            # Quase-acerto de keyword: confirmar com busca em feixe
+            transcriber.greedy_first.uncertainty_check = (
+                lambda text: self.keyword_detector.near_miss(text, margin)
+            )
+        return transcriber
+
+    def _hotwords(self, whisper_config: Dict[str, Any]) -> List[str]:
+        """Keyword patterns and variations to bias decoding towards (empty if disabled)."""
+        if not whisper_config.get("hotword_prompt", False) and not whisper_config.get("hotword_boost", 0.0):
+            return []
+        return hotwords_from_keywords(self.config.get_keywords())
+
+    def _early_keywords(self, whisper_config: Dict[str, Any]) -> Optional[List[Dict]]:
+        """Keywords for the early trigger (None if disabled).
+
+        The context analysis needs the whole transcript, so it turns the
+        early trigger off.
+        """
+        if not whisper_config.get("early_keyword_trigger", False):
+            return None
+        if self.config.get("ai.context_analysis_enabled", False):
+            logger.info("whisper.early_keyword_trigger ignored: context analysis needs the full transcript")
+            return None
+        return self.config.get_keywords()
+
+    def _refresh_hotwords(self) -> None:
+        """Push the current keywords to the transcriber's decoding bias."""
+        transcriber = self.transcriber
+        if transcriber is None or not hasattr(transcriber, "set_hotwords"):
+            return
+        whisper_config = self.config.get("whisper", {})
+        words = self._hotwords(whisper_config)
+        try:
+            transcriber.set_hotwords(words)
+            if hasattr(transcriber, "set_early_keywords"):
+                transcriber.set_early_keywords(self._early_keywords(whisper_config))
+            logger.info(f"Hotwords refreshed ({len(words)} words)")
+        except Exception as e:
+            logger.warning(f"Could not refresh hotwords: {e}")
+
+    def _create_audio_source(self, audio_config: Dict[str, Any]):
+        """
+        Create the audio source selected by ``audio.source``.
+
+        Args:
+            audio_config: The ``audio`` config section
+
+        Returns:
+            Object implementing the AudioProcessor start/get_chunk/stop contract
+        """
+        source = audio_config.get("source", "microphone")
+
+        if source == "file":
+            return FileAudioSource(
+                file_path=audio_config.get("file_path", ""),
+                sample_rate=audio_config.get("sample_rate", 16000),
+                chunk_size=audio_config.get("chunk_size", 2048),
+                silence_threshold=audio_config.get("silence_threshold", 0.02),
+                realtime=audio_config.get("file_realtime", True),
+                speed=audio_config.get("file_speed", 1.0),
+                loop=audio_config.get("file_loop", False),
+                pcm_format=audio_config.get("pcm_format", "int16"),
+                pcm_sample_rate=audio_config.get("pcm_sample_rate"),
+                pcm_channels=audio_config.get("pcm_channels", 1),
+            )
+
+        if source in ("pipe", "stdin"):
+            return PipeAudioSource(
+                pipe_path=audio_config.get("pipe_path", "-") if source == "pipe" else "-",
+                sample_rate=audio_config.get("sample_rate", 16000),
+                chunk_size=audio_config.get("chunk_size", 2048),
+                silence_threshold=audio_config.get("silence_threshold", 0.02),
+                pcm_format=audio_config.get("pcm_format", "int16"),
+                pcm_channels=audio_config.get("pcm_channels", 1),
+                ring_buffer_seconds=audio_config.get("ring_buffer_seconds", 30.0),
+            )
+
+        if source != "microphone":
+            logger.warning(f"Unknown audio.source '{source}', using microphone")
+
+        # Import tardio: servidores headless (pipe/stdin) não precisam do PyAudio
+        from audio.processor import AudioProcessor
+
+        return AudioProcessor(
+            device_id=audio_config.get("device_id", -1),
+            sample_rate=audio_config.get("sample_rate", 16000),
+            chunk_size=audio_config.get("chunk_size", 2048),
+            channels=audio_config.get("channels", 1),
+            silence_threshold=audio_config.get("silence_threshold", 0.02),
+            capture_mode=audio_config.get("capture_mode", "blocking"),
+            ring_buffer_seconds=audio_config.get("ring_buffer_seconds", 30.0),
+        )
+
     def stop(self) -> None:
         """Stop the analyzer."""
         try:
@@ -255,6 +477,10 @@ class MicrophoneAnalyzer:
             if self.transcriber and hasattr(self.transcriber, 'is_running') and self.transcriber.is_running:
                 self.transcriber.stop()
 
+            while self._retiring:
+                self._release_transcriber(self._retiring.popleft()[0])
+            self._held_results.clear()
+
             if self.sound_manager:
                 self.sound_manager.stop_sound()
 
@@ -268,7 +494,6 @@ class MicrophoneAnalyzer:
     def _processing_loop(self) -> None:
         """Main processing loop with VAD (Voice Activity Detection) for complete sentences."""
         try:
-            audio_buffer = []
             min_duration = self.config.get("audio.min_duration_seconds", 1.5)
             max_duration = self.config.get("audio.max_duration_seconds", 15.0)  # Máximo 15 segundos
             silence_duration_to_stop = self.config.get("audio.silence_duration_to_stop", 1.0)  # 1 segundo de silêncio = fim da frase
@@ -276,18 +501,80 @@ class MicrophoneAnalyzer:
             min_samples = int(min_duration * sample_rate)
             max_samples = int(max_duration * sample_rate)
             silence_samples_threshold = int(silence_duration_to_stop * sample_rate)
+            chunk_size = self.config.get("audio.chunk_size", 2048)
+
+            # Buffer pré-alocado para o segmento (comprimento em O(1), sem concatenate)
+            audio_buffer = SampleAccumulator(initial_capacity=max_samples + chunk_size)
+
+            # Modo callback: ler views do ring buffer (o acumulador copia uma única vez)
+            read_chunk = getattr(self.audio_processor, "get_chunk_view", self.audio_processor.get_chunk)
             
             # Estado do VAD (Voice Activity Detection)
             consecutive_silence_samples = 0
             has_speech_started = False
             speech_threshold = self.config.get("audio.speech_threshold", 0.015)  # Threshold para detectar fala
+            skip_silent = bool(self.config.get("audio.skip_silent_segments", True))
+            pre_roll_samples = int(self.config.get("audio.vad_pre_roll_ms", 300.0) * sample_rate / 1000.0)
+            base_speech_threshold = speech_threshold
+            base_silence_threshold = self.config.get("audio.silence_threshold", 0.02)
+
+            # VAD por frames (energia + ZCR + flatness) com pre-roll e hangover
+            frame_mode = self.config.get("audio.vad_mode", "rms") == "frame"
+
+            # Piso de ruído adaptativo: um novo estimador a cada início de captura
+            # (ou seja, por dispositivo), alimentado por RMS de frames ou de chunks
+            noise_tracker = None
+            if self.config.get("audio.adaptive_threshold", False):
+                frame_ms = self.config.get("audio.vad_frame_ms", 20.0)
+                step_seconds = frame_ms / 1000.0 if frame_mode else chunk_size / sample_rate
+                noise_tracker = self._create_noise_tracker(step_seconds)
+            self._noise_tracker = noise_tracker
+            self._speech_threshold = speech_threshold
+
+            segmenter = None
+            if frame_mode:
+                segmenter = self._create_segmenter(
+                    speech_threshold, max_duration, silence_duration_to_stop, noise_tracker
+                )
+            self._segmenter = segmenter
+
+            # Transcrição parcial: redecodificar a janela crescente do enunciado
+            streaming = bool(self.config.get("whisper.streaming_partials", False))
+            partial_interval = int(self.config.get("whisper.partial_interval_ms", 500) * sample_rate / 1000.0)
+            partial_min_samples = int(self.config.get("whisper.partial_min_seconds", 1.0) * sample_rate)
+            samples_since_partial = 0
+
+            # Mel calculado uma vez por amostra capturada e reaproveitado por segmentos/parciais
+            mel_frontend = self._create_mel_frontend(sample_rate)
+            self._mel_frontend = mel_frontend
+            # Modo rms com features: o buffer começa sempre num múltiplo do hop
+            # do mel, senão os frames do stream não servem para o segmento
+            hop = HOP_LENGTH if mel_frontend is not None else 1
+            stream_position = 0
+            flushed_at_end = False
 
             while self.is_running:
                 try:
                     # Get audio chunk
-                    chunk = self.audio_processor.get_chunk(timeout=0.5)
+                    chunk = read_chunk(timeout=0.5)
                     if chunk is None:
+                        if not flushed_at_end and self._audio_source_finished():
+                            # Fim do arquivo (sem loop): a fala em andamento não terá
+                            # a pausa que a encerraria
+                            flushed_at_end = True
+                            if segmenter is not None:
+                                segment = segmenter.flush()
+                                if segment is not None:
+                                    self._submit_segment(segment, sample_rate, segmenter.last_spans[0])
+                            elif has_speech_started and len(audio_buffer) > 0:
+                                span = (stream_position - len(audio_buffer), stream_position)
+                                self._submit_segment(audio_buffer.detach(), sample_rate, span)
+                                has_speech_started = False
+                                consecutive_silence_samples = 0
                         continue
+                    stream_position += len(chunk)
+                    if mel_frontend is not None:
+                        mel_frontend.push(chunk)
 
                     # Calcular e enviar o nível de áudio
                     # CORREÇÃO: Usar RMS para melhor representação visual
@@ -306,6 +593,19 @@ class MicrophoneAnalyzer:
                         normalized_level = 0.0
                     
                     energy = rms
+
+                    if noise_tracker is not None:
+                        if segmenter is None:
+                            # Modo rms: o estimador vê um valor por chunk
+                            noise_tracker.update(np.array([rms]))
+                            speech_threshold = noise_tracker.speech_threshold(base_speech_threshold)
+                        else:
+                            speech_threshold = segmenter.vad.energy_threshold
+                        self._speech_threshold = speech_threshold
+                        if noise_tracker.ready and self.audio_processor:
+                            self.audio_processor.silence_threshold = noise_tracker.silence_threshold(
+                                base_silence_threshold
+                            )
                     
                     with self._callback_lock:
                         for callback in self._audio_level_callbacks:
@@ -314,15 +614,6 @@ class MicrophoneAnalyzer:
                             except Exception as e:
                                 logger.error(f"Error in audio level callback: {e}")
 
-                    # VAD: Detectar se há fala ou silêncio
-                    is_speech = rms > speech_threshold
-                    
-                    if is_speech:
-                        has_speech_started = True
-                        consecutive_silence_samples = 0
-                    else:
-                        consecutive_silence_samples += len(chunk)
-
                     # Detect sustained low audio (possible wrong mic gain/threshold)
                     try:
                         silence_threshold = (
@@ -348,16 +639,58 @@ class MicrophoneAnalyzer:
                     except Exception:
                         pass
 
+                    if segmenter is not None:
+                        # Segmentos já vêm recortados nos limites da fala
+                        discarded = segmenter.stats["discarded_short"]
+                        dropped = segmenter.stats["dropped_samples"]
+                        segments = segmenter.push(chunk)
+                        self._segment_stats["silent_skipped"] += segmenter.stats["discarded_short"] - discarded
+                        self._segment_stats["silent_seconds_skipped"] += (
+                            segmenter.stats["dropped_samples"] - dropped
+                        ) / sample_rate
+                        for segment, span in zip(segments, segmenter.last_spans):
+                            self._submit_segment(segment, sample_rate, span)
+                            samples_since_partial = 0
+
+                        if streaming and segmenter.in_speech:
+                            samples_since_partial += len(chunk)
+                            if samples_since_partial >= partial_interval:
+                                window = segmenter.current_utterance()
+                                if window is not None and len(window) >= partial_min_samples:
+                                    self._submit_partial(window, sample_rate, segmenter.current_utterance_span())
+                                    samples_since_partial = 0
+                        continue
+
+                    # VAD: Detectar se há fala ou silêncio
+                    is_speech = rms > speech_threshold
+                    
+                    if is_speech:
+                        has_speech_started = True
+                        consecutive_silence_samples = 0
+                    else:
+                        consecutive_silence_samples += len(chunk)
+
                     # Add to buffer
                     audio_buffer.append(chunk)
-                    total_samples = sum(len(c) for c in audio_buffer)
+                    total_samples = len(audio_buffer)
 
                     # Decidir quando enviar para transcrição:
                     # 1. Se atingiu o máximo de duração (forçar envio)
                     # 2. Se já passou o mínimo E detectou pausa longa após fala
                     should_transcribe = False
                     
-                    if total_samples >= max_samples:
+                    if total_samples >= max_samples and not has_speech_started and skip_silent:
+                        # Buffer sem fala: não gastar uma passada do Whisper com silêncio
+                        # (evita também alucinações). Mantém só o pre-roll para não
+                        # cortar uma fala que comece exatamente agora.
+                        keep = pre_roll_samples + (stream_position - pre_roll_samples) % hop
+                        skipped = total_samples - min(keep, total_samples)
+                        audio_buffer.keep_tail(keep)
+                        consecutive_silence_samples = 0
+                        self._segment_stats["silent_skipped"] += 1
+                        self._segment_stats["silent_seconds_skipped"] += skipped / sample_rate
+                        logger.debug(f"Descartando {skipped / sample_rate:.1f}s de áudio sem fala")
+                    elif total_samples >= max_samples:
                         # Atingiu máximo - enviar imediatamente
                         should_transcribe = True
                         logger.debug(f"Enviando para transcrição: atingiu máximo ({max_duration}s)")
@@ -367,28 +700,31 @@ class MicrophoneAnalyzer:
                             should_transcribe = True
                             logger.debug(f"Enviando para transcrição: pausa detectada após {total_samples/sample_rate:.1f}s de áudio")
                     
-                    if should_transcribe and len(audio_buffer) > 0:
-                        # Combine chunks
-                        audio_data = np.concatenate(audio_buffer)
-
-                        # Apply auto-gain normalization if enabled and submit for transcription
-                        try:
-                            prepared = self._prepare_audio_for_transcription(audio_data, sample_rate)
-                        except Exception as e:
-                            logger.error(f"Error preparing audio for transcription: {e}")
-                            prepared = audio_data
-
-                        self.transcriber.submit_audio(prepared, sample_rate)
+                    if streaming and has_speech_started and not should_transcribe:
+                        samples_since_partial += len(chunk)
+                        if samples_since_partial >= partial_interval and total_samples >= partial_min_samples:
+                            self._submit_partial(
+                                audio_buffer.view(), sample_rate,
+                                (stream_position - len(audio_buffer), stream_position),
+                            )
+                            samples_since_partial = 0
 
-                        # Clear buffer e resetar VAD
-                        audio_buffer = []
+                    if should_transcribe and len(audio_buffer) > 0:
+                        # Segmento contíguo entregue ao transcriber sem cópia
+                        span = (stream_position - len(audio_buffer), stream_position)
+                        segment = audio_buffer.detach()
+                        self._submit_segment(segment, sample_rate, span)
+                        head = stream_position % hop
+                        if head:
+                            # Repetir o fim (< 10 ms) para o próximo buffer começar no hop
+                            audio_buffer.append(segment[-head:])
+
+                        # Resetar VAD (buffer já foi liberado pelo detach)
+                        # O resultado é consumido por _result_loop: a segmentação
+                        # continua em tempo real enquanto o Whisper processa
                         consecutive_silence_samples = 0
                         has_speech_started = False
-
-                        # Get transcription result
-                        result = self.transcriber.get_result(timeout=15.0)
-                        if result:
-                            self._handle_transcription(result)
+                        samples_since_partial = 0
 
                 except Exception as e:
                     logger.error(f"Error in processing loop: {e}")
@@ -398,6 +734,447 @@ class MicrophoneAnalyzer:
             logger.error(f"Processing loop crashed: {e}")
             self.is_running = False
 
+    def _audio_source_finished(self) -> bool:
+        """True once a finite source (file without loop) has been fully consumed."""
+        is_finished = getattr(self.audio_processor, "is_finished", None)
+        return bool(is_finished and is_finished())
+
+    def _create_noise_tracker(self, step_seconds: float) -> NoiseFloorTracker:
+        """
+        Build the noise-floor tracker from ``audio.noise_floor_*`` settings.
+
+        Args:
+            step_seconds: Duration covered by each RMS value fed to the tracker
+        """
+        window_seconds = self.config.get("audio.noise_floor_window_seconds", 10.0)
+        return NoiseFloorTracker(
+            window_size=int(window_seconds / step_seconds),
+            percentile=self.config.get("audio.noise_floor_percentile", 10.0),
+            speech_snr_db=self.config.get("audio.speech_snr_db", 10.0),
+            silence_snr_db=self.config.get("audio.silence_snr_db", 3.0),
+            min_speech_threshold=self.config.get("audio.min_speech_threshold", 0.003),
+            max_speech_threshold=self.config.get("audio.max_speech_threshold", 0.1),
+            warmup=max(int(0.5 / step_seconds), 1),
+        )
+
+    def _create_segmenter(
+        self,
+        speech_threshold: float,
+        max_duration: float,
+        silence_duration_to_stop: float,
+        noise_tracker: Optional[NoiseFloorTracker] = None,
+    ) -> SpeechSegmenter:
+        """Build the frame-level VAD segmenter from ``audio.vad_*`` settings."""
+        vad = FrameVAD(
+            sample_rate=self.config.get("audio.sample_rate", 16000),
+            frame_ms=self.config.get("audio.vad_frame_ms", 20.0),
+            energy_threshold=speech_threshold,
+            flatness_threshold=self.config.get("audio.vad_flatness_threshold", 0.45),
+            zcr_threshold=self.config.get("audio.vad_zcr_threshold", 0.4),
+            noise_tracker=noise_tracker,
+        )
+        return SpeechSegmenter(
+            vad,
+            max_duration_seconds=max_duration,
+            silence_duration_to_stop=silence_duration_to_stop,
+            hangover_ms=self.config.get("audio.vad_hangover_ms", 200.0),
+            pre_roll_ms=self.config.get("audio.vad_pre_roll_ms", 300.0),
+            min_speech_ms=self.config.get("audio.vad_min_speech_ms", 200.0),
+        )
+
+    def _create_mel_frontend(self, sample_rate: int) -> Optional[LogMelFrontend]:
+        """Build the incremental log-mel frontend if ``whisper.mel_frontend`` is on."""
+        if not self.config.get("whisper.mel_frontend", False):
+            return None
+        n_mels = getattr(self.transcriber, "feature_mels", None)
+        if n_mels is None:
+            logger.info("whisper.mel_frontend ignored: transcriber computes its own features")
+            return None
+        if sample_rate != 16000:
+            logger.warning(f"whisper.mel_frontend needs 16 kHz capture (got {sample_rate} Hz), disabled")
+            return None
+        try:
+            return LogMelFrontend(
+                n_mels=n_mels,
+                ring_seconds=self.config.get("whisper.mel_ring_seconds", 60.0),
+            )
+        except Exception as e:
+            logger.warning(f"Could not create mel frontend: {e}")
+            return None
+
+    def _segment_features(self, audio_data: np.ndarray, span: Optional[tuple]) -> Optional[MelFeatures]:
+        """Precomputed features of a segment, if the frontend still has its frames."""
+        frontend = self._mel_frontend
+        if frontend is None or span is None:
+            return None
+        # Após um hot swap o modelo pode esperar outro número de bandas
+        if frontend.n_mels != getattr(self.transcriber, "feature_mels", None):
+            return None
+        try:
+            return frontend.features(span, audio_data)
+        except Exception as e:
+            logger.debug(f"Mel frontend lookup failed: {e}")
+            return None
+
+    def _submit_segment(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        span: Optional[tuple] = None,
+    ) -> None:
+        """
+        Apply auto-gain and hand a speech segment to the transcriber.
+
+        Args:
+            audio_data: Segment samples
+            sample_rate: Sample rate
+            span: (start, end) stream positions of the segment, for precomputed features
+        """
+        features = self._segment_features(audio_data, span)
+        try:
+            prepared = self._prepare_audio_for_transcription(audio_data, sample_rate)
+        except Exception as e:
+            logger.error(f"Error preparing audio for transcription: {e}")
+            prepared = audio_data
+
+        transcriber = self.transcriber
+        if transcriber is None:
+            # Reload a frio em andamento: não há modelo para transcrever
+            logger.warning("No transcriber loaded, segment dropped")
+            return
+
+        if features is not None:
+            transcriber.submit_audio(prepared, sample_rate, captured_at=time.monotonic(), features=features)
+        else:
+            transcriber.submit_audio(prepared, sample_rate, captured_at=time.monotonic())
+        self._segment_stats["submitted"] += 1
+        self._segment_stats["submitted_seconds"] += len(audio_data) / sample_rate
+        # Parciais ainda pendentes deste enunciado passam a ser obsoletos
+        self._utterance_id += 1
+
+    def _submit_partial(
+        self,
+        window: np.ndarray,
+        sample_rate: int,
+        span: Optional[tuple] = None,
+    ) -> None:
+        """
+        Hand a copy of the utterance in progress to the transcriber.
+
+        Args:
+            window: View of the utterance so far (copied here)
+            sample_rate: Sample rate
+            span: (start, end) stream positions of the window, for precomputed features
+        """
+        if not hasattr(self.transcriber, "submit_partial"):
+            return
+        features = self._segment_features(window, span)
+        audio_data = np.array(window, dtype=np.float32, copy=True)
+        try:
+            audio_data = self._prepare_audio_for_transcription(audio_data, sample_rate)
+        except Exception as e:
+            logger.error(f"Error preparing partial audio: {e}")
+        if features is not None:
+            self.transcriber.submit_partial(audio_data, sample_rate, self._utterance_id, features=features)
+        else:
+            self.transcriber.submit_partial(audio_data, sample_rate, self._utterance_id)
+
+    def _result_loop(self) -> None:
+        """Consume transcription results independently of segmentation."""
+        try:
+            while self.is_running:
+                try:
+                    # Esgotar primeiro os transcritores substituídos (mantém a ordem)
+                    if self._retiring:
+                        self._drain_retiring()
+                        continue
+
+                    # Ler a referência a cada iteração (pode ser trocada no reload)
+                    transcriber = self.transcriber
+                    if transcriber is None:
+                        time.sleep(0.1)
+                        continue
+
+                    result = self._next_result(transcriber, timeout=0.5)
+                    if result and result.get("partial"):
+                        self._handle_partial(result)
+                    elif result:
+                        self._handle_transcription(result)
+
+                    self._check_load_policy()
+
+                except Exception as e:
+                    logger.error(f"Error in result loop: {e}")
+                    time.sleep(0.1)
+
+        except Exception as e:
+            logger.error(f"Result loop crashed: {e}")
+
+    def _drain_retiring(self) -> None:
+        """Forward one result of the oldest replaced transcriber, or release it when done."""
+        old, deadline = self._retiring[0]
+        # Os mais novos continuam sendo lidos: a fila de saída deles é limitada e
+        # descarta o mais antigo, então uma drenagem longa perderia resultados
+        for newer, _ in list(self._retiring)[1:]:
+            self._hold_results(newer)
+        if self.transcriber is not None:
+            self._hold_results(self.transcriber)
+
+        result = self._next_result(old, timeout=0.1)
+        if result and result.get("partial"):
+            return  # Parcial do modelo antigo: obsoleto
+        if result:
+            self._handle_transcription(result)
+            return
+
+        if old.is_idle() or not old.is_running or time.monotonic() > deadline:
+            self._retiring.popleft()
+            self._release_transcriber(old)
+
+    def _hold_results(self, transcriber) -> None:
+        """Move the finals a newer transcriber has ready into its held buffer."""
+        while True:
+            result = transcriber.get_result(timeout=0)
+            if not result:
+                return
+            if result.get("partial"):
+                # Enunciado em andamento: não depende da ordem dos finais
+                self._handle_partial(result)
+            else:
+                self._held_results.setdefault(transcriber, deque()).append(result)
+
+    def _next_result(self, transcriber, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next result of ``transcriber``: held finals first, then its output queue."""
+        held = self._held_results.get(transcriber)
+        if held:
+            return held.popleft()
+        self._held_results.pop(transcriber, None)
+        return transcriber.get_result(timeout=timeout)
+
+    def reload_transcriber(self, hot_swap: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Replace the transcriber with one built from the current ``whisper`` config.
+
+        Hot swap loads the new model while the old one keeps transcribing,
+        swaps ``self.transcriber`` in one assignment and only then retires the
+        old one: it finishes its queued segments (results still reach
+        _handle_transcription, in order) and its model is released. This
+        needs memory for two models at once; if there is not enough, or
+        loading fails, it falls back to a cold reload (old model released
+        first, segments arriving meanwhile are dropped).
+
+        Args:
+            hot_swap: Force hot (True) or cold (False) reload; None uses
+                ``whisper.hot_swap``
+
+        Returns:
+            Dictionary with mode ("hot" or "cold") and swap_ms (time without a
+            transcriber during a cold reload, 0 for hot)
+        """
+        if hot_swap is None:
+            hot_swap = self.config.get("whisper.hot_swap", True)
+        whisper_config = self.config.get("whisper", {})
+        result = self._swap_transcriber(whisper_config, hot_swap)
+        # Nova configuração: a política de downgrade recomeça do nível configurado
+        self._load_policy = self._create_load_policy(whisper_config)
+        return result
+
+    def _swap_transcriber(self, whisper_config: Dict[str, Any], hot_swap: bool) -> Dict[str, Any]:
+        """Body of reload_transcriber for an explicit ``whisper`` config."""
+        with self._reload_lock:
+            old = self.transcriber
+            new = None
+
+            if hot_swap and old is not None:
+                if self._hot_swap_memory_ok(old):
+                    try:
+                        new = self._load_transcriber(whisper_config)
+                    except Exception as e:
+                        logger.warning(f"Hot swap failed ({e}), falling back to cold reload")
+                else:
+                    logger.warning("Not enough free memory for two models, using cold reload")
+
+            if new is not None:
+                # Troca atômica: os próximos segmentos já vão para o novo modelo
+                self.transcriber = new
+                self._retire_transcriber(old)
+                logger.info("Whisper model hot-swapped")
+                return {"mode": "hot", "swap_ms": 0.0}
+
+            started = time.monotonic()
+            if old is not None:
+                self.transcriber = None
+                self._release_transcriber(old)
+            self.transcriber = self._load_transcriber(whisper_config)
+            swap_ms = (time.monotonic() - started) * 1000
+            logger.info(f"Whisper model reloaded (cold, {swap_ms:.0f} ms without transcriber)")
+            return {"mode": "cold", "swap_ms": swap_ms}
+
+    def _create_load_policy(self, whisper_config: Dict[str, Any]) -> Optional[DowngradePolicy]:
+        """Automatic downgrade policy (``whisper.auto_downgrade``), or None if disabled."""
+        if not whisper_config.get("auto_downgrade", False):
+            return None
+        policy = DowngradePolicy(
+            model=whisper_config.get("model", "base"),
+            beam_size=whisper_config.get("beam_size", 5),
+            min_model=whisper_config.get("downgrade_min_model", "tiny"),
+            downgrade_rtf=whisper_config.get("downgrade_rtf", 1.0),
+            downgrade_window_seconds=whisper_config.get("downgrade_window_seconds", 10.0),
+            upgrade_rtf=whisper_config.get("upgrade_rtf", 0.5),
+            upgrade_window_seconds=whisper_config.get("upgrade_window_seconds", 60.0),
+        )
+        return policy if len(policy.levels) > 1 else None
+
+    def _check_load_policy(self) -> None:
+        """Step decoding/model down or up when the RTF policy says so (at most once per second)."""
+        policy = self._load_policy
+        transcriber = self.transcriber
+        if policy is None or transcriber is None or self._load_policy_busy:
+            return
+        now = time.monotonic()
+        if now - self._last_policy_check < 1.0:
+            return
+        self._last_policy_check = now
+
+        level = policy.evaluate(transcriber.rtf, now)
+        if level is None:
+            return
+        # Troca de modelo bloqueia: aplicar fora da thread de resultados
+        self._load_policy_busy = True
+        threading.Thread(target=self._apply_load_level, args=(policy, level), daemon=True).start()
+
+    def _apply_load_level(self, policy: DowngradePolicy, level: int) -> None:
+        """Switch to a level of the downgrade ladder."""
+        try:
+            previous, target = policy.overrides, policy.levels[level]
+            rtf = self.transcriber.rtf.summary()
+            direction = "down (falling behind real time)" if level > policy.level else "up (headroom)"
+            logger.warning(
+                f"Transcriber stepping {direction}: RTF 10s={rtf['avg_10s']}, 60s={rtf['avg_60s']} "
+                f"-> level {level} {target or '(configured)'}"
+            )
+
+            if target.get("model") != previous.get("model"):
+                whisper_config = dict(self.config.get("whisper", {}))
+                if "model" in target:
+                    whisper_config["model"] = target["model"]
+                self._swap_transcriber(whisper_config, self.config.get("whisper.hot_swap", True))
+
+            decoding = {k: v for k, v in target.items() if k != "model"}
+            self.transcriber.set_decoding_overrides(decoding or None)
+            policy.level = level
+            self.database.add_event("transcriber_load_level", {"level": level, "overrides": target, "rtf": rtf})
+        except Exception as e:
+            logger.error(f"Failed to change transcriber load level: {e}")
+        finally:
+            self._load_policy_busy = False
+
+    def _load_transcriber(self, whisper_config: Dict[str, Any]):
+        """
+        Create a transcriber ready to serve: model loaded, warmed up
+        (``whisper.warmup``) and started if the analyzer is running.
+        """
+        transcriber = self._create_transcriber(whisper_config)
+        is_pool = hasattr(transcriber, "ready_workers")
+        if not is_pool and whisper_config.get("warmup", True):
+            # Pool: cada worker faz o aquecimento antes de ficar pronto
+            transcriber.warm_up(whisper_config.get("warmup_seconds", 1.0))
+        if not self.is_running and not is_pool:
+            return transcriber
+
+        transcriber.start()
+        if is_pool:
+            # Pool: os modelos carregam nos processos de trabalho
+            timeout = self.config.get("whisper.reload_timeout_seconds", 120.0)
+            deadline = time.monotonic() + timeout
+            while transcriber.ready_workers < transcriber.workers:
+                if not transcriber.is_running or time.monotonic() > deadline:
+                    transcriber.cleanup()
+                    raise RuntimeError("Transcription workers failed to load the model")
+                time.sleep(0.1)
+        return transcriber
+
+    def preload_transcriber(self) -> None:
+        """Load and warm up the configured model in a background thread."""
+        if self.transcriber is not None or (self._preload_thread and self._preload_thread.is_alive()):
+            return
+        self._preload_state = "loading"
+        self._preload_error = None
+        self._preload_thread = threading.Thread(target=self._preload, daemon=True)
+        self._preload_thread.start()
+
+    def _preload(self) -> None:
+        """Background body of preload_transcriber."""
+        started = time.monotonic()
+        try:
+            with self._reload_lock:
+                if self.transcriber is None:
+                    self.transcriber = self._load_transcriber(self.config.get("whisper", {}))
+            self._preload_state = "ready"
+            logger.info(f"Whisper model preloaded in {time.monotonic() - started:.1f}s")
+        except Exception as e:
+            self._preload_state = "failed"
+            self._preload_error = str(e)
+            logger.error(f"Failed to preload Whisper model: {e}")
+
+    def get_readiness(self) -> Dict[str, Any]:
+        """
+        Whether a loaded (and warmed-up) model is ready to transcribe.
+
+        Returns:
+            Dictionary with ready, preload state, model, warmup_ms and error
+        """
+        transcriber = self.transcriber
+        ready = transcriber is not None and getattr(transcriber, "ready_workers", 1) > 0
+        status = transcriber.get_status() if transcriber is not None else {}
+        return {
+            "ready": ready,
+            "preload": self._preload_state,
+            "model": status.get("model"),
+            "backend": status.get("backend"),
+            "warmup_ms": status.get("warmup_ms"),
+            "error": self._preload_error,
+        }
+
+    def _retire_transcriber(self, old) -> None:
+        """Let a replaced transcriber finish its queue, then release it."""
+        if self.is_running and self._result_thread and self._result_thread.is_alive():
+            timeout = self.config.get("whisper.reload_timeout_seconds", 120.0)
+            self._retiring.append((old, time.monotonic() + timeout))
+        else:
+            self._release_transcriber(old)
+
+    @staticmethod
+    def _release_transcriber(transcriber) -> None:
+        """Stop a transcriber and free its model."""
+        try:
+            if hasattr(transcriber, "cleanup"):
+                transcriber.cleanup()
+            elif hasattr(transcriber, "stop"):
+                transcriber.stop()
+        except Exception as e:
+            logger.warning(f"Error releasing transcriber: {e}")
+
+    def _hot_swap_memory_ok(self, old) -> bool:
+        """Check there is room for a second copy of the current model."""
+        model_bytes = old.model_bytes() if hasattr(old, "model_bytes") else 0
+        if not model_bytes:
+            return True  # Tamanho desconhecido: tentar (falha cai no reload a frio)
+
+        # Margem para ativações e para um modelo novo um pouco maior
+        needed = model_bytes * 1.5
+        try:
+            device = getattr(getattr(old, "transcriber", old), "device", "cpu")
+            if device == "cuda":
+                import torch
+                free_bytes, _ = torch.cuda.mem_get_info()
+            else:
+                import psutil
+                free_bytes = psutil.virtual_memory().available
+        except Exception:
+            return True
+        return free_bytes >= needed
+
     def _handle_transcription(self, result: Dict[str, Any]) -> None:
         """
         Handle transcription result.
@@ -406,6 +1183,10 @@ class MicrophoneAnalyzer:
             result: Transcription result from Whisper
         """
         try:
+            # Sai sempre: se o final não tem a keyword, o disparo antecipado é esquecido
+            with self._early_lock:
+                played_early = self._early_triggered.pop(result.get("segment_id"), set())
+
             text = result.get("text", "").strip()
             confidence = result.get("confidence", 0.0)
 
@@ -425,11 +1206,83 @@ class MicrophoneAnalyzer:
                     logger.error(f"Error in transcription callback: {e}")
 
             # Detect keywords
-            self._detect_keywords(text)
+            self._detect_keywords(text, played_early)
 
         except Exception as e:
             logger.error(f"Error handling transcription: {e}")
 
+    def _handle_partial(self, result: Dict[str, Any]) -> None:
+        """
+        Handle a partial (streaming) hypothesis of the utterance in progress.
+
+        Args:
+            result: Transcription result with ``partial`` and ``utterance_id``
+        """
+        try:
+            utterance_id = result.get("utterance_id", 0)
+            if utterance_id < self._utterance_id:
+                return  # O enunciado já foi finalizado
+
+            if utterance_id != self._agreement_utterance:
+                self._agreement.reset()
+                self._agreement_utterance = utterance_id
+
+            new_words, unstable = self._agreement.insert(result.get("text", ""))
+            committed = self._agreement.committed_text
+            unstable_text = " ".join(unstable)
+            data = {
+                "utterance_id": utterance_id,
+                "committed": committed,
+                "new_committed": " ".join(new_words),
+                "unstable": unstable_text,
+                "text": f"{committed} {unstable_text}".strip(),
+            }
+
+            with self._callback_lock:
+                callbacks = list(self._partial_callbacks)
+            for callback in callbacks:
+                try:
+                    callback(data)
+                except Exception as e:
+                    logger.error(f"Error in partial transcription callback: {e}")
+
+        except Exception as e:
+            logger.error(f"Error handling partial transcription: {e}")
+
+    def _handle_early_keyword(self, event: Dict[str, Any]) -> None:
+        """
+        Play a keyword's sound as soon as the decoder has emitted it.
+
+        Called by the transcriber's inference (or collector) thread while a
+        final segment is decoding. A segment can fire the same keyword again
+        (greedy pass then beam fallback, temperature retries); it plays once.
+        The segment's final result still goes through _detect_keywords (and
+        is logged there) without playing the sound a second time.
+
+        Args:
+            event: ``{"early_keyword": keyword_id, "text": text decoded so far, "segment_id": id}``
+        """
+        try:
+            keyword_id = event["early_keyword"]
+            keyword_data = self.config.get_keyword(keyword_id)
+            sound_id = keyword_data.get("sound_id") if keyword_data else None
+            if not sound_id:
+                return
+
+            with self._early_lock:
+                played = self._early_triggered.setdefault(event.get("segment_id"), set())
+                if keyword_id in played:
+                    return
+                played.add(keyword_id)
+                while len(self._early_triggered) > EARLY_KEYWORD_MAX_SEGMENTS:
+                    del self._early_triggered[next(iter(self._early_triggered))]
+
+            self.sound_manager.play_sound(sound_id)
+            self.last_detected_keyword = keyword_id
+            logger.info(f"Keyword detected while decoding: {keyword_id} ({event.get('text', '')!r})")
+        except Exception as e:
+            logger.error(f"Error handling early keyword: {e}")
+
     def _prepare_audio_for_transcription(self, audio_data: np.ndarray, sample_rate: int) -> np.ndarray:
         """Apply auto-gain if enabled in config.
 
@@ -465,12 +1318,13 @@ class MicrophoneAnalyzer:
             logger.debug(f"Autotuning failed: {e}")
             return audio_data
 
-    def _detect_keywords(self, text: str) -> None:
+    def _detect_keywords(self, text: str, played_early: Optional[Set[str]] = None) -> None:
         """
         Detect keywords in text.
 
         Args:
             text: Text to analyze
+            played_early: Keywords whose sound already played while this segment decoded
         """
         try:
             keyword_id, confidence = self.keyword_detector.detect(text)
@@ -500,7 +1354,8 @@ class MicrophoneAnalyzer:
             keyword_data = self.config.get_keyword(keyword_id)
             if keyword_data:
                 sound_id = keyword_data.get("sound_id")
-                if sound_id:
+                # Som já tocado durante a decodificação (_handle_early_keyword)
+                if sound_id and keyword_id not in (played_early or ()):
                     self.sound_manager.play_sound(sound_id)
                     self.last_detected_keyword = keyword_id
 
@@ -539,6 +1394,11 @@ class MicrophoneAnalyzer:
         with self._callback_lock:
             self._transcription_callbacks.append(callback)
 
+    def register_partial_callback(self, callback: Callable) -> None:
+        """Register callback for partial (streaming) transcriptions."""
+        with self._callback_lock:
+            self._partial_callbacks.append(callback)
+
     def register_detection_callback(self, callback: Callable) -> None:
         """Register callback for detections."""
         with self._callback_lock:
@@ -568,6 +1428,23 @@ class MicrophoneAnalyzer:
                 except Exception as e:
                     logger.error(f"Error in status callback: {e}")
 
+    def get_noise_floor(self) -> Dict[str, Any]:
+        """Get the tracked noise floor and the thresholds derived from it."""
+        tracker = self._noise_tracker
+        floor = tracker.noise_floor if tracker else None
+        return {
+            "adaptive": tracker is not None,
+            "ready": floor is not None,
+            "noise_floor": round(floor, 6) if floor is not None else None,
+            "noise_floor_db": round(20 * np.log10(max(floor, 1e-10)), 2) if floor is not None else None,
+            "speech_threshold": round(float(self._speech_threshold), 6),
+            "silence_threshold": (
+                round(float(self.audio_processor.silence_threshold), 6)
+                if self.audio_processor
+                else None
+            ),
+        }
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status."""
         with self._state_lock:
@@ -586,7 +1463,7 @@ class MicrophoneAnalyzer:
                 else:
                     whisper_info = {
                         "whisper_available": True,
-                        "whisper_running": True,
+                        "whisper_running": getattr(self.transcriber, 'is_running', True),
                         "whisper_model": getattr(self.transcriber, 'model_name', 'base'),
                         "whisper_device": getattr(self.transcriber, 'device', 'cpu'),
                         "whisper_language": getattr(self.transcriber, 'language', 'pt'),
@@ -610,6 +1487,22 @@ class MicrophoneAnalyzer:
                     if self.audio_processor
                     else 0
                 ),
+                "transcription_queue_size": (
+                    self.transcriber.get_queue_size()[0]
+                    if self.transcriber and hasattr(self.transcriber, "get_queue_size")
+                    else 0
+                ),
+                "segments": {
+                    key: round(value, 2) if isinstance(value, float) else value
+                    for key, value in self._segment_stats.items()
+                },
+                "vad": dict(self._segmenter.stats) if self._segmenter else {},
+                "noise_floor": self.get_noise_floor(),
+                "audio_capture": (
+                    self.audio_processor.get_capture_stats()
+                    if self.audio_processor and hasattr(self.audio_processor, "get_capture_stats")
+                    else {}
+                ),
                 "timestamp": datetime.now().isoformat(),
                 **whisper_info,
             }
@@ -619,6 +1512,7 @@ class MicrophoneAnalyzer:
         try:
             self.config.load_config()
             self.keyword_detector.update_keywords(self.config.get_keywords())
+            self._refresh_hotwords()
             self.sound_manager.update_sounds_config(self.config.get_sounds())
             logger.info("Configuration reloaded")
         except Exception as e:
@@ -707,6 +1601,8 @@ class MicrophoneAnalyzer:
                 return self.audio_processor.list_devices()
             
             # Caso contrário, criar um temporário só para listar dispositivos
+            from audio.processor import AudioProcessor
+
             temp_processor = AudioProcessor()
             devices = temp_processor.list_devices()
             # Limpar recursos temporários
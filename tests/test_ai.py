@@ -125,6 +125,16 @@ class TestKeywordDetector:
         name = detector.get_keyword_name("nao_existe")
         assert name is None
 
+    def test_near_miss_on_misspelled_keyword(self, detector):
+        """Palavra quase igual a uma keyword é um quase-acerto"""
+        assert detector.near_miss("muito legau") is True
+
+    def test_near_miss_ignores_exact_and_unrelated(self, detector):
+        """Correspondência exata ou texto sem relação não é quase-acerto"""
+        assert detector.near_miss("muito legal mesmo") is False
+        assert detector.near_miss("que dia chuvoso") is False
+        assert detector.near_miss("") is False
+
 
 class TestContextAnalyzer:
     """Testes para analisador de contexto"""
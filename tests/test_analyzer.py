@@ -0,0 +1,526 @@
+"""
+Testes do MicrophoneAnalyzer com transcritores falsos
+"""
+import gc
+import json
+import queue
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from audio.asr_backend import ASRBackend
+from audio.file_source import FileAudioSource
+from audio.pipe_source import PipeAudioSource
+from audio.transcriber import TranscriberThread
+from core.analyzer import MicrophoneAnalyzer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Analyzer com a configuração padrão num diretório temporário"""
+    shutil.copy(REPO_ROOT / "config_default.json", tmp_path)
+    analyzer = MicrophoneAnalyzer(config_dir=str(tmp_path), database_dir=str(tmp_path))
+    yield analyzer
+    analyzer.is_running = False
+
+
+class QueueTranscriber:
+    """Transcritor falso com a fila de saída do TranscriberThread (limitada, descarta o mais antigo)"""
+
+    def __init__(self, busy: bool = False):
+        self.output_queue = queue.Queue(maxsize=10)
+        self.busy = busy
+        self.is_running = True
+        self.released = False
+
+    def emit(self, text: str, **extra) -> None:
+        result = dict(extra, text=text, confidence=1.0)
+        try:
+            self.output_queue.put_nowait(result)
+        except queue.Full:
+            self.output_queue.get_nowait()
+            self.output_queue.put_nowait(result)
+
+    def get_result(self, timeout: float = 1.0):
+        try:
+            return self.output_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def is_idle(self) -> bool:
+        return not self.busy
+
+    def cleanup(self) -> None:
+        self.released = True
+        self.is_running = False
+
+
+class TestHotSwapDrain:
+    """Testes para a drenagem do transcritor substituído no reload"""
+
+    def test_keeps_order_and_loses_nothing(self, analyzer, monkeypatch):
+        """Resultados do modelo novo esperam o antigo terminar, sem estourar a fila"""
+        handled = []
+        monkeypatch.setattr(analyzer, "_handle_transcription", lambda result: handled.append(result["text"]))
+        old, new = QueueTranscriber(busy=True), QueueTranscriber()
+        for i in range(3):
+            old.emit(f"old{i}")
+        analyzer.transcriber = new
+        analyzer._retiring.append((old, time.monotonic() + 60.0))
+
+        # O modelo novo produz mais do que a fila comporta enquanto o antigo termina
+        for i in range(15):
+            new.emit(f"new{i}")
+            analyzer._drain_retiring()
+        old.emit("old3")
+        old.busy = False
+        while analyzer._retiring:
+            analyzer._drain_retiring()
+        while True:
+            result = analyzer._next_result(new, timeout=0)
+            if result is None:
+                break
+            analyzer._handle_transcription(result)
+
+        assert handled == [f"old{i}" for i in range(4)] + [f"new{i}" for i in range(15)]
+        assert old.released and not new.released
+        assert analyzer._held_results == {}
+
+    def test_new_partials_not_held(self, analyzer, monkeypatch):
+        """Parciais do modelo novo seguem na hora (enunciado em andamento)"""
+        partials = []
+        monkeypatch.setattr(analyzer, "_handle_partial", lambda result: partials.append(result["text"]))
+        monkeypatch.setattr(analyzer, "_handle_transcription", lambda result: None)
+        old, new = QueueTranscriber(busy=True), QueueTranscriber()
+        analyzer.transcriber = new
+        analyzer._retiring.append((old, time.monotonic() + 60.0))
+
+        new.emit("par", partial=True, utterance_id=1)
+        analyzer._drain_retiring()
+
+        assert partials == ["par"]
+        assert analyzer._retiring
+
+
+def _write_wav(path, samples, sample_rate=16000):
+    import wave
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+
+def _voiced(seconds, sample_rate=16000, amplitude=0.3):
+    """Sinal harmônico que imita fala vozeada"""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    return amplitude * signal / np.max(np.abs(signal))
+
+
+class TestFileSourceEnd:
+    """Testes para o fim de um arquivo de áudio sem loop"""
+
+    @pytest.mark.parametrize("vad_mode", ["frame", "rms"])
+    def test_pending_utterance_flushed(self, analyzer, monkeypatch, tmp_path, vad_mode):
+        """Fala que vai até o fim do arquivo ainda é enviada para transcrição"""
+        path = tmp_path / "fala.wav"
+        _write_wav(path, np.concatenate([np.zeros(8000), _voiced(2.0)]))
+        analyzer.config.set("audio.vad_mode", vad_mode, persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        analyzer.audio_processor = FileAudioSource(str(path), realtime=False)
+        submitted = []
+        monkeypatch.setattr(analyzer, "_submit_segment", lambda audio, sr, span=None: submitted.append(len(audio)))
+
+        analyzer.is_running = True
+        analyzer.audio_processor.start()
+        thread = threading.Thread(target=analyzer._processing_loop, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10.0
+        while not submitted and time.monotonic() < deadline:
+            time.sleep(0.05)
+        analyzer.is_running = False
+        thread.join(timeout=5.0)
+        analyzer.audio_processor.stop()
+
+        assert len(submitted) == 1
+        assert submitted[0] >= 1.5 * 16000
+
+
+class _PipeStdin:
+    """Substituto de sys.stdin que expõe a ponta de leitura de um os.pipe"""
+
+    def __init__(self, fd):
+        self._fd = fd
+
+    def fileno(self):
+        return self._fd
+
+
+class TestPipeSourceEnd:
+    """Testes para o EOF do stdin na captura via pipe"""
+
+    def test_pending_utterance_flushed(self, analyzer, monkeypatch):
+        """Fala que vai até o EOF do pipe ainda é enviada para transcrição"""
+        import os
+        read_fd, write_fd = os.pipe()
+        monkeypatch.setattr("sys.stdin", _PipeStdin(read_fd))
+        analyzer.config.set("audio.vad_mode", "frame", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        # Tamanho que não fecha um frame: o frame final é parcial
+        samples = np.concatenate([np.zeros(8000), _voiced(1.5)])[:-100]
+        with os.fdopen(write_fd, "wb") as writer:
+            writer.write((samples * 32767).astype(np.int16).tobytes())
+
+        source = PipeAudioSource("-", chunk_size=2048, pcm_format="int16")
+        analyzer.audio_processor = source
+        submitted = []
+        monkeypatch.setattr(analyzer, "_submit_segment", lambda audio, sr, span=None: submitted.append(len(audio)))
+
+        analyzer.is_running = True
+        source.start()
+        thread = threading.Thread(target=analyzer._processing_loop, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 10.0
+        while not submitted and time.monotonic() < deadline:
+            time.sleep(0.05)
+        analyzer.is_running = False
+        thread.join(timeout=5.0)
+        source.stop()
+        os.close(read_fd)
+
+        assert source.is_finished()
+        assert len(submitted) == 1
+        assert submitted[0] >= 1.2 * 16000
+
+
+class LoadedTranscriber:
+    """Transcritor falso já carregado (o que _create_transcriber devolveria)"""
+
+    def __init__(self):
+        self.is_running = False
+
+    def warm_up(self, seconds: float = 1.0) -> None:
+        pass
+
+    def start(self) -> None:
+        self.is_running = True
+
+    def stop(self) -> None:
+        self.is_running = False
+
+    def get_status(self):
+        return {"model": "fake", "backend": "stub", "warmup_ms": 1.0}
+
+
+@pytest.fixture
+def slow_model(analyzer, monkeypatch):
+    """_create_transcriber que só termina quando o teste libera; conta as cargas"""
+    release = threading.Event()
+    loads = []
+
+    def create(whisper_config):
+        loads.append(whisper_config)
+        assert release.wait(10.0), "model load never released"
+        return LoadedTranscriber()
+
+    monkeypatch.setattr(analyzer, "_create_transcriber", create)
+    return release, loads
+
+
+class TestReadiness:
+    """Testes para o pré-carregamento do modelo e /api/ready"""
+
+    def test_ready_endpoint_503_until_loaded(self, analyzer, slow_model):
+        """503 enquanto o modelo carrega no boot, 200 depois"""
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from web.app_fastapi import create_app
+
+        release, loads = slow_model
+        analyzer.config.set("whisper.preload_on_boot", True, persist=False)
+
+        with TestClient(create_app(analyzer)) as client:
+            loading = client.get("/api/ready")
+            release.set()
+            analyzer._preload_thread.join(5.0)
+            ready = client.get("/api/ready")
+
+        assert loading.status_code == 503
+        assert loading.json()["preload"] == "loading"
+        assert ready.status_code == 200
+        assert ready.json()["ready"] and ready.json()["model"] == "fake"
+        assert len(loads) == 1
+
+    def test_failed_preload_reported(self, analyzer, monkeypatch):
+        """Falha na carga fica em get_readiness, sem derrubar o processo"""
+        def fail(whisper_config):
+            raise RuntimeError("no model")
+
+        monkeypatch.setattr(analyzer, "_create_transcriber", fail)
+        analyzer.preload_transcriber()
+        analyzer._preload_thread.join(5.0)
+
+        readiness = analyzer.get_readiness()
+        assert not readiness["ready"]
+        assert readiness["preload"] == "failed" and readiness["error"] == "no model"
+
+    def test_start_waits_for_preload(self, analyzer, slow_model, monkeypatch):
+        """start() durante o pré-carregamento espera e reutiliza o mesmo modelo"""
+        release, loads = slow_model
+        for loop in ("_processing_loop", "_result_loop", "_event_loop"):
+            monkeypatch.setattr(analyzer, loop, lambda: None)
+        analyzer.audio_processor = type("Source", (), {"is_recording": True, "stop": lambda self: None})()
+
+        analyzer.preload_transcriber()
+        starter = threading.Thread(target=analyzer.start, daemon=True)
+        starter.start()
+        starter.join(0.3)
+        assert starter.is_alive()  # Ainda aguardando o pré-carregamento
+
+        release.set()
+        starter.join(5.0)
+
+        assert not starter.is_alive()
+        assert len(loads) == 1
+        assert analyzer.transcriber.is_running
+        assert analyzer.get_readiness()["ready"]
+
+
+class TestReloadRoute:
+    """Testes para POST /api/whisper/reload"""
+
+    def _post(self, analyzer, payload):
+        pytest.importorskip("fastapi")
+        from fastapi.testclient import TestClient
+        from web.app_fastapi import create_app
+
+        with TestClient(create_app(analyzer)) as client:
+            return client.post("/api/whisper/reload", json=payload)
+
+    def test_failed_reload_keeps_config(self, analyzer, monkeypatch):
+        """Modelo que não carrega não fica salvo na configuração"""
+        def fail(hot_swap=None):
+            raise RuntimeError("no model")
+
+        monkeypatch.setattr(analyzer, "reload_transcriber", fail)
+        model = analyzer.config.get("whisper.model")
+
+        response = self._post(analyzer, {"model": "small" if model != "small" else "tiny"})
+
+        assert response.status_code == 500
+        assert analyzer.config.get("whisper.model") == model
+        assert not analyzer.config.user_config_path.exists()
+
+    def test_successful_reload_saves_config(self, analyzer, monkeypatch):
+        """Depois da carga o novo modelo é persistido"""
+        loaded = []
+
+        def reload(hot_swap=None):
+            loaded.append(analyzer.config.get("whisper.model"))
+            return {"mode": "hot", "swap_ms": 0.0}
+
+        monkeypatch.setattr(analyzer, "reload_transcriber", reload)
+
+        response = self._post(analyzer, {"model": "tiny"})
+
+        assert response.status_code == 200
+        assert loaded == ["tiny"]
+        saved = json.loads(analyzer.config.user_config_path.read_text(encoding="utf-8"))
+        assert saved["whisper"]["model"] == "tiny"
+
+
+class SlowBackend(ASRBackend):
+    """Backend falso que demora em cada segmento e registra quando termina"""
+
+    name = "slow"
+    seconds = 0.5
+
+    def __init__(self, model_name: str = "slow"):
+        self.model = object()
+        self.finished = []
+
+    def load(self) -> None:
+        pass
+
+    def transcribe(self, audio_data, sample_rate=16000, options=None):
+        time.sleep(self.seconds)
+        self.finished.append(time.monotonic())
+        return {"text": f"seg{len(self.finished)}", "confidence": 1.0, "language": "pt", "segments": []}
+
+    def unload(self) -> bool:
+        self.model = None
+        return True
+
+
+class TestResultLoop:
+    """Testes para o consumo de resultados em paralelo à segmentação"""
+
+    def test_segmentation_continues_while_transcriber_busy(self, analyzer, monkeypatch, tmp_path):
+        """Transcrição lenta não segura a captura; todos os resultados chegam ao handler"""
+        path = tmp_path / "falas.wav"
+        pause = np.zeros(16000)
+        _write_wav(path, np.concatenate([pause, _voiced(1.0), pause, _voiced(1.0), pause, _voiced(1.0), pause]))
+        analyzer.config.set("audio.vad_mode", "frame", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        analyzer.audio_processor = FileAudioSource(str(path), realtime=False)
+        analyzer.transcriber = TranscriberThread(backend=SlowBackend, batch_size=1)
+        backend = analyzer.transcriber.transcriber
+        submitted, handled = [], []
+        submit = analyzer._submit_segment
+
+        def record_submit(audio, sr, span=None):
+            submitted.append(time.monotonic())
+            submit(audio, sr, span)
+
+        monkeypatch.setattr(analyzer, "_submit_segment", record_submit)
+        monkeypatch.setattr(analyzer, "_handle_transcription", lambda result: handled.append(result["text"]))
+
+        analyzer.is_running = True
+        analyzer.transcriber.start()
+        analyzer.audio_processor.start()
+        threads = [threading.Thread(target=loop, daemon=True) for loop in (analyzer._processing_loop, analyzer._result_loop)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 15.0
+        while len(handled) < 3 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        analyzer.is_running = False
+        for thread in threads:
+            thread.join(timeout=5.0)
+        analyzer.audio_processor.stop()
+        # Liberar já: o __del__ do TranscriberThread loga, e rodando no meio de uma
+        # escrita do banco (coleta de lixo em outro teste) trava o lock do DatabaseManager
+        analyzer.transcriber.cleanup()
+        analyzer.transcriber = None
+        gc.collect()
+
+        assert len(submitted) == 3
+        # Os três segmentos foram entregues antes de o primeiro terminar de transcrever
+        assert submitted[-1] < backend.finished[0]
+        assert handled == ["seg1", "seg2", "seg3"]
+
+
+class ChunkSource:
+    """Fonte de áudio falsa: entrega chunks prontos e avisa quando todos foram consumidos"""
+
+    is_recording = True
+    silence_threshold = 0.02
+
+    def __init__(self, audio, chunk_size=2048):
+        self.chunks = [audio[i:i + chunk_size].astype(np.float32) for i in range(0, len(audio), chunk_size)]
+        self.consumed = threading.Event()
+
+    def get_chunk(self, timeout=0.5):
+        if self.chunks:
+            return self.chunks.pop(0)
+        # Pedido depois do último chunk: o loop já processou tudo
+        self.consumed.set()
+        time.sleep(0.01)
+        return None
+
+    def is_finished(self) -> bool:
+        return not self.chunks
+
+    def get_queue_size(self) -> int:
+        return len(self.chunks)
+
+
+def _run_processing(analyzer, source, monkeypatch):
+    """Roda _processing_loop sobre a fonte até o fim; devolve os tamanhos enviados"""
+    submitted = []
+    monkeypatch.setattr(analyzer, "_submit_segment", lambda audio, sr, span=None: submitted.append(len(audio)))
+    analyzer.audio_processor = source
+    analyzer.is_running = True
+    thread = threading.Thread(target=analyzer._processing_loop, daemon=True)
+    thread.start()
+    assert source.consumed.wait(10.0)
+    analyzer.is_running = False
+    thread.join(timeout=5.0)
+    return submitted
+
+
+def _noise(seconds, amplitude=0.001):
+    return np.random.default_rng(0).standard_normal(int(seconds * 16000)) * amplitude
+
+
+class TestSilentSegments:
+    """Testes para o descarte de áudio sem fala (audio.skip_silent_segments)"""
+
+    def test_rms_mode_skips_silent_buffers(self, analyzer, monkeypatch):
+        """Modo rms: buffers cheios sem fala não vão ao Whisper e são contados"""
+        analyzer.config.set("audio.vad_mode", "rms", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        analyzer.config.set("audio.max_duration_seconds", 2.0, persist=False)
+
+        submitted = _run_processing(analyzer, ChunkSource(_noise(7.0)), monkeypatch)
+
+        stats = analyzer._segment_stats
+        assert submitted == []
+        assert stats["silent_skipped"] == 3
+        assert stats["silent_seconds_skipped"] >= 3 * (2.0 - 0.3)
+
+    def test_rms_mode_gate_can_be_disabled(self, analyzer, monkeypatch):
+        """Com skip_silent_segments desligado o buffer cheio é enviado mesmo sem fala"""
+        analyzer.config.set("audio.vad_mode", "rms", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        analyzer.config.set("audio.max_duration_seconds", 2.0, persist=False)
+        analyzer.config.set("audio.skip_silent_segments", False, persist=False)
+
+        submitted = _run_processing(analyzer, ChunkSource(_noise(5.0)), monkeypatch)
+
+        assert len(submitted) == 2
+        assert analyzer._segment_stats["silent_skipped"] == 0
+
+    def test_frame_mode_counts_dropped_silence(self, analyzer, monkeypatch):
+        """Modo frame: o silêncio e o burst curto descartados pelo segmentador aparecem no status"""
+        analyzer.config.set("audio.vad_mode", "frame", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        audio = np.concatenate([_noise(4.0), _voiced(0.06), _noise(2.0)])
+
+        submitted = _run_processing(analyzer, ChunkSource(audio), monkeypatch)
+
+        segments = analyzer.get_status()["segments"]
+        assert submitted == []
+        assert segments["silent_skipped"] == 1
+        assert segments["silent_seconds_skipped"] >= 5.0
+
+
+class TestRmsSpansOnHopGrid:
+    """Testes para os spans do modo rms com o frontend log-mel ligado"""
+
+    def test_segments_start_on_hop_and_get_features(self, analyzer, monkeypatch):
+        """Com chunks de 2048 amostras os segmentos ainda começam em múltiplos de 160"""
+        pytest.importorskip("whisper")
+        from audio.mel_frontend import HOP_LENGTH, LogMelFrontend
+
+        analyzer.config.set("audio.vad_mode", "rms", persist=False)
+        analyzer.config.set("audio.adaptive_threshold", False, persist=False)
+        analyzer.config.set("audio.max_duration_seconds", 2.0, persist=False)
+        frontend = LogMelFrontend()
+        monkeypatch.setattr(analyzer, "_create_mel_frontend", lambda sample_rate: frontend)
+        pause = _noise(1.5)
+        audio = np.concatenate([pause, _voiced(1.0), pause, _voiced(0.7), _noise(3.0), _voiced(1.0), pause])
+        spans = []
+        source = ChunkSource(audio)
+        monkeypatch.setattr(
+            analyzer, "_submit_segment",
+            lambda segment, sr, span=None: spans.append((span, frontend.features(span, segment))),
+        )
+        analyzer.audio_processor = source
+        analyzer.is_running = True
+        thread = threading.Thread(target=analyzer._processing_loop, daemon=True)
+        thread.start()
+        assert source.consumed.wait(10.0)
+        analyzer.is_running = False
+        thread.join(timeout=5.0)
+
+        assert len(spans) >= 3
+        assert all(span[0] % HOP_LENGTH == 0 for span, _ in spans)
+        assert all(features is not None for _, features in spans)
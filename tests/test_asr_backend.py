@@ -0,0 +1,123 @@
+"""
+Testes unitários para a seleção de backends de ASR
+"""
+import numpy as np
+import pytest
+
+from audio.asr_backend import ASRBackend, CTranslate2Backend, create_backend
+from utils.exceptions import WhisperException
+
+
+class TestCreateBackend:
+    """Testes para a fábrica de backends"""
+
+    def test_unknown_backend(self):
+        """Backend desconhecido gera WhisperException"""
+        with pytest.raises(WhisperException):
+            create_backend("nao-existe")
+
+    def test_ctranslate2_without_dependency(self, monkeypatch):
+        """Sem faster-whisper instalado, o erro é claro"""
+        import sys
+        monkeypatch.setitem(sys.modules, "faster_whisper", None)
+        with pytest.raises(WhisperException, match="faster-whisper"):
+            create_backend("ctranslate2")
+
+    def test_ctranslate2_missing_model_dir(self, tmp_path, monkeypatch):
+        """Diretório de modelo inexistente gera WhisperException"""
+        pytest.importorskip("faster_whisper")
+        with pytest.raises(WhisperException):
+            create_backend("ctranslate2", model_path=str(tmp_path / "nao-existe"))
+
+    def test_unsupported_settings_are_ignored(self, monkeypatch):
+        """Configurações específicas de outro backend são ignoradas"""
+        monkeypatch.setattr(CTranslate2Backend, "load", lambda self: None)
+        backend = create_backend(
+            "ctranslate2", model_name="tiny", compute_type="int8", encoder_mode="latency", fp16=True
+        )
+
+        assert isinstance(backend, ASRBackend)
+        assert backend.get_status()["backend"] == "ctranslate2"
+        assert backend.get_status()["compute_type"] == "int8"
+        assert backend.get_status()["loaded"] is False
+
+
+class TestBackendInterface:
+    """Testes para a interface abstrata ASRBackend"""
+
+    def test_base_is_abstract(self):
+        """A interface não pode ser instanciada"""
+        with pytest.raises(TypeError):
+            ASRBackend()
+
+    def test_incomplete_backend_rejected(self):
+        """Backend sem unload falha na criação, não no meio de um reload"""
+        class Incomplete(ASRBackend):
+            def load(self):
+                pass
+
+            def transcribe(self, audio_data, sample_rate=16000, options=None):
+                return {}
+
+        with pytest.raises(TypeError, match="unload"):
+            Incomplete()
+
+    def test_ctranslate2_implements_interface(self):
+        """CTranslate2Backend implementa todos os métodos abstratos"""
+        assert not CTranslate2Backend.__abstractmethods__
+
+
+class FakeSegment:
+    start, end, text = 0.0, 1.0, " olá mundo"
+    avg_logprob, no_speech_prob, compression_ratio = -0.2, 0.01, 1.1
+
+
+class FakeInfo:
+    language = "pt"
+
+
+class TestCTranslate2Backend:
+    """Testes do CTranslate2Backend com o faster-whisper instalado (modelo falso)"""
+
+    @pytest.fixture
+    def model_class(self, monkeypatch):
+        faster_whisper = pytest.importorskip("faster_whisper")
+        calls = []
+
+        class FakeWhisperModel:
+            def __init__(self, source, **kwargs):
+                calls.append(("init", source, kwargs))
+
+            def transcribe(self, audio, **kwargs):
+                calls.append(("transcribe", audio, kwargs))
+                return iter([FakeSegment()]), FakeInfo()
+
+        monkeypatch.setattr(faster_whisper, "WhisperModel", FakeWhisperModel)
+        return calls
+
+    def test_transcribe_result_format(self, model_class, tmp_path):
+        """Carrega do diretório local e devolve o mesmo formato do Transcriber"""
+        backend = create_backend("ctranslate2", model_path=str(tmp_path), beam_size=None, best_of=None)
+
+        result = backend.transcribe(np.zeros(8000, dtype=np.float32), 8000)
+
+        (_, source, init), (_, audio, options) = model_class
+        assert source == str(tmp_path) and init["local_files_only"]
+        assert len(audio) == 16000 and audio.dtype == np.float32
+        assert options["beam_size"] == 1 and options["best_of"] == 1  # Busca gulosa
+        assert result["text"] == "olá mundo"
+        assert result["language"] == "pt"
+        assert result["segments"][0]["avg_logprob"] == -0.2
+        assert 0.0 <= result["confidence"] <= 1.0
+
+    def test_unload_and_reload(self, model_class, tmp_path):
+        """unload libera o modelo; reload carrega de novo"""
+        backend = create_backend("ctranslate2", model_path=str(tmp_path))
+
+        assert backend.unload() and backend.model is None
+        assert backend.reload() and backend.model is not None
+        assert [call[0] for call in model_class] == ["init", "init"]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -9,8 +9,13 @@ from audio.audio_utils import (
     detect_silence,
     get_audio_energy,
     apply_gain,
-    resample_audio
+    resample_audio,
+    StreamResampler,
 )
+from audio.ring_buffer import AudioRingBuffer
+from audio.segment_buffer import SampleAccumulator
+from audio.file_source import FileAudioSource
+from audio.pipe_source import PipeAudioSource
 
 
 class TestAudioNormalization:
@@ -155,6 +160,25 @@ class TestResampling:
         # Deve ter o dobro das amostras
         assert len(resampled) == len(audio) * 2
 
+    def test_stream_resampler_matches_whole_stream(self):
+        """Em chunks, o resultado é o da interpolação do stream inteiro (sem deriva)"""
+        audio = np.sin(2 * np.pi * 440 * np.arange(44100 * 2) / 44100).astype(np.float32)
+        resampler = StreamResampler(44100, 16000)
+        chunks = [resampler.process(audio[i:i + 2048]) for i in range(0, len(audio), 2048)]
+        resampled = np.concatenate(chunks)
+
+        expected = np.interp(np.arange(len(resampled)) * 44100 / 16000, np.arange(len(audio)), audio)
+        assert len(resampled) == 32000
+        assert np.allclose(resampled, expected, atol=1e-6)
+
+    def test_stream_resampler_odd_chunks(self):
+        """Chunks de tamanhos irregulares (inclusive de uma amostra) mantêm a continuidade"""
+        resampler = StreamResampler(8000, 16000)
+        ramp = np.arange(10, dtype=np.float32)
+        out = np.concatenate([resampler.process(ramp[:3]), resampler.process(ramp[3:4]), resampler.process(ramp[4:])])
+
+        assert np.allclose(out, np.arange(19) / 2)
+
 
 class TestAudioIntegration:
     """Testes de integração entre funções"""
@@ -179,5 +203,193 @@ class TestAudioIntegration:
         assert energy < 1e-10
 
 
+class TestAudioRingBuffer:
+    """Testes para o ring buffer de captura (modo callback)"""
+
+    def test_write_then_read_returns_view(self):
+        """Leitura retorna view contígua com os dados escritos"""
+        ring = AudioRingBuffer(capacity=8)
+        ring.write(np.arange(5, dtype=np.float32))
+
+        view = ring.read(5, timeout=0.1)
+        assert np.array_equal(view, np.arange(5, dtype=np.float32))
+        assert view.base is not None  # view, não cópia
+
+    def test_read_across_wrap_is_contiguous(self):
+        """Janela que cruza o fim do buffer continua contígua"""
+        ring = AudioRingBuffer(capacity=8)
+        ring.write(np.zeros(6, dtype=np.float32))
+        ring.read(6, timeout=0.1)
+        ring.write(np.arange(6, dtype=np.float32))
+
+        view = ring.read(6, timeout=0.1)
+        assert np.array_equal(view, np.arange(6, dtype=np.float32))
+
+    def test_read_timeout_returns_none(self):
+        """Sem dados suficientes, retorna None após timeout"""
+        ring = AudioRingBuffer(capacity=8)
+        ring.write(np.ones(2, dtype=np.float32))
+        assert ring.read(4, timeout=0.01) is None
+
+    def test_overrun_drops_oldest(self):
+        """Produtor mais rápido que consumidor descarta as amostras mais antigas"""
+        ring = AudioRingBuffer(capacity=8)
+        ring.write(np.arange(12, dtype=np.float32))
+
+        view = ring.read(8, timeout=0.1)
+        assert np.array_equal(view, np.arange(4, 12, dtype=np.float32))
+        assert ring.overrun_count == 1
+        assert ring.dropped_samples == 4
+
+    def test_peek_latest_does_not_consume(self):
+        """peek_latest retorna as últimas amostras sem avançar o cursor"""
+        ring = AudioRingBuffer(capacity=8)
+        ring.write(np.arange(10, dtype=np.float32))
+
+        assert np.array_equal(ring.peek_latest(3), np.array([7, 8, 9], dtype=np.float32))
+        assert ring.available() == 8
+
+
+class TestSampleAccumulator:
+    """Testes para o acumulador de segmentos do VAD"""
+
+    def test_append_tracks_length(self):
+        """Comprimento acompanha os chunks adicionados"""
+        acc = SampleAccumulator(initial_capacity=8)
+        acc.append(np.ones(3, dtype=np.float32))
+        acc.append(np.ones(2, dtype=np.float32))
+        assert len(acc) == 5
+
+    def test_grows_preserving_data(self):
+        """Crescimento além da capacidade preserva os dados"""
+        acc = SampleAccumulator(initial_capacity=4)
+        acc.append(np.arange(3, dtype=np.float32))
+        acc.append(np.arange(3, 10, dtype=np.float32))
+
+        assert acc.capacity >= 10
+        assert np.array_equal(acc.view(), np.arange(10, dtype=np.float32))
+
+    def test_detach_hands_out_segment_and_resets(self):
+        """detach entrega o segmento e o próximo não o sobrescreve"""
+        acc = SampleAccumulator(initial_capacity=8)
+        acc.append(np.arange(4, dtype=np.float32))
+        segment = acc.detach()
+
+        assert len(acc) == 0
+        acc.append(np.full(4, 9.0, dtype=np.float32))
+        assert np.array_equal(segment, np.arange(4, dtype=np.float32))
+
+    def test_keep_tail_compacts_buffer(self):
+        """keep_tail mantém só as amostras mais recentes"""
+        acc = SampleAccumulator(initial_capacity=16)
+        acc.append(np.arange(10, dtype=np.float32))
+        acc.keep_tail(3)
+
+        assert np.array_equal(acc.view(), np.array([7, 8, 9], dtype=np.float32))
+
+
+class TestFileAudioSource:
+    """Testes para a fonte de áudio a partir de arquivo"""
+
+    @staticmethod
+    def _write_wav(path, samples, sample_rate=16000):
+        import wave
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes((samples * 32767).astype(np.int16).tobytes())
+
+    @staticmethod
+    def _drain(source, timeout=0.5):
+        chunks = []
+        while True:
+            chunk = source.get_chunk(timeout=timeout)
+            if chunk is None:
+                break
+            chunks.append(chunk)
+            if source.is_finished():
+                break
+        return chunks
+
+    def test_wav_fast_mode_emits_all_samples(self, tmp_path):
+        """Modo rápido entrega todas as amostras do WAV em chunks fixos"""
+        path = tmp_path / "speech.wav"
+        self._write_wav(path, np.sin(np.arange(5000) / 10.0) * 0.5)
+
+        source = FileAudioSource(str(path), chunk_size=1024, realtime=False)
+        source.start()
+        chunks = self._drain(source)
+        source.stop()
+
+        assert sum(len(c) for c in chunks) == 5000
+        assert all(len(c) == 1024 for c in chunks[:-1])
+        assert chunks[0].dtype == np.float32
+        assert source.get_capture_stats()["audio_seconds"] == round(5000 / 16000, 2)
+
+    def test_wav_resampled_without_drift(self, tmp_path):
+        """WAV a 44.1 kHz sai a 16 kHz com a duração do arquivo"""
+        path = tmp_path / "speech44.wav"
+        self._write_wav(path, np.sin(np.arange(44100) / 10.0) * 0.5, sample_rate=44100)
+
+        source = FileAudioSource(str(path), chunk_size=1000, realtime=False)
+        source.start()
+        chunks = self._drain(source)
+        source.stop()
+
+        assert abs(sum(len(c) for c in chunks) - 16000) <= 1
+
+    def test_raw_pcm_int16(self, tmp_path):
+        """PCM bruto int16 é convertido para float32 em [-1, 1]"""
+        path = tmp_path / "stream.pcm"
+        (np.full(2048, 16384, dtype=np.int16)).tofile(path)
+
+        source = FileAudioSource(str(path), chunk_size=2048, realtime=False, pcm_format="int16")
+        source.start()
+        chunk = source.get_chunk(timeout=2.0)
+        source.stop()
+
+        assert np.allclose(chunk, 0.5)
+
+    def test_missing_file_raises(self, tmp_path):
+        """Arquivo inexistente gera AudioDeviceException"""
+        from utils.exceptions import AudioDeviceException
+        with pytest.raises(AudioDeviceException):
+            FileAudioSource(str(tmp_path / "missing.wav"))
+
+
+@pytest.mark.skipif(not hasattr(__import__("os"), "mkfifo"), reason="Requer FIFO POSIX")
+class TestPipeAudioSource:
+    """Testes para a captura via FIFO (servidores headless)"""
+
+    def test_reads_frames_from_fifo(self, tmp_path):
+        """Frames int16 escritos no FIFO chegam como float32"""
+        import os
+        fifo = tmp_path / "audio.fifo"
+        os.mkfifo(fifo)
+
+        source = PipeAudioSource(str(fifo), chunk_size=256, pcm_format="int16")
+        source.start()
+        try:
+            with open(fifo, "wb") as writer:
+                writer.write(np.full(512, -16384, dtype=np.int16).tobytes())
+
+            first = source.get_chunk(timeout=2.0)
+            second = source.get_chunk_view(timeout=2.0)
+        finally:
+            source.stop()
+
+        assert len(first) == 256
+        assert np.allclose(first, -0.5)
+        assert np.allclose(second, -0.5)
+        assert source.get_capture_stats()["frames_read"] == 2
+
+    def test_missing_pipe_raises(self, tmp_path):
+        """FIFO inexistente gera AudioDeviceException"""
+        from utils.exceptions import AudioDeviceException
+        with pytest.raises(AudioDeviceException):
+            PipeAudioSource(str(tmp_path / "missing.fifo"))
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,72 @@
+"""
+Testes unitários para threads do torch e afinidade de CPU
+"""
+import os
+
+import pytest
+
+from audio.cpu_tuning import apply_cpu_affinity, apply_torch_threads, cpu_affinity_scope, parse_cpu_list
+
+
+class TestParseCpuList:
+    """Testes para a leitura de whisper.cpu_affinity"""
+
+    @pytest.mark.parametrize("spec, expected", [
+        ("2-4,7", [2, 3, 4, 7]),
+        ("0", [0]),
+        (" 3, 1 ", [1, 3]),
+        ([5, 4, 4], [4, 5]),
+    ])
+    def test_valid_specs(self, spec, expected):
+        """Intervalos, listas e espaços"""
+        assert parse_cpu_list(spec) == expected
+
+    @pytest.mark.parametrize("spec", [None, "", []])
+    def test_empty_means_no_affinity(self, spec):
+        """Vazio = sem afinidade"""
+        assert parse_cpu_list(spec) is None
+
+    def test_invalid_spec(self):
+        """Texto inválido gera erro"""
+        with pytest.raises(ValueError):
+            parse_cpu_list("a-b")
+
+
+class TestApply:
+    """Testes para aplicar threads e afinidade"""
+
+    def test_torch_threads(self):
+        """num_threads é aplicado e relatado"""
+        import torch
+        previous = torch.get_num_threads()
+        try:
+            info = apply_torch_threads(num_threads=1)
+            assert info["num_threads"] == 1
+        finally:
+            torch.set_num_threads(previous)
+
+    def test_zero_keeps_defaults(self):
+        """0 mantém o padrão do torch"""
+        import torch
+        assert apply_torch_threads()["num_threads"] == torch.get_num_threads()
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+    def test_affinity_ignores_unavailable_cpus(self):
+        """CPUs inexistentes são ignoradas sem erro"""
+        assert apply_cpu_affinity([100000]) is None
+        assert apply_cpu_affinity(None) is None
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+    def test_affinity_scope_restores_previous(self):
+        """O bloco roda fixado e a afinidade anterior volta ao sair"""
+        previous = os.sched_getaffinity(0)
+        cpu = min(previous)
+        with cpu_affinity_scope([cpu]) as applied:
+            assert applied == [cpu]
+            assert os.sched_getaffinity(0) == {cpu}
+        assert os.sched_getaffinity(0) == previous
+
+    def test_affinity_scope_without_affinity(self):
+        """Sem afinidade configurada o bloco roda sem alterar nada"""
+        with cpu_affinity_scope(None) as applied:
+            assert applied is None
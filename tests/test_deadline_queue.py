@@ -0,0 +1,79 @@
+"""
+Testes unitários para o prazo (SLO de latência) da fila de transcrição
+"""
+import queue
+import time
+from collections import deque
+
+import numpy as np
+
+from audio.transcriber import TranscriberThread
+
+SR = 16000
+
+
+def _thread(slo=10.0, max_merge=25.0):
+    """TranscriberThread só com o estado da fila (sem modelo)"""
+    thread = object.__new__(TranscriberThread)
+    thread.is_running = False
+    thread.input_queue = queue.Queue()
+    thread.latency_slo_seconds = slo
+    thread.max_merge_seconds = max_merge
+    thread.skipped_segments = 0
+    thread.skipped_seconds = 0.0
+    thread.merged_segments = 0
+    thread.recent_skips = deque(maxlen=50)
+    return thread
+
+
+def _segment(seconds, age):
+    """Item da fila capturado há ``age`` segundos"""
+    return (np.ones(int(seconds * SR), dtype=np.float32), SR, time.monotonic() - age)
+
+
+class TestDeadlineSchedule:
+    """Testes para descarte e união de segmentos atrasados"""
+
+    def test_on_time_segments_unchanged(self):
+        """Fila em dia: segmentos passam sem alteração"""
+        thread = _thread()
+        batch = thread._schedule([_segment(1.0, 0.5), _segment(2.0, 0.1)])
+
+        assert [len(audio) for audio, _ in batch] == [SR, 2 * SR]
+        assert thread.skipped_segments == 0
+
+    def test_stale_segment_is_skipped_and_recorded(self):
+        """Segmento além do prazo é descartado e registrado"""
+        thread = _thread(slo=5.0)
+        batch = thread._schedule([_segment(1.5, 8.0), _segment(1.0, 0.1)])
+
+        assert len(batch) == 1
+        assert thread.skipped_segments == 1
+        assert thread.skipped_seconds == 1.5
+        assert thread.recent_skips[0]["duration"] == 1.5
+
+    def test_behind_merges_adjacent_segments(self):
+        """Com a fila atrasada, vizinhos viram uma só decodificação"""
+        thread = _thread(slo=10.0)
+        thread.input_queue.put(_segment(1.0, 0.0))
+        batch = thread._schedule([_segment(1.0, 2.0), _segment(1.0, 1.0)])
+
+        assert len(batch) == 1
+        assert len(batch[0][0]) == 2 * SR + int(0.2 * SR)
+        assert thread.merged_segments == 1
+
+    def test_merge_respects_max_length(self):
+        """A união para em max_merge_seconds"""
+        thread = _thread(slo=10.0, max_merge=3.0)
+        batch = thread._schedule([_segment(2.0, 6.0), _segment(2.0, 5.5)])
+
+        assert len(batch) == 2
+        assert thread.merged_segments == 0
+
+    def test_disabled_slo(self):
+        """SLO 0 desliga descarte e união"""
+        thread = _thread(slo=0.0)
+        batch = thread._schedule([_segment(1.0, 100.0)])
+
+        assert len(batch) == 1
+        assert thread.skipped_segments == 0
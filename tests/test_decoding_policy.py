@@ -0,0 +1,88 @@
+"""
+Testes unitários para a política de decodificação gulosa primeiro (greedy_first)
+"""
+import numpy as np
+import pytest
+
+from audio.asr_backend import ASRBackend
+from audio.transcriber import GREEDY_DECODE_OPTIONS, GreedyFirstDecoder
+
+
+class FakeBackend(ASRBackend):
+    """Backend falso: resultado guloso configurável, feixe marca o texto"""
+
+    def __init__(self, greedy_result, beam_size=5):
+        self.beam_size = beam_size
+        self.greedy_result = greedy_result
+        self.calls = []
+
+    def load(self) -> None:
+        pass
+
+    def unload(self) -> bool:
+        return True
+
+    def transcribe(self, audio_data, sample_rate=16000, options=None):
+        self.calls.append(options)
+        if options == GREEDY_DECODE_OPTIONS:
+            return dict(self.greedy_result)
+        return {"text": "feixe", "segments": []}
+
+
+def _result(text="olá", avg_logprob=-0.1, compression_ratio=1.2):
+    """Resultado com um segmento"""
+    return {
+        "text": text,
+        "segments": [{"avg_logprob": avg_logprob, "compression_ratio": compression_ratio}],
+    }
+
+
+ITEMS = [(np.zeros(16000, dtype=np.float32), 16000)]
+
+
+class TestGreedyFirstDecoder:
+    """Testes para o fallback para busca em feixe"""
+
+    def test_confident_greedy_is_kept(self):
+        """Resultado guloso confiável não é decodificado de novo"""
+        backend = FakeBackend(_result())
+        result = GreedyFirstDecoder().transcribe(backend, ITEMS)[0]
+
+        assert result["text"] == "olá"
+        assert result["decoding"] == "greedy"
+        assert backend.calls == [GREEDY_DECODE_OPTIONS]
+
+    @pytest.mark.parametrize("greedy, reason", [
+        (_result(avg_logprob=-0.9), "logprob"),
+        (_result(compression_ratio=2.6), "compression"),
+    ])
+    def test_uncertain_greedy_falls_back_to_beam(self, greedy, reason):
+        """Log-prob baixo ou repetição refazem com busca em feixe"""
+        backend = FakeBackend(greedy)
+        result = GreedyFirstDecoder().transcribe(backend, ITEMS)[0]
+
+        assert result["text"] == "feixe"
+        assert result["decoding"] == f"beam:{reason}"
+
+    def test_keyword_near_miss_falls_back(self):
+        """uncertainty_check (quase-acerto de keyword) força a busca em feixe"""
+        decoder = GreedyFirstDecoder(uncertainty_check=lambda text: "legau" in text)
+        result = decoder.transcribe(FakeBackend(_result("muito legau")), ITEMS)[0]
+
+        assert result["decoding"] == "beam:keyword"
+
+    def test_silence_is_not_redecoded(self):
+        """Texto vazio não justifica a busca em feixe"""
+        backend = FakeBackend(_result("", avg_logprob=-2.0))
+        result = GreedyFirstDecoder().transcribe(backend, ITEMS)[0]
+
+        assert result["decoding"] == "greedy"
+        assert len(backend.calls) == 1
+
+    def test_already_greedy_backend_single_pass(self):
+        """Com beam_size desligado (ex.: downgrade) decodifica uma vez só"""
+        backend = FakeBackend(_result(), beam_size=None)
+        result = GreedyFirstDecoder().transcribe(backend, ITEMS)[0]
+
+        assert result["decoding"] == "greedy"
+        assert backend.calls == [None]
@@ -0,0 +1,231 @@
+"""
+Testes unitários para o disparo antecipado de keywords durante a decodificação
+"""
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from audio.asr_backend import ASRBackend
+from audio.early_trigger import EarlyKeywordMatcher, EarlyKeywordTrigger
+
+KEYWORDS = [
+    {"id": "kw_sus", "pattern": "sus", "variations": ["suspeito"], "enabled": True},
+    {"id": "kw_off", "pattern": "cringe", "variations": [], "enabled": False},
+]
+
+PROMPT = [1000, 1001]  # tokens antes de sample_begin
+
+
+class FakeTokenizer:
+    """Tokenizador falso: um token por caractere (ord); eot = 1000"""
+
+    eot = 1000
+
+    def decode(self, tokens):
+        return "".join(chr(t) for t in tokens)
+
+
+def _tokens(*texts):
+    """Tensor (n_batch, length) com o prompt seguido de cada texto"""
+    width = max(len(t) for t in texts)
+    rows = [PROMPT + [ord(c) for c in t.ljust(width)] for t in texts]
+    return torch.tensor(rows)
+
+
+def _trigger(n_group=1):
+    fired = []
+    trigger = EarlyKeywordTrigger(
+        EarlyKeywordMatcher(KEYWORDS), FakeTokenizer(), len(PROMPT), n_group,
+        lambda item, keyword_id, text: fired.append((item, keyword_id, text)),
+    )
+    return trigger, fired
+
+
+class TestEarlyKeywordMatcher:
+    """Testes para o casamento sobre o texto parcial"""
+
+    def test_confirmed_word_matches(self):
+        """Palavra seguida de outro caractere é confirmada"""
+        matcher = EarlyKeywordMatcher(KEYWORDS)
+        assert matcher.match(" Isso é sus, viu") == "kw_sus"
+        assert matcher.match(" Muito SUSPEITO ") == "kw_sus"
+
+    def test_last_word_is_not_trusted(self):
+        """A última palavra ainda pode crescer ("sus" -> "suspeito")"""
+        matcher = EarlyKeywordMatcher(KEYWORDS)
+        assert matcher.match(" Isso é sus") is None
+        assert matcher.match(" suspense ") is None
+
+    def test_disabled_keywords_ignored(self):
+        """Keywords desativadas não disparam; sem keywords o matcher é falso"""
+        assert EarlyKeywordMatcher(KEYWORDS).match(" cringe demais") is None
+        assert not EarlyKeywordMatcher([KEYWORDS[1]])
+
+
+class TestEarlyKeywordTrigger:
+    """Testes para o observador de tokens"""
+
+    def test_fires_once_per_item(self):
+        """Dispara ao confirmar a keyword e só uma vez por item"""
+        trigger, fired = _trigger()
+        logits = torch.zeros(1, 10)
+
+        trigger.apply(logits, _tokens(" é sus"))
+        assert fired == []
+
+        trigger.apply(logits, _tokens(" é sus!"))
+        trigger.apply(logits, _tokens(" é sus! sus "))
+        assert fired == [(0, "kw_sus", "é sus!")]
+        assert torch.count_nonzero(logits) == 0
+
+    def test_prompt_tokens_ignored(self):
+        """Só os tokens após sample_begin contam"""
+        trigger, fired = _trigger()
+        trigger.apply(torch.zeros(1, 10), torch.tensor([PROMPT]))
+        assert fired == []
+
+    def test_beam_requires_all_hypotheses(self):
+        """Com feixe, todas as hipóteses do item precisam da mesma keyword"""
+        trigger, fired = _trigger(n_group=2)
+        logits = torch.zeros(4, 10)
+
+        trigger.apply(logits, _tokens(" sus ok", " sua ok", " sus ok", " é sus "))
+        assert fired == [(1, "kw_sus", "sus ok")]
+        assert list(trigger.fired) == [1]
+
+
+class EarlyStubBackend(ASRBackend):
+    """Backend falso que confirma "kw_sus" em todo segmento decodificado"""
+
+    name = "stub"
+
+    def __init__(self, model_name: str = "stub"):
+        self.model = object()
+
+    def load(self) -> None:
+        pass
+
+    def transcribe(self, audio_data, sample_rate=16000, options=None):
+        self._report_early_keyword(0, "kw_sus", "é sus")
+        return {"text": f"é sus {len(audio_data)}", "confidence": 1.0, "language": "pt", "segments": []}
+
+    def unload(self) -> bool:
+        self.model = None
+        return True
+
+
+class TestEarlyKeywordDelivery:
+    """Testes para a entrega dos disparos pelo TranscriberThread"""
+
+    def _thread(self):
+        pytest.importorskip("whisper")
+        from audio.transcriber import TranscriberThread
+
+        thread = TranscriberThread(backend=EarlyStubBackend, batch_size=1)
+        events = []
+        thread.early_keyword_callback = events.append
+        return thread, events
+
+    def test_callback_carries_segment_id_of_final(self):
+        """O disparo vai direto ao callback, com o segment_id do resultado final"""
+        thread, events = self._thread()
+        thread.start()
+        try:
+            thread.submit_audio(np.zeros(1600, dtype=np.float32))
+            result = thread.get_result(timeout=5.0)
+        finally:
+            thread.stop()
+
+        assert result["text"] == "é sus 1600"
+        assert events == [{"early_keyword": "kw_sus", "text": "é sus", "segment_id": result["segment_id"]}]
+        assert thread.output_queue.empty()
+
+    def test_partial_decodes_do_not_fire(self):
+        """Janelas parciais podem ser descartadas: não disparam"""
+        thread, events = self._thread()
+        thread.start()
+        try:
+            thread.submit_partial(np.zeros(1600, dtype=np.float32), utterance_id=3)
+            result = thread.get_result(timeout=5.0)
+        finally:
+            thread.stop()
+
+        assert result["partial"] and result["utterance_id"] == 3
+        assert events == []
+
+    def test_sequential_batch_reports_caller_positions(self):
+        """transcribe_batch item a item: cada disparo leva a posição do item"""
+        backend = EarlyStubBackend()
+        fired = []
+        backend.on_early_keyword = lambda item, keyword_id, text: fired.append(item)
+
+        backend.transcribe_batch([(np.zeros(10), 16000), (np.zeros(20), 16000)])
+        with backend.early_items([4, 7]):
+            backend.transcribe_batch([(np.zeros(10), 16000), (np.zeros(20), 16000)])
+
+        assert fired == [0, 1, 4, 7]
+
+
+class FakeKeywordConfig:
+    """Config falsa: só a keyword "kw_sus" com som"""
+
+    def get(self, key, default=None):
+        return default
+
+    def get_keyword(self, keyword_id):
+        return {"id": keyword_id, "sound_id": "alerta"} if keyword_id == "kw_sus" else None
+
+
+class TestAnalyzerEarlyKeyword:
+    """Testes para o controle por segmento no analyzer"""
+
+    def _analyzer(self):
+        import threading
+        from unittest.mock import MagicMock
+        from core.analyzer import MicrophoneAnalyzer
+
+        analyzer = object.__new__(MicrophoneAnalyzer)
+        analyzer.config = FakeKeywordConfig()
+        analyzer.sound_manager = MagicMock()
+        analyzer.database = MagicMock()
+        analyzer.keyword_detector = MagicMock()
+        analyzer.keyword_detector.detect.side_effect = lambda text: ("kw_sus", 1.0) if "sus" in text else (None, 0.0)
+        analyzer._early_triggered = {}
+        analyzer._early_lock = threading.Lock()
+        analyzer._transcription_callbacks = []
+        analyzer._detection_callbacks = []
+        return analyzer
+
+    def _early(self, analyzer, segment_id):
+        analyzer._handle_early_keyword({"early_keyword": "kw_sus", "text": "é sus", "segment_id": segment_id})
+
+    def test_plays_once_per_segment(self):
+        """Greedy e fallback do mesmo segmento: um som; o final não toca de novo"""
+        analyzer = self._analyzer()
+        self._early(analyzer, 1)
+        self._early(analyzer, 1)
+        analyzer._handle_transcription({"text": "é sus", "segment_id": 1})
+
+        assert analyzer.sound_manager.play_sound.call_count == 1
+        assert analyzer.database.add_detection.call_count == 1
+        assert analyzer._early_triggered == {}
+
+    def test_final_without_keyword_clears_entry(self):
+        """Hipótese descartada: o próximo segmento com a keyword toca normalmente"""
+        analyzer = self._analyzer()
+        self._early(analyzer, 1)
+        analyzer._handle_transcription({"text": "é só isso", "segment_id": 1})
+        analyzer._handle_transcription({"text": "é sus", "segment_id": 2})
+
+        assert analyzer.sound_manager.play_sound.call_count == 2
+        assert analyzer._early_triggered == {}
+
+    def test_other_segment_not_silenced(self):
+        """Disparo de um segmento não silencia o final de outro"""
+        analyzer = self._analyzer()
+        self._early(analyzer, 1)
+        analyzer._handle_transcription({"text": "é sus", "segment_id": 2})
+
+        assert analyzer.sound_manager.play_sound.call_count == 2
+        assert list(analyzer._early_triggered) == [1]
@@ -0,0 +1,103 @@
+"""
+Testes unitários para o viés de decodificação por hotwords
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from audio.hotwords import HotwordBias, hotword_prompt, hotwords_from_keywords
+
+
+class FakeTokenizer:
+    """Tokenizador falso: um token por caractere (ord)"""
+
+    def encode(self, text):
+        return [ord(c) for c in text]
+
+
+class TestHotwordList:
+    """Testes para a lista de hotwords e o prompt gerado"""
+
+    def test_patterns_and_variations_of_enabled_keywords(self):
+        """Padrões e variações, sem repetição e sem keywords desativadas"""
+        keywords = [
+            {"pattern": "sus", "variations": ["Sus", "suspeito"], "enabled": True},
+            {"pattern": "cringe", "variations": [], "enabled": False},
+            {"pattern": "legal", "variations": ["top", ""]},
+        ]
+        assert hotwords_from_keywords(keywords) == ["sus", "suspeito", "legal", "top"]
+
+    def test_prompt_appends_words(self):
+        """O prompt termina com a lista de hotwords"""
+        assert hotword_prompt("Transcrição.", ["sus", "cringe"]) == "Transcrição. sus, cringe."
+        assert hotword_prompt(None, ["sus"]) == "sus."
+        assert hotword_prompt("Transcrição.", []) == "Transcrição."
+
+
+class TestHotwordBias:
+    """Testes para o filtro de logits"""
+
+    def _bias(self):
+        return HotwordBias.from_words(FakeTokenizer(), ["ab"], boost=2.0)
+
+    def test_first_piece_of_multi_token_word_not_boosted(self):
+        """O primeiro pedaço (espaço) de uma hotword com vários tokens não é empurrado sempre"""
+        logits = torch.zeros((1, 256))
+        self._bias().apply(logits, torch.tensor([[1, 2, 3]]))
+
+        assert torch.count_nonzero(logits) == 0
+
+    def test_single_token_word_boosted_every_step(self):
+        """Hotword de um só token recebe o boost em qualquer passo"""
+        logits = torch.zeros((1, 256))
+        HotwordBias([[7], [8, 9]], boost=2.0).apply(logits, torch.tensor([[1, 2, 3]]))
+
+        assert logits[0, 7] == 2.0
+        assert logits[0, 8] == 0.0
+
+    def test_continuation_only_after_prefix(self):
+        """Tokens seguintes só depois do prefixo da hotword"""
+        logits = torch.zeros((2, 256))
+        tokens = torch.tensor([[5, ord(" "), ord("a")], [5, 6, ord("a")]])
+        self._bias().apply(logits, tokens)
+
+        assert logits[0, ord("b")] == 2.0
+        assert logits[1, ord("b")] == 0.0
+
+
+class TestHotwordBiasWhisperTokenizer:
+    """Testes com o tokenizador real do whisper (multilíngue, pt)"""
+
+    @pytest.fixture
+    def tokenizer(self):
+        pytest.importorskip("whisper")
+        from whisper.tokenizer import get_tokenizer
+
+        return get_tokenizer(multilingual=True, language="pt", task="transcribe")
+
+    def test_only_whole_words_boosted_unconditionally(self, tokenizer):
+        """ " cringe" é um token e sempre recebe boost; " Cr" (de " Cringe") não"""
+        cringe, = tokenizer.encode(" cringe")
+        cr, inge = tokenizer.encode(" Cringe")
+        bias = HotwordBias.from_words(tokenizer, ["cringe"], boost=2.0)
+
+        logits = torch.zeros((1, tokenizer.encoding.n_vocab))
+        bias.apply(logits, torch.tensor([tokenizer.sot_sequence]))
+
+        assert logits[0, cringe] == 2.0
+        assert logits[0, cr] == 0.0
+        assert logits[0, inge] == 0.0
+
+    def test_continuation_after_first_piece(self, tokenizer):
+        """Depois de " sus", o pedaço seguinte de " suspeito" recebe boost"""
+        sus, *rest = tokenizer.encode(" suspeito")
+        assert tokenizer.encode(" sus") == [sus]
+        bias = HotwordBias.from_words(tokenizer, ["sus", "suspeito"], boost=2.0)
+
+        logits = torch.zeros((2, tokenizer.encoding.n_vocab))
+        sot = list(tokenizer.sot_sequence)
+        bias.apply(logits, torch.tensor([sot + [sus], sot + [tokenizer.encode(" é")[0]]]))
+
+        assert logits[0, rest[0]] == 2.0
+        assert logits[1, rest[0]] == 0.0
+        assert logits[0, sus] == logits[1, sus] == 2.0
@@ -0,0 +1,109 @@
+"""
+Testes unitários para o fator de tempo real (RTF) e o downgrade automático
+"""
+import pytest
+
+from audio.load_monitor import (
+    GREEDY_OVERRIDES,
+    DowngradePolicy,
+    RealTimeFactorMonitor,
+)
+
+
+def _monitor_with(rtf, seconds, start=0.0, step=1.0):
+    """Monitor com um lote por segundo no RTF dado"""
+    monitor = RealTimeFactorMonitor()
+    monitor._started = start
+    t = start
+    while t < start + seconds:
+        t += step
+        monitor.record(rtf * step, step, queue_depth=2, now=t)
+    return monitor, t
+
+
+class TestRealTimeFactorMonitor:
+    """Testes para a telemetria de RTF e profundidade da fila"""
+
+    def test_record_and_window(self):
+        """RTF agregado considera só os lotes dentro da janela"""
+        monitor = RealTimeFactorMonitor()
+        monitor.record(2.0, 1.0, now=100.0)
+        monitor.record(0.5, 1.0, now=110.0)
+
+        assert monitor.last_rtf == pytest.approx(0.5)
+        assert monitor.rtf_over(5.0, now=111.0) == pytest.approx(0.5)
+        assert monitor.rtf_over(20.0, now=111.0) == pytest.approx(1.25)
+        assert monitor.segments == 2
+
+    def test_no_samples(self):
+        """Sem lotes na janela não há RTF"""
+        monitor = RealTimeFactorMonitor()
+        assert monitor.rtf_over(10.0) is None
+        assert monitor.summary()["total"] is None
+
+    def test_queue_depth(self):
+        """Profundidade média e máxima da fila"""
+        monitor = RealTimeFactorMonitor()
+        monitor.record(1.0, 1.0, queue_depth=1, now=1.0)
+        monitor.record(1.0, 1.0, queue_depth=3, now=2.0)
+
+        depth = monitor.queue_depth_over(10.0, now=2.0)
+        assert depth["avg"] == pytest.approx(2.0)
+        assert depth["max"] == 3
+
+    def test_reset(self):
+        """reset() descarta o histórico"""
+        monitor = RealTimeFactorMonitor()
+        monitor.record(1.0, 1.0)
+        monitor.reset()
+
+        assert monitor.segments == 0
+        assert monitor.last_rtf is None
+
+
+class TestDowngradePolicy:
+    """Testes para a escada de downgrade/upgrade"""
+
+    def test_levels_from_configured_model(self):
+        """Gulosa primeiro, depois modelos menores"""
+        levels = DowngradePolicy.build_levels("small", beam_size=5)
+
+        assert levels[0] == {}
+        assert levels[1] == GREEDY_OVERRIDES
+        assert [level.get("model") for level in levels[2:]] == ["base", "tiny"]
+
+    def test_levels_respect_min_model_and_greedy(self):
+        """Sem degrau guloso se já é gulosa; para no modelo mínimo"""
+        levels = DowngradePolicy.build_levels("large-v3", beam_size=None, min_model="small")
+
+        assert [level.get("model") for level in levels[1:]] == ["medium", "small"]
+
+    def test_downgrade_when_rtf_stays_high(self):
+        """RTF acima de 1.0 durante a janela desce um nível"""
+        policy = DowngradePolicy("small", downgrade_window_seconds=10)
+        monitor, now = _monitor_with(1.5, 12)
+
+        assert policy.evaluate(monitor, now=now) == 1
+
+    def test_no_downgrade_before_window(self):
+        """Histórico menor que a janela não muda o nível"""
+        policy = DowngradePolicy("small", downgrade_window_seconds=10)
+        monitor, now = _monitor_with(1.5, 5)
+
+        assert policy.evaluate(monitor, now=now) is None
+
+    def test_upgrade_with_headroom(self):
+        """RTF baixo durante a janela de subida volta um nível"""
+        policy = DowngradePolicy("small", upgrade_window_seconds=30)
+        policy.level = 2
+        monitor, now = _monitor_with(0.2, 31)
+
+        assert policy.evaluate(monitor, now=now) == 1
+
+    def test_stays_between_thresholds(self):
+        """Entre os limiares (histerese) o nível é mantido"""
+        policy = DowngradePolicy("small", upgrade_window_seconds=30)
+        policy.level = 1
+        monitor, now = _monitor_with(0.8, 61)
+
+        assert policy.evaluate(monitor, now=now) is None
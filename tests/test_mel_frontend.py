@@ -0,0 +1,101 @@
+"""
+Testes unitários para o frontend log-mel incremental
+"""
+import numpy as np
+import pytest
+
+whisper = pytest.importorskip("whisper")
+
+from audio.mel_frontend import LogMelFrontend, MelFeatures
+
+SR = 16000
+
+
+def _stream(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SR)) * 0.1).astype(np.float32)
+
+
+def _frontend(audio, chunk_size=2048, **kwargs):
+    frontend = LogMelFrontend(**kwargs)
+    for i in range(0, len(audio), chunk_size):
+        frontend.push(audio[i:i + chunk_size])
+    return frontend
+
+
+class TestLogMelFrontend:
+    """Testes para o mel calculado por chunk"""
+
+    def test_matches_whisper_log_mel(self):
+        """Features de um trecho do stream = log_mel_spectrogram do trecho normalizado"""
+        audio = _stream(5.0)
+        start, end = SR + 320, 3 * SR + 77
+        segment = audio[start:end]
+
+        features = _frontend(audio).features((start, end), segment)
+        expected = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(segment / np.abs(segment).max(), whisper.audio.N_SAMPLES)
+        ).numpy()
+        mel = features.to_log_mel(whisper.audio.N_FRAMES)
+
+        # Bordas diferem: o whisper reflete o clipe, o stream tem o áudio vizinho
+        frames = features.frames.shape[1]
+        np.testing.assert_allclose(mel[:, 2:frames - 2], expected[:, 2:frames - 2], atol=1e-4)
+        np.testing.assert_allclose(mel[:, frames + 2:], expected[:, frames + 2:], atol=1e-4)
+
+    def test_chunk_size_does_not_matter(self):
+        """Chunks de qualquer tamanho geram os mesmos frames"""
+        audio = _stream(3.0, seed=1)
+        a = _frontend(audio, chunk_size=2048).frames(0, len(audio))
+        b = _frontend(audio, chunk_size=333).frames(0, len(audio))
+        np.testing.assert_allclose(a, b, atol=1e-5)
+
+    def test_ring_forgets_old_frames(self):
+        """Trechos que saíram do anel não têm features"""
+        audio = _stream(4.0, seed=2)
+        frontend = _frontend(audio, ring_seconds=1.0)
+
+        assert frontend.features((0, SR), audio[:SR]) is None
+        assert frontend.features((3 * SR, 4 * SR - 400), audio[3 * SR:4 * SR - 400]) is not None
+
+    def test_span_must_match_audio(self):
+        """Span com comprimento diferente do áudio é recusado"""
+        audio = _stream(2.0, seed=3)
+        assert _frontend(audio).features((0, SR), audio[:SR - 1]) is None
+
+    def test_unaligned_start_falls_back(self):
+        """Início fora da grade do hop (160 amostras): sem features, o clipe usa as amostras"""
+        audio = _stream(3.0, seed=4)
+        frontend = _frontend(audio)
+
+        assert frontend.features((SR + 77, 2 * SR), audio[SR + 77:2 * SR]) is None
+        assert frontend.features((SR + 160, 2 * SR), audio[SR + 160:2 * SR]) is not None
+
+    def test_matches_prepared_samples(self):
+        """Features e amostras preparadas pelo Transcriber dão o mesmo mel (sem gate de ruído só nas amostras)"""
+        from audio.transcriber import Transcriber
+
+        # Fala com trechos baixos: o antigo gate (< 1% do pico) zerava parte deles
+        audio = _stream(4.0, seed=5)
+        audio[SR:2 * SR] *= 0.02
+        start, end = SR // 2, 3 * SR
+        segment = audio[start:end]
+
+        mel = _frontend(audio).features((start, end), segment).to_log_mel(whisper.audio.N_FRAMES)
+        prepared = Transcriber._prepare_audio(None, segment, SR)
+        expected = whisper.log_mel_spectrogram(whisper.pad_or_trim(prepared, whisper.audio.N_SAMPLES)).numpy()
+
+        # O piso (máximo - 80 dB) depende das bordas, que diferem: comparar acima do maior piso
+        floor = max(mel.min(), expected.min())
+        frames = (end - start) // 160
+        np.testing.assert_allclose(
+            np.maximum(mel[:, 2:frames - 2], floor), np.maximum(expected[:, 2:frames - 2], floor), atol=1e-4
+        )
+
+    def test_short_clip_is_centered(self):
+        """Clipe menor que 1.5 s fica no meio do padding, como em _prepare_audio"""
+        frames = np.zeros((80, 50), dtype=np.float32)
+        mel = MelFeatures(frames=frames, peak=1.0, num_samples=50 * 160).to_log_mel(300)
+
+        assert mel[:, 50:100].min() == mel.max()
+        assert mel[:, 0].max() < mel.max()
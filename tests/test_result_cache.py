@@ -0,0 +1,126 @@
+"""
+Testes unitários para o cache de resultados por impressão digital do áudio
+"""
+import numpy as np
+import pytest
+
+from audio.result_cache import TranscriptionCache
+
+SR = 16000
+
+
+def _audio(seed):
+    return np.random.default_rng(seed).standard_normal(SR).astype(np.float32)
+
+
+class TestTranscriptionCacheKey:
+    """Testes para a chave (áudio + configurações)"""
+
+    def test_same_audio_and_settings_same_key(self):
+        """Mesmo áudio e mesmas opções geram a mesma chave"""
+        assert TranscriptionCache.key(_audio(0), SR, {"beam_size": 5}) == \
+            TranscriptionCache.key(_audio(0).copy(), SR, {"beam_size": 5})
+
+    def test_audio_rate_and_settings_change_key(self):
+        """Áudio, taxa de amostragem ou opções diferentes mudam a chave"""
+        base = TranscriptionCache.key(_audio(0), SR, {"beam_size": 5})
+        assert TranscriptionCache.key(_audio(1), SR, {"beam_size": 5}) != base
+        assert TranscriptionCache.key(_audio(0), 8000, {"beam_size": 5}) != base
+        assert TranscriptionCache.key(_audio(0), SR, {"beam_size": None}) != base
+
+
+class TestTranscriptionCache:
+    """Testes para os níveis em memória (LRU) e em disco"""
+
+    def test_returns_copies(self):
+        """Alterar o resultado devolvido não altera o cache"""
+        cache = TranscriptionCache(4)
+        cache.put("a", {"text": "olá", "segments": []})
+
+        result = cache.get("a")
+        result["partial"] = True
+        result["segments"].append({})
+
+        assert cache.get("a") == {"text": "olá", "segments": []}
+        assert cache.get_stats()["hits"] == 2
+
+    def test_lru_eviction(self):
+        """O menos usado recentemente sai primeiro"""
+        cache = TranscriptionCache(2)
+        cache.put("a", {"text": "a"})
+        cache.put("b", {"text": "b"})
+        cache.get("a")
+        cache.put("c", {"text": "c"})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get_stats()["misses"] == 1
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Resultados em disco valem para outra instância (reinício, outro worker)"""
+        TranscriptionCache(2, str(tmp_path)).put("ab12", {"text": "sus", "confidence": np.float32(0.5)})
+
+        cache = TranscriptionCache(2, str(tmp_path))
+        assert cache.get("ab12") == {"text": "sus", "confidence": 0.5}
+        assert cache.get_stats()["disk_hits"] == 1
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_corrupt_disk_entry_is_a_miss(self, tmp_path):
+        """Arquivo ilegível no disco conta como ausência"""
+        (tmp_path / "cd").mkdir()
+        (tmp_path / "cd" / "cd34.json").write_text("{")
+        assert TranscriptionCache(2, str(tmp_path)).get("cd34") is None
+
+
+class TestTranscriberBatchCache:
+    """Testes para o cache na frente de Transcriber.transcribe_batch"""
+
+    def test_only_misses_are_decoded(self):
+        """Itens já vistos não voltam ao modelo"""
+        pytest.importorskip("whisper")
+        from audio.transcriber import Transcriber
+
+        transcriber = object.__new__(Transcriber)
+        transcriber.result_cache = TranscriptionCache(8)
+        transcriber._cache_key = lambda audio, sr, options, features=False: TranscriptionCache.key(audio, sr, {})
+        decoded = []
+
+        def decode(items, options=None, features=None):
+            decoded.append(len(items))
+            return [{"text": f"t{len(audio)}"} for audio, _ in items]
+
+        transcriber._transcribe_batch_uncached = decode
+        first = transcriber.transcribe_batch([(_audio(0), SR), (_audio(1), SR)])
+        second = transcriber.transcribe_batch([(_audio(1), SR), (_audio(2)[:100], SR)])
+
+        assert decoded == [2, 1]
+        assert first[1] == second[0]
+        assert second[1] == {"text": "t100"}
+
+    def test_features_decode_cached_apart(self):
+        """Resultado decodificado das features prontas não serve para as amostras (e vice-versa)"""
+        pytest.importorskip("whisper")
+        from audio.transcriber import Transcriber
+
+        transcriber = object.__new__(Transcriber)
+        transcriber.result_cache = TranscriptionCache(8)
+        transcriber.word_timestamps = False
+        transcriber._cache_key = lambda audio, sr, options, features=False: TranscriptionCache.key(
+            audio, sr, {"features": features}
+        )
+        transcriber._usable_features = lambda items, features: features
+        decoded = []
+
+        def decode(items, options=None, features=None):
+            decoded.append(features)
+            return [{"text": "mel" if features else "amostras"} for _ in items]
+
+        transcriber._transcribe_batch_uncached = decode
+        item = (_audio(0), SR)
+        from_samples = transcriber.transcribe_batch([item])
+        from_features = transcriber.transcribe_batch([item], features=["mel"])
+        again = transcriber.transcribe_batch([item], features=["mel"])
+
+        assert from_samples == [{"text": "amostras"}]
+        assert from_features == again == [{"text": "mel"}]
+        assert decoded == [None, ["mel"]]
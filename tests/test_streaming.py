@@ -0,0 +1,69 @@
+"""
+Testes unitários para a confirmação de texto parcial (LocalAgreement)
+"""
+import pytest
+
+from audio.streaming import LocalAgreement
+
+
+class TestLocalAgreement:
+    """Testes para o prefixo estável entre hipóteses consecutivas"""
+
+    def test_first_hypothesis_commits_nothing(self):
+        """Uma única hipótese ainda é instável"""
+        agreement = LocalAgreement()
+        new, unstable = agreement.insert("olá tudo bem")
+
+        assert new == []
+        assert unstable == ["olá", "tudo", "bem"]
+
+    def test_common_prefix_is_committed(self):
+        """Prefixo comum de duas hipóteses é confirmado"""
+        agreement = LocalAgreement()
+        agreement.insert("olá tudo bem")
+        new, unstable = agreement.insert("olá tudo bom com você")
+
+        assert new == ["olá", "tudo"]
+        assert unstable == ["bom", "com", "você"]
+        assert agreement.committed_text == "olá tudo"
+
+    def test_committed_words_are_not_repeated(self):
+        """Palavras já confirmadas não voltam a ser emitidas"""
+        agreement = LocalAgreement()
+        agreement.insert("olá tudo")
+        agreement.insert("olá tudo bem")
+        new, _ = agreement.insert("olá tudo bem com você")
+
+        assert new == ["bem"]
+        assert agreement.committed == ["olá", "tudo", "bem"]
+
+    def test_case_and_punctuation_are_ignored(self):
+        """Diferenças de pontuação e caixa não impedem a confirmação"""
+        agreement = LocalAgreement()
+        agreement.insert("Olá, tudo bem")
+        new, _ = agreement.insert("olá tudo bem?")
+
+        assert len(new) == 3
+
+    def test_contradicting_hypothesis_keeps_committed(self):
+        """Hipótese que contradiz o confirmado não o retrai"""
+        agreement = LocalAgreement()
+        agreement.insert("olá tudo bem")
+        agreement.insert("olá tudo bem")
+        new, _ = agreement.insert("alô tudo bem")
+
+        assert new == []
+        assert agreement.committed_text == "olá tudo bem"
+
+    def test_reset(self):
+        """reset inicia um novo enunciado"""
+        agreement = LocalAgreement()
+        agreement.insert("olá")
+        agreement.insert("olá")
+        agreement.reset()
+
+        assert agreement.committed == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
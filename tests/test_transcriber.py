@@ -0,0 +1,348 @@
+"""
+Testes do Transcriber e do TranscriberThread com um modelo Whisper minúsculo
+"""
+import dataclasses
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("whisper")
+
+import whisper
+from whisper.model import ModelDimensions, Whisper
+
+from audio.asr_backend import ASRBackend
+from audio.transcriber import (
+    PARTIAL_DECODE_OPTIONS, _PARTIAL, Transcriber, TranscriberThread, _state_dict_bytes,
+)
+
+SR = 16000
+
+# Contexto de áudio completo (1500 posições = 30 s), larguras mínimas
+DIMS = ModelDimensions(
+    n_mels=80, n_audio_ctx=1500, n_audio_state=16, n_audio_head=2, n_audio_layer=1,
+    n_vocab=51865, n_text_ctx=64, n_text_state=16, n_text_head=2, n_text_layer=1,
+)
+
+
+@pytest.fixture(scope="module")
+def checkpoint(tmp_path_factory):
+    """Checkpoint aleatório no formato do whisper (o texto não faz sentido, mas é determinístico)"""
+    torch.manual_seed(0)
+    path = tmp_path_factory.mktemp("model") / "tiny.pt"
+    model = Whisper(DIMS)
+    # O whisper deixa o embedding posicional do decoder em torch.empty (lixo/NaN)
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.02)
+    torch.save({"dims": dataclasses.asdict(DIMS), "model_state_dict": model.state_dict()}, path)
+    return str(path)
+
+
+@pytest.fixture
+def transcriber(checkpoint):
+    """Transcriber guloso, sem checagens de qualidade (o modelo aleatório falharia todas)"""
+    return Transcriber(
+        model_name=checkpoint, device="cpu", beam_size=None, best_of=None, patience=None,
+        compression_ratio_threshold=None, logprob_threshold=None, no_speech_threshold=None,
+        initial_prompt=None,
+    )
+
+
+def _items(*seconds):
+    rng = np.random.default_rng(0)
+    return [((rng.standard_normal(int(s * SR)) * 0.1).astype(np.float32), SR) for s in seconds]
+
+
+def _logprobs(results):
+    return [result["segments"][0]["avg_logprob"] for result in results]
+
+
+class TestTranscribeBatch:
+    """Testes para a decodificação em lote"""
+
+    @pytest.mark.parametrize("beam_size", [None, 2])
+    def test_batched_equals_per_item(self, transcriber, beam_size):
+        """O lote dá o mesmo resultado de cada item decodificado sozinho (guloso e feixe)"""
+        transcriber.beam_size = beam_size
+        transcriber.patience = 1.0 if beam_size else None
+        items = _items(2, 3, 5)
+
+        batched = transcriber.transcribe_batch(items)
+        single = [transcriber._transcribe_single_pass([item])[0] for item in items]
+
+        assert [r["text"] for r in batched] == [r["text"] for r in single]
+        assert _logprobs(batched) == pytest.approx(_logprobs(single), abs=1e-5)
+        # Os itens diferem entre si: a comparação acima não é trivial
+        assert len({round(lp, 5) for lp in _logprobs(single)}) == len(items)
+
+    def test_failed_quality_check_falls_back_per_item(self, transcriber, monkeypatch):
+        """Só o item reprovado (log-prob baixo) volta pela janela completa"""
+        decode = transcriber._decode_features
+
+        def decode_with_bad_second(features, options):
+            results = decode(features, options)
+            results[1] = dataclasses.replace(results[1], avg_logprob=-5.0)
+            return results
+
+        full_calls = []
+
+        def full(audio_data, sample_rate=SR, options=None):
+            full_calls.append(len(audio_data))
+            return {"text": "janela completa", "confidence": 0.5, "language": "pt", "segments": []}
+
+        monkeypatch.setattr(transcriber, "_decode_features", decode_with_bad_second)
+        monkeypatch.setattr(transcriber, "_transcribe_full", full)
+        transcriber.logprob_threshold = -1.0
+        items = _items(2, 3, 4)
+
+        results = transcriber.transcribe_batch(items)
+
+        assert full_calls == [3 * SR]
+        assert results[1]["text"] == "janela completa"
+        assert results[0]["text"] and results[0]["text"] != "janela completa"
+        assert results[2]["segments"]
+
+    def test_item_over_30s_not_truncated(self, transcriber, monkeypatch):
+        """Item acima de 30 s sai do lote e vai inteiro pela janela completa"""
+        full_calls, batched_sizes = [], []
+
+        def full(audio_data, sample_rate=SR, options=None):
+            full_calls.append(len(audio_data))
+            return {"text": "janela completa", "confidence": 0.5, "language": "pt", "segments": []}
+
+        single_pass = transcriber._transcribe_single_pass
+
+        def record_single_pass(items, options=None, features=None):
+            batched_sizes.append([len(audio) for audio, _ in items])
+            return single_pass(items, options, features)
+
+        monkeypatch.setattr(transcriber, "_transcribe_full", full)
+        monkeypatch.setattr(transcriber, "_transcribe_single_pass", record_single_pass)
+        items = _items(2, 31, 3)
+
+        results = transcriber.transcribe_batch(items)
+
+        assert full_calls == [31 * SR]
+        assert batched_sizes == [[2 * SR, 3 * SR]]
+        assert results[1]["text"] == "janela completa"
+        assert _logprobs([results[0], results[2]]) == pytest.approx(
+            _logprobs(single_pass([items[0], items[2]])), abs=1e-5
+        )
+
+    def test_partial_options_never_fall_back(self, transcriber, monkeypatch):
+        """Com opções por chamada (parciais) não há fallback"""
+        transcriber.logprob_threshold = 0.0  # Todo resultado reprovaria
+        monkeypatch.setattr(transcriber, "_transcribe_full", lambda *a, **k: pytest.fail("fallback"))
+
+        results = transcriber.transcribe_batch(_items(2, 3), options=PARTIAL_DECODE_OPTIONS)
+
+        assert len(results) == 2
+
+
+class TestShortClipEncoder:
+    """Testes para o contexto truncado do encoder (encoder_mode="latency")"""
+
+    @pytest.mark.parametrize("seconds", [0.2, 1.5, 2.0, 2.01, 3.337, 5.0])
+    def test_rounds_to_even_mel_frames(self, transcriber, seconds):
+        """Janela = clipe + folga, arredondada para um número par de frames de mel"""
+        transcriber.encoder_mode = "latency"
+
+        samples = transcriber._short_clip_samples(int(seconds * SR), SR)
+
+        frames = samples // whisper.audio.HOP_LENGTH
+        assert samples % whisper.audio.HOP_LENGTH == 0
+        assert frames % 2 == 0
+        expected = max(seconds, 1.5) + transcriber.short_clip_padding_seconds
+        assert expected * SR <= samples < expected * SR + 2 * whisper.audio.HOP_LENGTH
+
+    def test_uses_clip_sample_rate(self, transcriber):
+        """A duração é medida na taxa do clipe, a janela em 16 kHz"""
+        transcriber.encoder_mode = "latency"
+        assert transcriber._short_clip_samples(2 * 8000, 8000) == transcriber._short_clip_samples(2 * SR, SR)
+
+    @pytest.mark.parametrize("setup, num_samples", [
+        ({"encoder_mode": "accuracy"}, 2 * SR),
+        ({"encoder_mode": "latency", "word_timestamps": True}, 2 * SR),
+        ({"encoder_mode": "latency"}, 6 * SR),
+        ({"encoder_mode": "latency"}, 0),
+    ])
+    def test_full_window_cases(self, transcriber, setup, num_samples):
+        """Modo accuracy, timestamps por palavra, clipe longo ou vazio: janela de 30 s"""
+        for name, value in setup.items():
+            setattr(transcriber, name, value)
+        assert transcriber._short_clip_samples(num_samples, SR) is None
+
+    def test_full_mel_passes_through(self, transcriber):
+        """Mel de 30 s vai direto ao encoder original"""
+        mel = torch.randn(1, DIMS.n_mels, whisper.audio.N_FRAMES)
+        assert torch.equal(transcriber._encode(mel), transcriber.model.encoder(mel))
+
+    def test_short_mel_encoded(self, transcriber):
+        """Mel curto: o encoder original recusa, _encode devolve metade dos frames"""
+        mel = torch.randn(1, DIMS.n_mels, 300)
+        with pytest.raises(AssertionError):
+            transcriber.model.encoder(mel)
+
+        features = transcriber._encode(mel)
+
+        assert features.shape == (1, 150, DIMS.n_audio_state)
+
+    def test_latency_mode_decodes_short_clip(self, transcriber, monkeypatch):
+        """Clipe curto decodifica com o contexto truncado, sem o assert de 1500 posições"""
+        transcriber.encoder_mode = "latency"
+        monkeypatch.setattr(transcriber, "_transcribe_full", lambda *a, **k: pytest.fail("full window"))
+        shapes = []
+        encode = transcriber._encode
+        monkeypatch.setattr(transcriber, "_encode", lambda mel: shapes.append(mel.shape[-1]) or encode(mel))
+
+        result = transcriber.transcribe(*_items(2)[0])
+
+        assert shapes == [300]  # (2 s + 1 s de folga) / 10 ms
+        assert result["text"]
+        assert result["segments"][0]["end"] == pytest.approx(2.0)
+
+
+class TestQuantizeInt8:
+    """Testes para a quantização dinâmica int8 (whisper.quantize)"""
+
+    def test_quantizes_linear_layers(self, checkpoint, transcriber):
+        """As camadas Linear viram int8, o tamanho cai e o status informa a medição"""
+        quantized = Transcriber(
+            model_name=checkpoint, device="cpu", beam_size=None, best_of=None, patience=None,
+            compression_ratio_threshold=None, logprob_threshold=None, no_speech_threshold=None,
+            initial_prompt=None, quantize="int8",
+        )
+
+        assert any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in quantized.model.modules())
+        assert not any(isinstance(m, whisper.model.Linear) for m in quantized.model.modules())
+        # O embedding de tokens (float) domina o modelo minúsculo: comparar em bytes
+        assert _state_dict_bytes(quantized.model) < _state_dict_bytes(transcriber.model)
+        info = quantized.get_status()["quantization"]
+        assert "error" not in info
+        assert info["memory_after_mb"] <= info["memory_before_mb"]
+        assert info["forward_ms_before"] > 0 and info["forward_ms_after"] > 0
+        assert quantized.transcribe(*_items(2)[0])["text"]
+
+    def test_skipped_off_cpu(self, transcriber, monkeypatch):
+        """Em outro dispositivo a opção é ignorada (os pesos continuam float)"""
+        load_model = whisper.load_model
+        monkeypatch.setattr(whisper, "load_model", lambda name, device=None: load_model(name, device="cpu"))
+        quantize_calls = []
+        monkeypatch.setattr(transcriber, "_quantize_int8", lambda: quantize_calls.append(True))
+        transcriber.device = "cuda"
+        transcriber.quantize = "int8"
+
+        transcriber.load()
+
+        assert quantize_calls == []
+        assert "quantization" not in transcriber.get_status()
+        assert any(isinstance(m, whisper.model.Linear) for m in transcriber.model.modules())
+
+
+class StubBackend(ASRBackend):
+    """Backend falso para testar a fila do TranscriberThread sem modelo"""
+
+    name = "stub"
+
+    def __init__(self, model_name: str = "stub"):
+        self.model = object()
+
+    def load(self) -> None:
+        pass
+
+    def transcribe(self, audio_data, sample_rate=16000, options=None):
+        return {"text": str(len(audio_data)), "confidence": 1.0, "language": "pt", "segments": []}
+
+    def unload(self) -> bool:
+        self.model = None
+        return True
+
+
+class AffinityBackend(StubBackend):
+    """Backend falso que registra a afinidade em vigor ao carregar e aquecer"""
+
+    events = []
+
+    def __init__(self, model_name: str = "stub"):
+        super().__init__(model_name)
+        self.events.append("load")
+
+    def warm_up(self, seconds: float = 1.0) -> float:
+        self.events.append("warm_up")
+        return 0.0
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+class TestCpuAffinityBeforeLoad:
+    """Testes para whisper.cpu_affinity aplicada antes da carga e do aquecimento"""
+
+    def test_load_and_warm_up_run_pinned(self, monkeypatch):
+        """Carga e aquecimento rodam com a afinidade aplicada; depois a anterior volta"""
+        events = AffinityBackend.events = []
+        cpu = min(os.sched_getaffinity(0))
+        monkeypatch.setattr(os, "sched_setaffinity", lambda pid, cpus: events.append(sorted(cpus)))
+
+        transcriber = TranscriberThread(backend=AffinityBackend, cpu_affinity=[cpu])
+        transcriber.warm_up(0.1)
+
+        previous = sorted(os.sched_getaffinity(0))
+        assert events == [[cpu], "load", previous, [cpu], "warm_up", previous]
+
+
+def _entry(n=1600):
+    return (np.zeros(n, dtype=np.float32), SR, time.monotonic(), None)
+
+
+class TestCollectBatch:
+    """Testes para a montagem do lote (batch_size e batch_max_wait_ms)"""
+
+    def _thread(self, batch_max_wait_ms, batch_size=4):
+        return TranscriberThread(backend=StubBackend, batch_size=batch_size, batch_max_wait_ms=batch_max_wait_ms)
+
+    def test_no_wait_takes_only_queued_items(self):
+        """Sem espera: só o que já está na fila, até batch_size"""
+        thread = self._thread(0.0, batch_size=3)
+        for n in (2, 3, 4):
+            thread.input_queue.put(_entry(n))
+
+        started = time.monotonic()
+        batch, partial_pending = thread._collect_batch(_entry(1))
+
+        assert [len(item[0]) for item in batch] == [1, 2, 3]
+        assert not partial_pending
+        assert thread.input_queue.qsize() == 1
+        assert time.monotonic() - started < 0.05
+
+    def test_waits_for_late_segment(self):
+        """Segmento que chega dentro da espera entra no mesmo lote"""
+        thread = self._thread(300.0)
+        threading.Timer(0.05, thread.input_queue.put, args=(_entry(2),)).start()
+
+        batch, _ = thread._collect_batch(_entry(1))
+
+        assert [len(item[0]) for item in batch] == [1, 2]
+
+    def test_wait_is_bounded(self):
+        """Sem novos segmentos, o lote sai após batch_max_wait_ms"""
+        thread = self._thread(100.0)
+
+        started = time.monotonic()
+        batch, _ = thread._collect_batch(_entry(1))
+        elapsed = time.monotonic() - started
+
+        assert len(batch) == 1
+        assert 0.09 <= elapsed < 0.5
+
+    def test_partial_marker_not_batched(self):
+        """O marcador de parcial é sinalizado, não decodificado no lote"""
+        thread = self._thread(0.0)
+        thread.input_queue.put(_PARTIAL)
+        thread.input_queue.put(_entry(2))
+
+        batch, partial_pending = thread._collect_batch(_entry(1))
+
+        assert [len(item[0]) for item in batch] == [1, 2]
+        assert partial_pending
@@ -0,0 +1,139 @@
+"""
+Testes do TranscriberPool com processos reais (spawn) e um backend falso
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from audio.asr_backend import ASRBackend
+from audio.transcriber_pool import TranscriberPool
+
+pytestmark = [
+    pytest.mark.slow,
+    pytest.mark.skipif(not sys.platform.startswith("linux"), reason="usa /proc e /dev/shm"),
+]
+
+SR = 16000
+
+
+class StubBackend(ASRBackend):
+    """Backend falso: audio[0] = segundos de espera; audio[0] < 0 derruba o processo"""
+
+    name = "stub"
+
+    def __init__(self, model_name: str = "stub"):
+        self.model_name = model_name
+        self.load()
+
+    def load(self) -> None:
+        self.model = object()
+
+    def transcribe(self, audio_data, sample_rate=16000, options=None):
+        if audio_data[0] < 0:
+            os._exit(3)  # Simula OOM/segfault no meio da tarefa
+        time.sleep(float(audio_data[0]))
+        return {"text": str(len(audio_data)), "confidence": 1.0, "language": "pt", "segments": []}
+
+    def unload(self) -> bool:
+        self.model = None
+        return True
+
+
+def _segment(seconds_to_sleep, num_samples=SR // 2):
+    audio = np.zeros(num_samples, dtype=np.float32)
+    audio[0] = seconds_to_sleep
+    return audio
+
+
+def _wait(condition, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _results(pool, count, timeout=30.0):
+    results = []
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        result = pool.get_result(timeout=0.2)
+        if result:
+            results.append(result["text"])
+    return results
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        kwargs = dict(dict(workers=2, warmup_seconds=0, max_segment_seconds=1.0, backend=StubBackend), **kwargs)
+        pool = TranscriberPool(**kwargs)
+        pool.start()
+        pools.append(pool)
+        assert _wait(lambda: pool.ready_workers == pool.workers), "workers not ready"
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.cleanup()
+
+
+def _deleted_shm_mappings(pid):
+    """Mapeamentos de shared memory já removida (vazamento) no processo"""
+    with open(f"/proc/{pid}/maps") as f:
+        return [line for line in f if "psm_" in line and "(deleted)" in line]
+
+
+class TestTranscriberPool:
+    """Testes para ordem de entrega, blocos e falhas dos workers"""
+
+    def test_finals_released_in_submission_order(self, make_pool):
+        """O segundo segmento termina antes, mas é entregue depois"""
+        pool = make_pool()
+        pool.submit_audio(_segment(0.8, 1000), SR)
+        pool.submit_audio(_segment(0.0, 2000), SR)
+
+        assert _results(pool, 2) == ["1000", "2000"]
+        assert _wait(pool.is_idle, 5.0)
+
+    def test_blocks_reused_and_dedicated_block_detached(self, make_pool):
+        """Blocos padrão voltam ao pool; o bloco avulso é fechado pelo worker"""
+        pool = make_pool()
+        blocks = list(pool._all_blocks)
+        for _ in range(3):
+            pool.submit_audio(_segment(0.0), SR)
+        pool.submit_audio(_segment(0.0, 2 * SR), SR)  # Maior que o bloco de 1 s
+
+        assert _results(pool, 4) == [str(SR // 2)] * 3 + [str(2 * SR)]
+        assert _wait(pool.is_idle, 5.0)
+        assert pool._all_blocks == blocks
+        assert len(pool._free_blocks) == len(blocks)
+        assert _wait(lambda: not any(_deleted_shm_mappings(p.pid) for p in pool._processes), 5.0)
+
+    def test_drops_when_full(self, make_pool):
+        """Com todos os blocos ocupados, novos segmentos são descartados"""
+        pool = make_pool(workers=1, max_pending=2)
+        for _ in range(3):
+            pool.submit_audio(_segment(0.5), SR)
+
+        assert pool.dropped == 1
+        assert len(_results(pool, 2)) == 2
+
+    def test_dead_worker_does_not_block_later_finals(self, make_pool):
+        """Worker morto no meio da tarefa: os finais seguintes ainda saem, em ordem"""
+        pool = make_pool()
+        pool.submit_audio(_segment(-1.0, 1000), SR)
+        pool.submit_audio(_segment(0.0, 2000), SR)
+        pool.submit_audio(_segment(0.0, 3000), SR)
+
+        assert _results(pool, 2) == ["2000", "3000"]
+        assert _wait(pool.is_idle, 5.0)
+        assert pool.failed == 1
+        assert _wait(lambda: pool.restarted_workers == 1, 5.0)
+        assert _wait(lambda: pool.ready_workers == 2)
@@ -0,0 +1,180 @@
+"""
+Testes unitários para o VAD por frames e o segmentador de fala
+"""
+import pytest
+import numpy as np
+
+from audio.vad import FrameVAD, NoiseFloorTracker, SpeechSegmenter, frame_features
+
+SR = 16000
+
+
+def _voiced(seconds, amplitude=0.3):
+    """Sinal harmônico que imita fala vozeada"""
+    t = np.arange(int(seconds * SR)) / SR
+    signal = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 6))
+    return (amplitude * signal / np.max(np.abs(signal))).astype(np.float32)
+
+
+def _silence(seconds, amplitude=0.001):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SR)) * amplitude).astype(np.float32)
+
+
+def _push_in_chunks(segmenter, audio, chunk_size=2048):
+    segments = []
+    for i in range(0, len(audio), chunk_size):
+        segments.extend(segmenter.push(audio[i:i + chunk_size]))
+    return segments
+
+
+class TestFrameFeatures:
+    """Testes para as features por frame"""
+
+    def test_noise_is_flatter_than_voiced(self):
+        """Ruído branco tem flatness e ZCR maiores que sinal harmônico"""
+        rng = np.random.default_rng(1)
+        noise = rng.standard_normal((10, 320)).astype(np.float32) * 0.3
+        voiced = _voiced(0.2)[:3200].reshape(10, 320)
+
+        _, zcr_noise, flat_noise = frame_features(noise)
+        _, zcr_voiced, flat_voiced = frame_features(voiced)
+
+        assert flat_noise.mean() > flat_voiced.mean()
+        assert zcr_noise.mean() > zcr_voiced.mean()
+
+    def test_vad_rejects_loud_noise(self):
+        """Ruído alto não é classificado como fala"""
+        vad = FrameVAD(sample_rate=SR, energy_threshold=0.015)
+        rng = np.random.default_rng(2)
+        noise = rng.standard_normal((20, vad.frame_size)).astype(np.float32) * 0.2
+
+        is_speech, _ = vad.classify(noise)
+        assert not is_speech.any()
+
+
+class TestSpeechSegmenter:
+    """Testes para o segmentador com pre-roll e hangover"""
+
+    def _segmenter(self, **kwargs):
+        vad = FrameVAD(sample_rate=SR, frame_ms=20, energy_threshold=0.015)
+        params = dict(silence_duration_to_stop=0.5, hangover_ms=200, pre_roll_ms=300)
+        params.update(kwargs)
+        return SpeechSegmenter(vad, **params)
+
+    def test_segment_is_trimmed_to_speech(self):
+        """Silêncio antes/depois é cortado além de pre-roll e hangover"""
+        audio = np.concatenate([_silence(2.0), _voiced(1.0), _silence(2.0)])
+        segments = _push_in_chunks(self._segmenter(), audio)
+
+        assert len(segments) == 1
+        duration = len(segments[0]) / SR
+        # 1.0s de fala + até 0.3s de pre-roll + 0.2s de hangover
+        assert 1.0 <= duration <= 1.6
+
+    def test_short_burst_is_discarded(self):
+        """Estalos mais curtos que min_speech_ms são descartados"""
+        segmenter = self._segmenter(min_speech_ms=200)
+        audio = np.concatenate([_silence(1.0), _voiced(0.06), _silence(1.0)])
+        segments = _push_in_chunks(segmenter, audio)
+
+        assert segments == []
+        assert segmenter.stats["discarded_short"] == 1
+
+    def test_long_speech_is_cut_at_max_duration(self):
+        """Fala contínua é cortada em max_duration_seconds"""
+        segmenter = self._segmenter(max_duration_seconds=2.0)
+        audio = np.concatenate([_voiced(5.0), _silence(1.0)])
+        segments = _push_in_chunks(segmenter, audio)
+
+        assert len(segments) == 3
+        assert all(len(s) <= 2.0 * SR + segmenter.frame_size for s in segments)
+
+    def test_current_utterance_during_speech(self):
+        """Enunciado em andamento inclui o pre-roll e some após o fim"""
+        segmenter = self._segmenter()
+        _push_in_chunks(segmenter, np.concatenate([_silence(1.0), _voiced(1.0)]))
+
+        window = segmenter.current_utterance()
+        assert window is not None
+        assert 1.0 * SR <= len(window) <= 1.3 * SR + 2048
+
+        _push_in_chunks(segmenter, _silence(1.0))
+        assert segmenter.current_utterance() is None
+
+    def test_spans_locate_segments_in_stream(self):
+        """last_spans e current_utterance_span apontam para as amostras do stream"""
+        segmenter = self._segmenter(max_duration_seconds=2.0)
+        audio = np.concatenate([_silence(1.0), _voiced(3.0), _silence(1.0)])
+        spans = []
+        for i in range(0, len(audio), 1500):
+            for segment, (start, end) in zip(segmenter.push(audio[i:i + 1500]), segmenter.last_spans):
+                np.testing.assert_array_equal(audio[start:end], segment)
+                spans.append((start, end))
+            if segmenter.in_speech:
+                start, end = segmenter.current_utterance_span()
+                np.testing.assert_array_equal(audio[start:end], segmenter.current_utterance())
+
+        assert len(spans) == 2
+
+    def test_silence_only_produces_nothing(self):
+        """Somente silêncio não gera segmentos"""
+        segments = _push_in_chunks(self._segmenter(), _silence(5.0))
+        assert segments == []
+
+
+class TestNoiseFloorTracker:
+    """Testes para o piso de ruído adaptativo"""
+
+    def test_floor_ignores_speech_bursts(self):
+        """Rajadas de fala não elevam o piso (percentil baixo)"""
+        tracker = NoiseFloorTracker(window_size=200, percentile=10.0, warmup=10)
+        rms = np.full(200, 0.002, dtype=np.float32)
+        rms[::3] = 0.2
+        tracker.update(rms)
+
+        assert tracker.noise_floor == pytest.approx(0.002, rel=1e-3)
+
+    def test_thresholds_follow_floor(self):
+        """Limiares acompanham o piso com margens de SNR e limites"""
+        tracker = NoiseFloorTracker(
+            window_size=50, speech_snr_db=20.0, silence_snr_db=6.0, warmup=10,
+            min_speech_threshold=0.001, max_speech_threshold=0.1,
+        )
+        assert tracker.speech_threshold(0.015) == 0.015  # Aquecimento
+
+        tracker.update(np.full(50, 0.004, dtype=np.float32))
+        assert tracker.speech_threshold(0.015) == pytest.approx(0.04, rel=1e-3)
+        assert tracker.silence_threshold(0.02) == pytest.approx(0.004 * 10 ** (6 / 20), rel=1e-3)
+
+        # Ambiente muito ruidoso: limiar de fala saturado no máximo
+        tracker.update(np.full(50, 0.05, dtype=np.float32))
+        assert tracker.speech_threshold(0.015) == 0.1
+
+    def test_window_forgets_old_values(self):
+        """Piso se adapta quando o ruído de fundo muda"""
+        tracker = NoiseFloorTracker(window_size=40, warmup=10)
+        for _ in range(10):
+            tracker.update(np.full(8, 0.02, dtype=np.float32))
+        for _ in range(10):
+            tracker.update(np.full(8, 0.001, dtype=np.float32))
+
+        assert tracker.noise_floor == pytest.approx(0.001, rel=1e-3)
+
+    def test_segmenter_adapts_to_noisy_room(self):
+        """Com ruído de fundo harmônico alto, só a fala acima do piso vira segmento"""
+        tracker = NoiseFloorTracker(window_size=500, warmup=5)
+        vad = FrameVAD(sample_rate=SR, frame_ms=20, energy_threshold=0.015, noise_tracker=tracker)
+        segmenter = SpeechSegmenter(vad, silence_duration_to_stop=0.5)
+
+        # Zumbido tonal (0.02 RMS) passaria pelo limiar fixo de 0.015
+        hum = _voiced(3.0, amplitude=0.03)
+        audio = np.concatenate([hum, hum + _voiced(3.0, amplitude=0.3), hum])
+        segments = _push_in_chunks(segmenter, audio)
+
+        assert len(segments) == 1
+        assert vad.energy_threshold > 0.015
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
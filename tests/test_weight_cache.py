@@ -0,0 +1,74 @@
+"""
+Testes unitários para o cache de pesos mapeados em memória
+"""
+import dataclasses
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("whisper")
+
+from whisper.model import ModelDimensions, Whisper
+
+from audio import weight_cache
+
+DIMS = ModelDimensions(
+    n_mels=80, n_audio_ctx=16, n_audio_state=8, n_audio_head=2, n_audio_layer=1,
+    n_vocab=51865, n_text_ctx=8, n_text_state=8, n_text_head=2, n_text_layer=1,
+)
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    """Checkpoint minúsculo no formato do whisper (dims + model_state_dict)"""
+    torch.manual_seed(0)
+    model = Whisper(DIMS)
+    # O whisper deixa o embedding posicional do decoder em torch.empty (NaN quebra torch.equal)
+    torch.nn.init.normal_(model.decoder.positional_embedding, std=0.02)
+    path = tmp_path / "mini.pt"
+    torch.save({"dims": dataclasses.asdict(DIMS), "model_state_dict": model.state_dict()}, path)
+    return str(path), model.state_dict()
+
+
+class TestWeightCache:
+    """Testes para conversão, reuso e invalidação do cache"""
+
+    def test_converts_then_hits(self, checkpoint, tmp_path):
+        """Primeira carga converte; a segunda usa o arquivo mapeado"""
+        name, state = checkpoint
+        cache_dir = str(tmp_path / "cache")
+
+        _, first = weight_cache.load_model(name, "cpu", cache_dir)
+        model, second = weight_cache.load_model(name, "cpu", cache_dir)
+
+        assert not first["hit"] and second["hit"]
+        assert first["path"] == second["path"]
+        loaded = model.state_dict()
+        assert loaded.keys() == state.keys()
+        assert all(torch.equal(loaded[k], state[k]) for k in state)
+
+    def test_changed_checkpoint_gets_new_file(self, checkpoint, tmp_path):
+        """Checkpoint alterado (mtime) não reutiliza pesos antigos"""
+        name, _ = checkpoint
+        before = weight_cache.cache_path(name, str(tmp_path))
+        stat = os.stat(name)
+        os.utime(name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert weight_cache.cache_path(name, str(tmp_path)) != before
+
+    def test_corrupt_cache_is_converted_again(self, checkpoint, tmp_path):
+        """Arquivo convertido ilegível é refeito a partir do original"""
+        name, state = checkpoint
+        path = weight_cache.cache_path(name, str(tmp_path))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"truncated")
+
+        model, info = weight_cache.load_model(name, "cpu", str(tmp_path))
+
+        assert not info["hit"]
+        assert torch.equal(model.state_dict()["decoder.token_embedding.weight"], state["decoder.token_embedding.weight"])
+
+    def test_layer_init_restored(self, checkpoint, tmp_path):
+        """Após a carga, camadas novas voltam a ser inicializadas"""
+        weight_cache.load_model(checkpoint[0], "cpu", str(tmp_path))
+        assert torch.nn.Linear(4, 4).weight.abs().sum() > 0
@@ -790,6 +790,11 @@ def get_audio_level():
             "is_silent": bool(is_silent),
             "silence_threshold": silence_threshold,
             "suggestion": suggestion,
+            "noise_floor": (
+                current_app.analyzer.get_noise_floor()
+                if hasattr(current_app.analyzer, "get_noise_floor")
+                else None
+            ),
         }), 200
     except Exception as e:
         logger.error(f"Error getting audio level: {e}")
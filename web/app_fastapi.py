@@ -93,6 +93,9 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
         EventLoopHolder.loop = asyncio.get_running_loop()
         logger.info("🚀 Iniciando aplicação FastAPI com Socket.IO")
         logger.info("✓ Event loop principal armazenado para callbacks")
+        # Carregar e aquecer o modelo em segundo plano (ver /api/ready)
+        if app.analyzer.config.get("whisper.preload_on_boot", False):
+            app.analyzer.preload_transcriber()
         yield
         # SHUTDOWN
         EventLoopHolder.loop = None
@@ -228,6 +231,19 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
         except Exception as e:
             logger.error(f"Erro ao emitir transcrição: {e}")
     
+    def on_partial_transcription(data: dict):
+        """Callback com texto parcial (streaming) do enunciado em andamento."""
+        try:
+            _emit_event_threadsafe(
+                "transcription_partial",
+                {
+                    **data,
+                    "timestamp": datetime.now().isoformat()
+                }
+            )
+        except Exception as e:
+            logger.error(f"Erro ao emitir transcrição parcial: {e}")
+    
     def on_audio_level(data: dict):
         """Callback quando há atualização de nível de áudio."""
         try:
@@ -261,6 +277,7 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
     
     # Registrar callbacks no analyzer
     analyzer.register_transcription_callback(on_transcription)
+    analyzer.register_partial_callback(on_partial_transcription)
     analyzer.register_audio_level_callback(on_audio_level)
     analyzer.register_detection_callback(on_keyword_detected)
     logger.info("✓ Callbacks do analyzer registrados para Socket.IO")
@@ -282,6 +299,12 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
         """Health check para load balancers."""
         return {"status": "healthy"}
     
+    @app.get("/api/ready")
+    async def readiness_check():
+        """Readiness para load balancers: 200 com o modelo carregado e aquecido, 503 antes."""
+        readiness = app.analyzer.get_readiness()
+        return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+    
     @app.get("/api/gpu")
     async def get_gpu_info():
         """Obtém informações da GPU independente do Whisper."""
@@ -458,6 +481,9 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
             
             # Verificar se o modelo está carregado
             model_loaded = hasattr(inner_transcriber, 'model') and inner_transcriber.model is not None
+            if hasattr(inner_transcriber, 'ready_workers'):
+                # TranscriberPool: os modelos ficam nos processos de trabalho
+                model_loaded = inner_transcriber.ready_workers > 0
             
             if not model_loaded:
                 return JSONResponse({
@@ -494,9 +520,21 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
             if new_model and new_model not in valid_models:
                 return JSONResponse({"error": f"Modelo inválido. Use: {valid_models}"}, status_code=400)
             
-            # Se novo modelo especificado, atualizar config
+            # Validar backend se especificado
+            from audio.asr_backend import BACKENDS
+            new_backend = data.get("backend")
+            if new_backend and new_backend not in BACKENDS:
+                return JSONResponse({"error": f"Backend inválido. Use: {list(BACKENDS)}"}, status_code=400)
+            
+            # Se novo modelo especificado, atualizar config (só em memória até a carga dar certo)
+            changes = {}
             if new_model:
-                app.config_manager.set("whisper.model", new_model, persist=True)
+                changes["whisper.model"] = new_model
+            if new_backend:
+                changes["whisper.backend"] = new_backend
+            previous = {key: app.config_manager.get(key) for key in changes}
+            for key, value in changes.items():
+                app.config_manager.set(key, value, persist=False)
             
             # Obter configurações atuais do Whisper
             whisper_config = app.config_manager.get("whisper", {})
@@ -504,100 +542,37 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
             language = whisper_config.get("language", "pt")
             device = whisper_config.get("device", "auto")
             
-            # Verificar se está capturando
-            was_capturing = app.analyzer.is_capturing
+            # hot_swap: None = usar whisper.hot_swap
+            hot_swap = data.get("hot_swap")
             
-            logger.info(f"🔄 Recarregando modelo Whisper: {model_name} -> {new_model or model_name}")
+            logger.info(f"🔄 Recarregando modelo Whisper: {model_name}")
             
-            # Parar captura se estiver ativa
-            if was_capturing:
-                app.analyzer.stop_capture()
-                await asyncio.sleep(0.5)  # Aguardar parada
-            
-            # Recriar o transcriber
+            # Carregar o novo modelo enquanto o atual continua transcrevendo
             try:
-                from audio.transcriber import TranscriberThread
-                
-                # Parar e limpar transcriber atual se existir
-                if hasattr(app.analyzer, 'transcriber') and app.analyzer.transcriber:
-                    logger.info("🧹 Limpando modelo anterior da memória...")
-                    
-                    # Usar método cleanup que libera GPU corretamente
-                    if hasattr(app.analyzer.transcriber, 'cleanup'):
-                        app.analyzer.transcriber.cleanup()
-                    else:
-                        # Fallback para versões antigas
-                        if hasattr(app.analyzer.transcriber, 'stop'):
-                            app.analyzer.transcriber.stop()
-                    
-                    # Garantir que a referência é removida
-                    app.analyzer.transcriber = None
-                    
-                    # Forçar coleta de lixo e liberar CUDA
-                    import gc
-                    gc.collect()
-                    
-                    try:
-                        import torch
-                        if torch.cuda.is_available():
-                            torch.cuda.empty_cache()
-                            torch.cuda.synchronize()
-                            
-                            # Verificar memória disponível
-                            total_mem = torch.cuda.get_device_properties(0).total_memory
-                            reserved_mem = torch.cuda.memory_reserved(0)
-                            allocated_mem = torch.cuda.memory_allocated(0)
-                            free_mem = total_mem - reserved_mem
-                            
-                            logger.info(f"📊 Memória GPU após cleanup:")
-                            logger.info(f"   Total: {total_mem / 1024**3:.1f} GB")
-                            logger.info(f"   Reservada: {reserved_mem / 1024**3:.1f} GB")
-                            logger.info(f"   Alocada: {allocated_mem / 1024**3:.1f} GB")
-                            logger.info(f"   Livre: {free_mem / 1024**3:.1f} GB")
-                    except Exception as e:
-                        logger.warning(f"Erro ao verificar memória GPU: {e}")
-                    
-                    # Aguardar um pouco para garantir que a memória foi liberada
-                    await asyncio.sleep(1.0)
-                
-                logger.info(f"📥 Carregando novo modelo: {new_model or model_name}")
-                
-                # Criar novo transcriber com as configurações atualizadas
-                new_transcriber = TranscriberThread(
-                    model_name=new_model or model_name,
-                    language=language,
-                    device=device if device != "auto" else None,
-                    # Parâmetros avançados
-                    beam_size=whisper_config.get("beam_size", 5),
-                    best_of=whisper_config.get("best_of", 5),
-                    temperature=whisper_config.get("temperature", 0.0),
-                    no_speech_threshold=whisper_config.get("no_speech_threshold", 0.6),
-                    initial_prompt=whisper_config.get("initial_prompt", ""),
-                )
-                
-                app.analyzer.transcriber = new_transcriber
-                app.analyzer.transcriber.start()
-                
-                logger.info(f"✓ Novo modelo Whisper carregado: {new_model or model_name}")
-                
+                reload_info = await asyncio.to_thread(app.analyzer.reload_transcriber, hot_swap)
+                logger.info(f"✓ Novo modelo Whisper carregado: {model_name} ({reload_info['mode']})")
             except Exception as e:
                 logger.error(f"Erro ao recarregar transcriber: {e}")
+                # Falhou: voltar à configuração do modelo que continua em uso
+                for key, value in previous.items():
+                    app.config_manager.set(key, value, persist=False)
                 return JSONResponse({
                     "success": False,
                     "error": f"Erro ao carregar modelo: {str(e)}"
                 }, status_code=500)
             
-            # Reiniciar captura se estava ativa
-            if was_capturing:
-                app.analyzer.start_capture()
+            if changes:
+                app.config_manager.save_config()
             
             return {
                 "success": True,
-                "message": f"Modelo Whisper alterado para '{new_model or model_name}'",
-                "model": new_model or model_name,
+                "message": f"Modelo Whisper alterado para '{model_name}'",
+                "model": model_name,
+                "backend": whisper_config.get("backend", "whisper"),
                 "device": device,
                 "language": language,
-                "capture_restarted": was_capturing
+                "mode": reload_info["mode"],
+                "swap_ms": reload_info["swap_ms"],
             }
             
         except Exception as e:
@@ -981,7 +956,12 @@ def create_app(analyzer: MicrophoneAnalyzer) -> FastAPI:
                 "db": float(db),
                 "normalized_level": normalized,
                 "is_silent": is_silent,
-                "suggestion": suggestion
+                "suggestion": suggestion,
+                "noise_floor": (
+                    app.analyzer.get_noise_floor()
+                    if hasattr(app.analyzer, "get_noise_floor")
+                    else None
+                ),
             }
         except Exception as e:
             logger.error(f"Erro ao obter nível de áudio: {e}")
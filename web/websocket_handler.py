@@ -170,6 +170,17 @@ def setup_websocket_handlers(sio, analyzer):
         )
         logger.debug(f"📝 Transcription broadcast: {text[:40]}...")
 
+    def on_partial_transcription(data: Dict[str, Any]):
+        """Emit partial (streaming) transcription to all clients."""
+        sio.emit(
+            "transcription_partial",
+            {
+                **data,
+                "timestamp": datetime.now().isoformat()
+            },
+            room=None,
+        )
+
     def on_keyword_detected(keyword_id: str, text: str, confidence: float, context_score: float):
         """Emit keyword detection to all clients."""
         sio.emit(
@@ -211,6 +222,7 @@ def setup_websocket_handlers(sio, analyzer):
 
     # Register callbacks
     analyzer.register_transcription_callback(on_transcription)
+    analyzer.register_partial_callback(on_partial_transcription)
     analyzer.register_detection_callback(on_keyword_detected)
     analyzer.register_status_callback(on_status_change)
     analyzer.register_audio_level_callback(on_audio_level)